@@ -3,6 +3,7 @@
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -51,6 +52,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'inventory.middleware.QueryMetricsMiddleware',  # First, so it times the whole stack.
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -97,6 +99,14 @@ DATABASES = {
     }
 }
 
+# DATABASE_ENGINE=sqlite3 runs against a local SQLite file instead (DATABASE_NAME,
+# default db.sqlite3), e.g. to compare benchmarks across backends (benchmark_inventory).
+if os.getenv('DATABASE_ENGINE', 'mysql') == 'sqlite3':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DATABASE_NAME') or BASE_DIR / 'db.sqlite3',
+    }
+
 
 # ===================================================================
 # PASSWORD VALIDATION
@@ -131,4 +141,109 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = 'inventory:login'
 LOGOUT_REDIRECT_URL = 'inventory:login'
 # After login, redirect to the smart dashboard view that handles roles.
-LOGIN_REDIRECT_URL = 'inventory:dashboard'
\ No newline at end of file
+LOGIN_REDIRECT_URL = 'inventory:dashboard'
+
+# ===================================================================
+# CACHING
+# ===================================================================
+# A file-based cache by default, so every worker process on the host sees the
+# same entries and invalidations. Set REDIS_URL for a cache shared between hosts
+# (requires the `redis` package), or CACHE_BACKEND=locmem for a single-process
+# development server. The file cache lives in the checkout and every key is
+# prefixed with CACHE_KEY_PREFIX, so separate checkouts or environments sharing
+# a host or a Redis server never read each other's entries. The test runner
+# always uses a private in-memory cache (see asset_mgmt/test_runner.py).
+#
+# The cache also holds state that correctness depends on: the table revisions
+# behind the list pages' ETags and the role versions of the session role
+# cache. The host-local backends therefore keep up to CACHE_MAX_ENTRIES
+# entries (Django's default of 300 would cull them routinely) and cull only a
+# tenth at a time. A host-local cache cannot be shared, so with MULTI_HOST set
+# (more than one host serving the app) only Redis is accepted.
+REDIS_URL = os.getenv('REDIS_URL', '')
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'file').lower()
+CACHE_KEY_PREFIX = os.getenv('CACHE_KEY_PREFIX', 'asset_mgmt')
+CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '100000'))
+MULTI_HOST = os.getenv('MULTI_HOST', 'False').lower() in ('true', '1', 't')
+
+if MULTI_HOST and not REDIS_URL:
+    raise ImproperlyConfigured(
+        'MULTI_HOST is set but no shared cache is configured; set REDIS_URL. A host-local '
+        'cache would let every host serve its own stale ETags and role versions.'
+    )
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+        }
+    }
+elif CACHE_BACKEND == 'locmem':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES, 'CULL_FREQUENCY': 10},
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', str(BASE_DIR / '.cache')),
+            'KEY_PREFIX': CACHE_KEY_PREFIX,
+            'OPTIONS': {'MAX_ENTRIES': CACHE_MAX_ENTRIES, 'CULL_FREQUENCY': 10},
+        }
+    }
+
+TEST_RUNNER = 'asset_mgmt.test_runner.InventoryTestRunner'
+
+# ===================================================================
+# INVENTORY APP SETTINGS
+# ===================================================================
+# Keep each user's role (group) names in their session between requests.
+# Group membership changes invalidate the copy through the cache, so only
+# enable this when every worker process shares the same cache backend.
+INVENTORY_ROLE_SESSION_CACHE = os.getenv('INVENTORY_ROLE_SESSION_CACHE', 'False').lower() in ('true', '1', 't')
+
+# Write audit log entries from a background thread instead of the request thread.
+# The queue holds up to INVENTORY_AUDIT_QUEUE_SIZE batches; when it is full, callers
+# wait INVENTORY_AUDIT_QUEUE_TIMEOUT seconds and then write the batch themselves.
+INVENTORY_AUDIT_ASYNC = os.getenv('INVENTORY_AUDIT_ASYNC', 'False').lower() in ('true', '1', 't')
+INVENTORY_AUDIT_QUEUE_SIZE = int(os.getenv('INVENTORY_AUDIT_QUEUE_SIZE', '1000'))
+INVENTORY_AUDIT_QUEUE_TIMEOUT = float(os.getenv('INVENTORY_AUDIT_QUEUE_TIMEOUT', '2.0'))
+
+# Mixed into every ETag of the conditional GET views. Change it on a release that
+# alters templates or JSON shapes, so browsers do not keep rendering old pages.
+INVENTORY_ETAG_SALT = os.getenv('INVENTORY_ETAG_SALT', '')
+
+# Upper bound, in seconds, on how long a cached payload may be served (see
+# inventory/caching.py). Entries are invalidated on change; this only limits the
+# damage should an invalidation be missed.
+INVENTORY_CACHE_TIMEOUT = int(os.getenv('INVENTORY_CACHE_TIMEOUT', '300'))
+
+# Lifetime, in seconds, of the per-table revision tokens behind the list pages'
+# ETags (see inventory/caching.py). Every write path reports its change; this
+# bounds how long a missed report can keep answering 304 Not Modified.
+INVENTORY_REVISION_TIMEOUT = int(os.getenv('INVENTORY_REVISION_TIMEOUT', '3600'))
+
+# How long the asset lifecycle analytics are served before being recomputed
+# (see inventory/services/analytics.py). They are not invalidated on change.
+INVENTORY_ANALYTICS_TIMEOUT = int(os.getenv('INVENTORY_ANALYTICS_TIMEOUT', '900'))
+
+# Per-view request metrics and Server-Timing headers (see inventory/metrics.py).
+# INVENTORY_METRICS_BUFFER_SIZE recent requests per process are kept for the
+# latency quantiles served at /metrics.
+INVENTORY_QUERY_METRICS = os.getenv('INVENTORY_QUERY_METRICS', 'True').lower() in ('true', '1', 't')
+INVENTORY_METRICS_BUFFER_SIZE = int(os.getenv('INVENTORY_METRICS_BUFFER_SIZE', '1000'))
+
+# Where `manage.py archive_audit_logs` writes the compressed audit log segments
+# (see inventory/services/audit_archive.py). Keep it on durable, backed-up storage.
+INVENTORY_AUDIT_ARCHIVE_DIR = os.getenv('INVENTORY_AUDIT_ARCHIVE_DIR', str(BASE_DIR / 'audit_archive'))
+
+# A running import job whose worker has not reported progress for this many
+# seconds is taken to be dead and is requeued or failed by the import worker
+# (see inventory/services/import_jobs.py). Keep it well above the time one
+# chunk of rows takes to import.
+INVENTORY_IMPORT_STALE_AFTER = int(os.getenv('INVENTORY_IMPORT_STALE_AFTER', '600'))
@@ -0,0 +1,23 @@
+# asset_mgmt/test_runner.py
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class InventoryTestRunner(DiscoverRunner):
+    """
+    Runs the tests against a private in-memory cache. The configured cache
+    outlives the test database, so its entries would otherwise describe rows
+    from earlier runs or from the development server.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._cache_settings = override_settings(CACHES={
+            'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'inventory-tests'},
+        })
+        self._cache_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._cache_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -3,7 +3,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
-from .models import Employee, Asset, Allocation, AuditLog
+from .models import Employee, Asset, Allocation, AuditLog, AuditLogArchive, ImportJob
 
 # ===================================================================
 # User and Employee Admin Configuration
@@ -42,9 +42,17 @@ class AssetAdmin(admin.ModelAdmin):
 @admin.register(Allocation)
 class AllocationAdmin(admin.ModelAdmin):
     list_display = ('employee', 'asset', 'assigned_date', 'returned_date', 'transaction_status')
+    list_select_related = ('employee', 'asset')
     list_filter = ('transaction_status',)
     search_fields = ('employee__full_name', 'asset__serial_number')
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'file_name', 'rows_processed', 'total_rows', 'error_count', 'created_by', 'created_at')
+    list_filter = ('kind', 'status')
+    exclude = ('payload',)
+    readonly_fields = ('started_at', 'finished_at')
+
 
 # ===================================================================
 # Audit Log Admin Configuration (CRITICAL: READ-ONLY)
@@ -61,8 +69,8 @@ class AuditLogAdmin(admin.ModelAdmin):
     list_display = ('timestamp', 'actor', 'action_type', 'formatted_details')
     # Filters for easier navigation
     list_filter = ('action_type', 'actor')
-    # Search functionality
-    search_fields = ('actor__username', 'details__asset_serial', 'details__employee_name')
+    # Search functionality: prefix matches on indexed columns, never on the JSON blob.
+    search_fields = ('^actor__username', '^asset_id', '^asset_serial', '^employee_name')
     # Order by most recent first
     ordering = ('-timestamp',)
 
@@ -85,4 +93,24 @@ class AuditLogAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         """Prevents anyone from deleting log entries."""
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(AuditLogArchive)
+class AuditLogArchiveAdmin(admin.ModelAdmin):
+    """
+    Lists the archived audit log segments. Read-only like AuditLogAdmin: the
+    index holds each segment's checksum, so editing or deleting a row here
+    would break or orphan the archived entries.
+    """
+    list_display = ('file_name', 'first_timestamp', 'last_timestamp', 'entry_count', 'size_bytes', 'created_at')
+    ordering = ('-last_timestamp',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
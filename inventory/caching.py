@@ -0,0 +1,169 @@
+# inventory/caching.py
+
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+# ===================================================================
+# Read-Through Cache for Hot Read Paths
+# ===================================================================
+# A few payloads are read far more often than they change:
+#   ASSET_DETAIL       the delete-modal payload of one asset (with its current holder)
+#   ASSET_SUMMARY      brand/model/processor of one asset (allocation form)
+#   EMPLOYEE_ASSETS    the open allocations of one employee (dashboard, return form)
+#   DASHBOARD_COUNTERS the materialized dashboard counters
+#   AVAILABLE_ASSETS   the first page of the allocation form's asset picker
+#   ANALYTICS          the asset lifecycle metrics (services/analytics.py)
+#
+# Entries are invalidated precisely: the post_save/post_delete handlers in
+# signals.py, and the services that write with queryset update()/bulk
+# operations, name exactly the keys their change affects. Keys are deleted
+# right away and again once the transaction commits, so a reader that cached
+# pre-commit data in between is corrected too. INVENTORY_CACHE_TIMEOUT bounds
+# the age of an entry should an invalidation ever be missed. The exception is
+# ANALYTICS: it summarizes years of history, so instead of being recomputed
+# on every allocation it expires after INVENTORY_ANALYTICS_TIMEOUT.
+#
+# Hit/miss counters are kept per process and per region; they are served by
+# api_views.get_cache_stats for tuning the timeout and the regions.
+#
+# The same change reports also replace a revision token per table (asset,
+# employee, allocation), which the list pages and the API use as their ETag
+# version (http_cache.table_version) instead of aggregating the whole table.
+# Tokens expire after INVENTORY_REVISION_TIMEOUT, so a write path that forgot
+# to report its change serves stale 304s for at most that long; an expired
+# token is simply replaced, which costs every client one full response.
+
+ASSET_DETAIL = 'asset-detail'
+ASSET_SUMMARY = 'asset-summary'
+EMPLOYEE_ASSETS = 'employee-assets'
+DASHBOARD_COUNTERS = 'dashboard-counters'
+AVAILABLE_ASSETS = 'available-assets'
+ANALYTICS = 'analytics'
+
+REGIONS = (ASSET_DETAIL, ASSET_SUMMARY, EMPLOYEE_ASSETS, DASHBOARD_COUNTERS, AVAILABLE_ASSETS, ANALYTICS)
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = {region: {'hits': 0, 'misses': 0} for region in REGIONS}
+
+
+def _key(region, key=None):
+    return f'inventory:{region}' if key is None else f'inventory:{region}:{key}'
+
+
+def _count(region, outcome):
+    with _stats_lock:
+        _stats[region][outcome] += 1
+
+
+def get_or_set(region, key, compute, timeout=None):
+    """
+    Returns the cached value for (region, key), calling compute() and caching
+    its result on a miss. `key` is None for regions holding a single entry.
+    None is a valid cached value (e.g. "asset not found"). `timeout` overrides
+    INVENTORY_CACHE_TIMEOUT.
+    """
+    full_key = _key(region, key)
+    value = cache.get(full_key, _MISSING)
+    if value is not _MISSING:
+        _count(region, 'hits')
+        return value
+
+    _count(region, 'misses')
+    value = compute()
+    cache.set(full_key, value, timeout or getattr(settings, 'INVENTORY_CACHE_TIMEOUT', 300))
+    return value
+
+
+def invalidate(region, keys=(None,)):
+    """Drops the given entries of a region now and again when the current transaction commits."""
+    full_keys = [_key(region, key) for key in keys]
+    if not full_keys:
+        return
+    cache.delete_many(full_keys)
+    transaction.on_commit(lambda: cache.delete_many(full_keys))
+
+
+def _revision_key(table):
+    return _key('revision', table)
+
+
+def _revision_timeout():
+    return getattr(settings, 'INVENTORY_REVISION_TIMEOUT', 3600)
+
+
+def _new_revision():
+    # A fresh random token rather than an increment: concurrent writers can
+    # never end up on a token a reader has already seen, whatever the backend.
+    return timezone.now(), uuid.uuid4().hex
+
+
+def table_revision(table):
+    """(when, token) of the last reported change to a table; a new token is started if there is none."""
+    key = _revision_key(table)
+    revision = cache.get(key)
+    if revision is None:
+        cache.add(key, _new_revision(), _revision_timeout())
+        revision = cache.get(key) or _new_revision()
+    return revision
+
+
+def tables_changed(tables):
+    """Replaces the revisions of the given tables now and again when the current transaction commits."""
+    def bump():
+        cache.set_many({_revision_key(table): _new_revision() for table in tables}, _revision_timeout())
+    bump()
+    transaction.on_commit(bump)
+
+
+def stats():
+    """{region: {'hits', 'misses', 'hit_ratio'}} for this process since it started."""
+    with _stats_lock:
+        snapshot = {region: dict(counts) for region, counts in _stats.items()}
+    for counts in snapshot.values():
+        lookups = counts['hits'] + counts['misses']
+        counts['hit_ratio'] = round(counts['hits'] / lookups, 3) if lookups else None
+    return snapshot
+
+
+# --- Invalidation by change ----------------------------------------------
+# Called by the signal handlers for single saves/deletes and by the services
+# for their bulk writes.
+
+def assets_changed(asset_ids, holder_ids=()):
+    """Asset rows changed; `holder_ids` are the employees currently holding any of them."""
+    asset_ids = list(asset_ids)
+    tables_changed(('asset',))
+    invalidate(ASSET_DETAIL, asset_ids)
+    invalidate(ASSET_SUMMARY, asset_ids)
+    invalidate(EMPLOYEE_ASSETS, list(holder_ids))
+    invalidate(AVAILABLE_ASSETS)
+
+
+def allocations_changed(pairs):
+    """
+    Allocations were created, returned or deleted; `pairs` are their
+    (asset_id, employee_id). An allocation always comes with an asset status
+    change, so the available-asset list is dropped as well.
+    """
+    pairs = list(pairs)
+    tables_changed(('allocation', 'asset'))
+    invalidate(ASSET_DETAIL, {asset_id for asset_id, _ in pairs})
+    invalidate(EMPLOYEE_ASSETS, {employee_id for _, employee_id in pairs})
+    invalidate(AVAILABLE_ASSETS)
+
+
+def employees_changed(employee_ids, held_asset_ids=()):
+    """Employee rows changed; `held_asset_ids` are the assets they hold, whose details show their names."""
+    tables_changed(('employee',))
+    invalidate(EMPLOYEE_ASSETS, list(employee_ids))
+    invalidate(ASSET_DETAIL, list(held_asset_ids))
+
+
+def counters_changed():
+    invalidate(DASHBOARD_COUNTERS)
@@ -3,6 +3,8 @@
 from functools import wraps
 from django.shortcuts import redirect
 
+from .roles import has_role
+
 def role_required(allowed_roles=()):
     """
     A decorator to restrict view access based on user group membership.
@@ -21,7 +23,8 @@ def role_required(allowed_roles=()):
                 return view_func(request, *args, **kwargs)
 
             # Validation 3: Check if the user is in any of the allowed groups.
-            if request.user.groups.filter(name__in=allowed_roles).exists():
+            # Role names are loaded once per request by the role resolution layer.
+            if has_role(request.user, *allowed_roles):
                 return view_func(request, *args, **kwargs)
             else:
                 # ===================================================================
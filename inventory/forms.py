@@ -1,6 +1,8 @@
 # inventory/forms.py
 
 from django import forms
+from django.urls import reverse_lazy
+from django.utils.html import format_html
 from django.contrib.auth.models import User, Group
 from .models import Allocation, Asset, Employee, AuditLog
 
@@ -62,6 +64,25 @@ CHOICES_PURPOSE = [('', 'Select Purpose'), ('Resignation', 'Resignation'), ('Upg
 CHOICES_RETURN_REASON = [('', 'Select Asset Return Reason'), ('Exit Employee', 'Exit Employee'), ('Replacement', 'Replacement')]
 CHOICES_RETURN_STATUS = [('', 'Select Status'), ('Returned', 'Returned'), ('Not Returned', 'Not Returned'), ('Damaged', 'Damaged')]
 
+class AssetPickerInput(forms.TextInput):
+    """
+    A text box for an asset ID with type-ahead suggestions, which the
+    allocation page's script loads into the attached <datalist>. Unlike a
+    Select it renders no choices, so drawing the form reads no asset rows;
+    the submitted ID is looked up once by the ModelChoiceField.
+    """
+
+    def __init__(self, datalist_id, attrs=None):
+        super().__init__(attrs={
+            'list': datalist_id, 'autocomplete': 'off',
+            'placeholder': 'Type an asset ID or serial number', **(attrs or {}),
+        })
+
+    def render(self, name, value, attrs=None, renderer=None):
+        html = super().render(name, value, attrs, renderer)
+        return html + format_html('<datalist id="{}"></datalist>', self.attrs['list'])
+
+
 class AllocationForm(forms.ModelForm):
     employee_email = forms.EmailField(label='Employee Email')
     asset_make = forms.CharField(label='Asset Make', required=False, widget=forms.TextInput(attrs={'readonly': 'readonly'}))
@@ -76,7 +97,8 @@ class AllocationForm(forms.ModelForm):
             'asset_condition_on_alloc', 'assigned_date', 'allocation_docket_id'
         ]
         widgets = {
-            'asset': forms.Select, 'allocation_reason': forms.Select(choices=CHOICES_REQUIREMENT_REASON),
+            'asset': AssetPickerInput('available-asset-options', attrs={'data-autocomplete-url': reverse_lazy('inventory:search_available_assets')}),
+            'allocation_reason': forms.Select(choices=CHOICES_REQUIREMENT_REASON),
             'keyboard_and_touchpad_status': forms.Select(choices=CHOICES_KEYBOARD_TOUCHPAD),
             'charger_status': forms.Select(choices=CHOICES_CHARGER_BAG), 'bag_status': forms.Select(choices=CHOICES_CHARGER_BAG),
             'asset_condition_on_alloc': forms.Select(choices=CHOICES_ASSET_CONDITION),
@@ -85,8 +107,10 @@ class AllocationForm(forms.ModelForm):
         }
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        # Show only available assets in the dropdown
-        self.fields['asset'].queryset = Asset.objects.filter(status__iexact='Available').order_by('asset_id')
+        # Only available assets can be assigned; the picker suggests them and
+        # the submitted ID is checked against this queryset.
+        self.fields['asset'].queryset = Asset.objects.filter(status__iexact='Available')
+        self.fields['asset'].error_messages['invalid_choice'] = 'No available asset has this ID.'
 
 
 class ReturnForm(forms.ModelForm):
@@ -100,13 +124,22 @@ class ReturnForm(forms.ModelForm):
             'bag_return_status', 'returned_date', 'return_docket_id'
         ]
         widgets = {
-            'asset': forms.Select, 'asset_power_status': forms.Select(choices=CHOICES_POWER_STATUS),
+            'asset': AssetPickerInput('held-asset-options'), 'asset_power_status': forms.Select(choices=CHOICES_POWER_STATUS),
             'asset_screen_status': forms.Select(choices=CHOICES_SCREEN_STATUS), 'purpose': forms.Select(choices=CHOICES_PURPOSE),
             'return_reason': forms.Select(choices=CHOICES_RETURN_REASON),
             'charger_return_status': forms.Select(choices=CHOICES_RETURN_STATUS), 'bag_return_status': forms.Select(choices=CHOICES_RETURN_STATUS),
             'delivery_type': forms.RadioSelect(choices=[('In Person', 'In Person'), ('Courier', 'Courier')]),
             'returned_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}, format='%Y-%m-%dT%H:%M'),
         }
+    def __init__(self, *args, **kwargs):
+        # Shares the page with AllocationForm and its field names; distinct ids
+        # keep the labels and the page script pointing at the right inputs.
+        kwargs.setdefault('auto_id', 'id_return_%s')
+        super().__init__(*args, **kwargs)
+        # The view narrows this to the employee's allocated assets on submit;
+        # the picker is filled with them once the email is entered.
+        self.fields['asset'].queryset = Asset.objects.filter(status__iexact='Allocated')
+        self.fields['asset'].error_messages['invalid_choice'] = 'This employee holds no asset with this ID.'
 
 # ===================================================================
 # PRESERVED: Your Existing Asset Forms
@@ -159,4 +192,10 @@ class EmployeeForm(forms.ModelForm):
         ]
 
 class BulkEmployeeImportForm(forms.Form):
-    file = forms.FileField(label="Upload CSV File")
\ No newline at end of file
+    file = forms.FileField(label="Upload CSV File")
+# ===================================================================
+# Bulk Allocation Form (onboarding/offboarding waves)
+# ===================================================================
+class BulkAllocationForm(forms.Form):
+    mode = forms.ChoiceField(choices=[('assign', 'Assign assets'), ('return', 'Return assets')], initial='assign')
+    file = forms.FileField(label="Upload CSV or JSON File")
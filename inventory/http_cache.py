@@ -0,0 +1,97 @@
+# inventory/http_cache.py
+
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+from . import caching
+
+# ===================================================================
+# Conditional GET (ETag / Last-Modified)
+# ===================================================================
+# A page or API response is described by a Version of the data it is built
+# from. If the client's cached copy has the same ETag, the view answers 304
+# Not Modified without querying or rendering anything else.
+#   - Whole-table pages (the lists, the API) use table_version: the revision
+#     token that every write path replaces when it reports a change to the
+#     table (see caching.tables_changed). Reading it costs no query.
+#   - Single-object responses use queryset_version: the newest `updated_at`
+#     stamp of the rows, plus their count (a delete changes no stamp, but it
+#     does lower the count), from one small indexed aggregate.
+#
+# Responses are marked private and no-cache, so browsers revalidate them on
+# every use and a change is never served stale. Pages that carry flash
+# messages are always rendered in full.
+
+
+class Version:
+    """When some data last changed (may be None) and a token that identifies its exact state."""
+
+    def __init__(self, last_modified, token):
+        self.last_modified = last_modified
+        self.token = token
+
+
+def queryset_version(queryset, *stamp_fields):
+    """
+    The Version of a queryset's rows. `stamp_fields` default to `updated_at`;
+    pass related stamps too (e.g. 'employee__updated_at') when a response shows
+    columns from joined tables.
+    """
+    stamp_fields = stamp_fields or ('updated_at',)
+    aggregates = {f'stamp{i}': Max(name) for i, name in enumerate(stamp_fields)}
+    result = queryset.order_by().aggregate(rows=Count('pk'), **aggregates)
+    stamps = [result[f'stamp{i}'] for i in range(len(stamp_fields))]
+    return Version(
+        max((stamp for stamp in stamps if stamp is not None), default=None),
+        (result['rows'], *[stamp.isoformat() if stamp else None for stamp in stamps]),
+    )
+
+
+def table_version(*models):
+    """The Version of whole tables, from the revisions their write paths keep in the cache."""
+    revisions = [caching.table_revision(model._meta.model_name) for model in models]
+    return Version(max(when for when, _ in revisions), tuple(token for _, token in revisions))
+
+
+def combine(*versions):
+    """One Version for a response built from several querysets."""
+    stamps = [version.last_modified for version in versions if version.last_modified is not None]
+    return Version(max(stamps, default=None), tuple(version.token for version in versions))
+
+
+def _etag(request, version):
+    # The session key is part of the tag: pages embed the user's name, role
+    # and CSRF token, which must not be reused across logins.
+    session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+    parts = (getattr(settings, 'INVENTORY_ETAG_SALT', ''), request.user.pk, session_key, version.token)
+    return quote_etag(hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def conditional_response(request, version, build_response):
+    """
+    Returns 304 Not Modified when the client's copy (If-None-Match, or
+    If-Modified-Since when no ETag is sent) matches `version`; otherwise
+    calls build_response() and stamps the result with ETag and Last-Modified.
+    """
+    if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+        return build_response()
+
+    etag = _etag(request, version)
+    last_modified = int(version.last_modified.timestamp()) if version.last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build_response()
+        if response.status_code != 200:
+            return response
+
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
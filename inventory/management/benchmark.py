@@ -0,0 +1,283 @@
+# inventory/management/benchmark.py
+
+import csv
+import datetime
+import io
+import json
+import math
+import random
+import time
+import uuid
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from inventory import caching, urls as inventory_urls
+from inventory.models import Allocation, Asset, AssetAgingSummary, AuditLog, Employee, ImportJob
+from inventory.services import synthetic
+from inventory.services.asset_import import import_assets
+from inventory.services.bulk_allocation import bulk_assign, bulk_return, read_rows
+from inventory.services.employee_import import import_employees
+
+# ===================================================================
+# Benchmark Harness
+# ===================================================================
+# Lives with the management commands rather than in services/: it drives the
+# app through django.test's client and query capture, which the running app
+# never needs.
+# `manage.py benchmark_inventory` times:
+#   - every URL in inventory/urls.py, requested with GET as a superuser
+#   - the CSV import paths: asset import (insert and update), employee
+#     import, bulk assign and bulk return
+# It records each one's p50/p95 latency and query count per database vendor,
+# so the same harness can be run against SQLite and MySQL
+# (DATABASE_ENGINE=sqlite3, see settings) on the same seeded dataset
+# (`manage.py seed_inventory`).
+#
+# Everything runs inside one transaction that is rolled back at the end, so
+# the benchmark user and the imported rows never persist. Commit callbacks
+# (audit entries, cache invalidation) are run right after each timed call,
+# inside its timing, so the results include what a commit would cost.
+#
+# Results are compared with a stored baseline (one section per vendor).
+# Latency regresses when the p95 grows by more than the tolerance; query
+# counts must not grow at all by default.
+
+# URLs that cannot be benchmarked with a GET, with the reason.
+SKIPPED_URLS = {
+    'logout': 'ends the session',
+    'delete_asset': 'POST only',
+    'delete_employee': 'POST only',
+}
+
+# Parameters of the URLs that need them: name -> function(sample) -> (kwargs, query string).
+# `sample` is the asset and employee of the newest allocation (see _sample).
+URL_PARAMETERS = {
+    'edit_asset': lambda s: ({'pk': s['asset_id']}, {}),
+    'edit_employee': lambda s: ({'pk': s['employee_id']}, {}),
+    'transaction_search': lambda s: ({}, {'search_type': 'asset', 'query': s['asset_id']}),
+    'ajax_get_asset_details': lambda s: ({'asset_id': s['asset_id']}, {}),
+    'search_available_assets': lambda s: ({}, {'q': s['asset_id'][:4]}),
+    'ajax_get_employee_assets': lambda s: ({}, {'email': s['email']}),
+    'get_asset_history': lambda s: ({'asset_id': s['asset_id']}, {}),
+    'get_detailed_asset_info': lambda s: ({'asset_id': s['asset_id']}, {}),
+    'get_detailed_employee_info': lambda s: ({'employee_id': s['employee_id']}, {}),
+    'get_import_job_status': lambda s: ({'job_id': s['import_job_id']}, {}) if s['import_job_id'] else None,
+    'search_inventory': lambda s: ({}, {'q': s['asset_id'][:4]}),
+    'get_asset_aging_bucket': lambda s: ({'kind': AssetAgingSummary.KIND_WARRANTY, 'bucket': 'expired'}, {}),
+    'get_audit_log_details': lambda s: ({'log_id': s['audit_log_id']}, {}) if s['audit_log_id'] else None,
+}
+
+DEFAULT_REPEAT = 10
+DEFAULT_IMPORT_ROWS = 200
+DEFAULT_IMPORT_REPEAT = 3
+DEFAULT_LATENCY_TOLERANCE = 0.25
+# Latency changes below this many milliseconds are noise, whatever the tolerance.
+LATENCY_SLACK_MS = 5.0
+
+
+class BenchmarkError(ValueError):
+    """Raised when the benchmark cannot run, e.g. on an empty database."""
+
+
+def percentile(values, q):
+    """The nearest-rank percentile (0 < q <= 1) of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def _summarize(timings, query_counts):
+    return {
+        'runs': len(timings),
+        'p50_ms': round(percentile(timings, 0.5), 2),
+        'p95_ms': round(percentile(timings, 0.95), 2),
+        'queries': percentile(query_counts, 0.5),
+        'max_queries': max(query_counts),
+    }
+
+
+def _timed(call):
+    """Runs call() and then the commit callbacks it queued; returns (milliseconds, queries)."""
+    with CaptureQueriesContext(connection) as captured:
+        started = time.perf_counter()
+        # The callbacks stay queued too, but the run is rolled back, which discards them.
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            call()
+        elapsed = (time.perf_counter() - started) * 1000
+    return elapsed, len(captured)
+
+
+def _sample():
+    allocation = (
+        Allocation.objects.order_by('-allocation_id')
+        .values('asset_id', 'employee_id', 'employee__email').first()
+    )
+    if allocation is None:
+        raise BenchmarkError('There are no allocations to benchmark. Seed a dataset with `manage.py seed_inventory`.')
+    return {
+        'asset_id': allocation['asset_id'],
+        'employee_id': allocation['employee_id'],
+        'email': allocation['employee__email'],
+        'import_job_id': ImportJob.objects.order_by('-pk').values_list('pk', flat=True).first(),
+        'audit_log_id': AuditLog.objects.order_by('-pk').values_list('pk', flat=True).first(),
+    }
+
+
+def url_cases(sample):
+    """Yields (name, url, query, None) for every inventory URL, or (name, None, None, reason) if it is skipped."""
+    for pattern in inventory_urls.urlpatterns:
+        name = f"{inventory_urls.app_name}:{pattern.name}"
+        if pattern.name in SKIPPED_URLS:
+            yield name, None, None, SKIPPED_URLS[pattern.name]
+            continue
+        if pattern.name not in URL_PARAMETERS and pattern.pattern.converters:
+            yield name, None, None, 'takes parameters that URL_PARAMETERS does not provide'
+            continue
+        parameters = URL_PARAMETERS.get(pattern.name, lambda s: ({}, {}))(sample)
+        if parameters is None:
+            yield name, None, None, 'no sample data for its parameters'
+            continue
+        kwargs, query = parameters
+        yield name, reverse(name, kwargs=kwargs), query, None
+
+
+def _get(client, url, query):
+    def call():
+        response = client.get(url, query)
+        # Streamed responses (the exports) do their work while being read.
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        if response.status_code >= 400:
+            raise BenchmarkError(f"GET {url} answered {response.status_code}.")
+    return call
+
+
+def _import_steps(rows, prefix, rng, shapes):
+    """The CSV import paths, as (name, call) in the order they must run, on `rows` new records."""
+    asset_lines = synthetic.asset_csv_lines(rows, prefix, rng, shapes)
+    employee_lines = synthetic.employee_csv_lines(rows, prefix, rng)
+    pairs = [
+        (employee['email'], asset['asset_id'])
+        for employee, asset in zip(csv.DictReader(employee_lines), csv.DictReader(asset_lines))
+    ]
+    assign_file = io.StringIO()
+    csv.writer(assign_file).writerows([('employee_email', 'asset_id'), *pairs])
+    return_file = io.StringIO()
+    csv.writer(return_file).writerows([('asset_id',), *((asset_id,) for _, asset_id in pairs)])
+
+    return [
+        ('import:assets', lambda: import_assets(asset_lines)),
+        ('import:assets-update', lambda: import_assets(asset_lines)),
+        ('import:employees', lambda: import_employees(employee_lines)),
+        ('import:bulk-assign', lambda: bulk_assign(read_rows(assign_file.getvalue()))),
+        ('import:bulk-return', lambda: bulk_return(read_rows(return_file.getvalue()))),
+    ]
+
+
+def dataset_size():
+    return {
+        'employees': Employee.objects.count(),
+        'assets': Asset.objects.count(),
+        'allocations': Allocation.objects.count(),
+        'audit_logs': AuditLog.objects.count(),
+    }
+
+
+def run(repeat=DEFAULT_REPEAT, import_rows=DEFAULT_IMPORT_ROWS, import_repeat=DEFAULT_IMPORT_REPEAT,
+        shapes=None, only=None, on_result=None):
+    """
+    Runs the benchmarks and returns the report:
+    {'vendor', 'generated_at', 'dataset', 'parameters', 'results': {name: summary}, 'skipped': {name: reason}}.
+    `only` restricts the run to names containing that text; `on_result(name, summary)` reports progress.
+    """
+    sample = _sample()
+    report = {
+        'vendor': connection.vendor,
+        'generated_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'dataset': dataset_size(),
+        'parameters': {'repeat': repeat, 'import_rows': import_rows, 'import_repeat': import_repeat},
+        'results': {},
+        'skipped': {},
+    }
+
+    def record(name, timings, query_counts):
+        report['results'][name] = _summarize(timings, query_counts)
+        if on_result:
+            on_result(name, report['results'][name])
+
+    rng = random.Random(0)
+    with transaction.atomic(), override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        user = User.objects.create_superuser(f'benchmark-{uuid.uuid4().hex[:12]}', password=None)
+        client = Client()
+        client.force_login(user)
+
+        for name, url, query, reason in url_cases(sample):
+            if only and only not in name:
+                continue
+            if reason:
+                report['skipped'][name] = reason
+                continue
+            measurements = [_timed(_get(client, url, query)) for _ in range(repeat)]
+            record(name, *zip(*measurements))
+
+        measurements = {}
+        for iteration in range(import_repeat if import_rows > 0 else 0):
+            prefix = f"{synthetic.SYNTHETIC_PREFIX}IMP{iteration:02d}{uuid.uuid4().hex[:6].upper()}"
+            for name, call in _import_steps(import_rows, prefix, rng, shapes):
+                if not only or only in name:
+                    measurements.setdefault(name, []).append(_timed(call))
+        for name, values in measurements.items():
+            record(name, *zip(*values))
+
+        transaction.set_rollback(True)
+
+    # Entries cached during the run may count the imported rows that were just rolled back.
+    caching.counters_changed()
+    caching.invalidate(caching.AVAILABLE_ASSETS)
+    return report
+
+
+# --- Baselines -------------------------------------------------------------
+
+def load_baseline(path):
+    """The stored baseline reports, {vendor: report}; empty if the file does not exist."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, report):
+    """Stores the report as the baseline of its vendor, keeping the other vendors' baselines."""
+    baselines = load_baseline(path)
+    baselines[report['vendor']] = report
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def compare(report, baseline, latency_tolerance=DEFAULT_LATENCY_TOLERANCE, query_tolerance=0):
+    """
+    The regressions of `report` against a baseline report of the same vendor,
+    as messages. A benchmark regresses when its p95 exceeds the baseline's by
+    more than `latency_tolerance` (a fraction) and LATENCY_SLACK_MS, or when
+    it runs more than `query_tolerance` extra queries. Benchmarks missing on
+    either side are not compared.
+    """
+    regressions = []
+    for name, current in sorted(report['results'].items()):
+        previous = baseline.get('results', {}).get(name)
+        if previous is None:
+            continue
+        limit = previous['p95_ms'] * (1 + latency_tolerance) + LATENCY_SLACK_MS
+        if current['p95_ms'] > limit:
+            regressions.append(f"{name}: p95 {current['p95_ms']:.1f} ms, baseline {previous['p95_ms']:.1f} ms")
+        if current['queries'] > previous['queries'] + query_tolerance:
+            regressions.append(f"{name}: {current['queries']} queries, baseline {previous['queries']}")
+    return regressions
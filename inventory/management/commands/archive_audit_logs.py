@@ -0,0 +1,82 @@
+# inventory/management/commands/archive_audit_logs.py
+
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from inventory.models import AuditLogArchive
+from inventory.services import audit_archive
+
+
+class Command(BaseCommand):
+    """
+    Moves old audit log entries out of the table into gzip-compressed JSON
+    Lines segments, one per month, indexed in AuditLogArchive with their
+    checksums (see services/audit_archive.py). The log viewer still finds
+    them when its date filter reaches back that far. Run it periodically:
+    $ python manage.py archive_audit_logs --older-than 365           # days
+    $ python manage.py archive_audit_logs --older-than 2025-01-01 --dry-run
+    $ python manage.py archive_audit_logs --verify                   # check every segment
+    """
+
+    help = 'Archives audit log entries older than a cutoff into compressed, checksummed segment files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', help='Archive entries older than this many days, or before this date (YYYY-MM-DD).')
+        parser.add_argument('--dry-run', action='store_true', help='Show the segments that would be written; change nothing.')
+        parser.add_argument('--verify', action='store_true', help='Check every archived segment against its checksum and entry count.')
+        parser.add_argument('--batch-size', type=int, default=audit_archive.ARCHIVE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if not options['older_than'] and not options['verify']:
+            raise CommandError('Pass --older-than (days or YYYY-MM-DD), --verify, or both.')
+
+        if options['older_than']:
+            cutoff = self._parse_cutoff(options['older_than'])
+            dry_run = options['dry_run']
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{'Dry run: ' if dry_run else ''}Archiving audit log entries before {cutoff:%Y-%m-%d %H:%M %Z} "
+                f"to {audit_archive.archive_dir()}..."
+            ))
+            started = time.perf_counter()
+            segments = audit_archive.archive(
+                cutoff, batch_size=options['batch_size'], dry_run=dry_run,
+                on_segment=lambda segment: self.stdout.write(self.style.SUCCESS(
+                    f"✓ {segment.file_name}: {segment.entry_count} entries, {segment.size_bytes / 1024:.1f} KiB"
+                )),
+            )
+            total = sum(segment.entry_count for segment in segments)
+            self.stdout.write(
+                f"Summary: {total} entries in {len(segments)} segments "
+                f"{'would be archived' if dry_run else 'archived'} in {time.perf_counter() - started:.1f}s."
+            )
+
+        if options['verify']:
+            self._verify()
+
+    def _parse_cutoff(self, value):
+        if value.isascii() and value.isdigit():
+            return timezone.now() - datetime.timedelta(days=int(value))
+        try:
+            day = datetime.date.fromisoformat(value)
+        except ValueError:
+            raise CommandError(f"Invalid --older-than '{value}'; use a number of days or YYYY-MM-DD.")
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+    def _verify(self):
+        self.stdout.write(self.style.MIGRATE_HEADING('Verifying archived audit log segments...'))
+        failures = 0
+        segments = AuditLogArchive.objects.order_by('first_timestamp')
+        for segment in segments:
+            try:
+                audit_archive.verify(segment)
+            except audit_archive.ArchiveIntegrityError as e:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"✗ {e}"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {segment.file_name}"))
+        if failures:
+            raise CommandError(f"{failures} archived segments failed verification.")
+        self.stdout.write(f"Summary: {segments.count()} segments verified.")
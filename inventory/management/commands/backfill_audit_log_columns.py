@@ -0,0 +1,76 @@
+# inventory/management/commands/backfill_audit_log_columns.py
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from inventory.models import Allocation, AuditLog
+
+
+class Command(BaseCommand):
+    """
+    Fills the indexed search columns (asset_id, asset_serial, employee_id,
+    employee_name) of audit log entries written before they existed, by
+    extracting them from the `details` JSON.
+
+    Entries that already have any of the columns set are skipped, so the
+    command can be interrupted and re-run safely:
+    $ python manage.py backfill_audit_log_columns --batch-size 5000
+    """
+
+    help = 'Backfills the searchable AuditLog columns from the details JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000, help='Log entries updated per transaction.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING('Backfilling audit log search columns...'))
+
+        batch_size = max(options['batch_size'], 1)
+        pending = AuditLog.objects.filter(
+            asset_id__isnull=True, asset_serial__isnull=True,
+            employee_id__isnull=True, employee_name__isnull=True,
+        ).order_by('id').only('id', 'details')
+
+        scanned = updated = 0
+        last_id = 0
+        while True:
+            batch = list(pending.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            last_id = batch[-1].id
+            scanned += len(batch)
+
+            changed = self._fill(batch)
+            with transaction.atomic():
+                AuditLog.objects.bulk_update(changed, list(AuditLog.SEARCH_COLUMN_SOURCES))
+            updated += len(changed)
+            self.stdout.write(f"  ...{scanned} entries scanned, {updated} updated")
+
+        self.stdout.write(self.style.SUCCESS(f"✓ Backfilled {updated} of {scanned} audit log entries."))
+
+    def _fill(self, batch):
+        """Sets the columns on each entry in memory; returns the entries that changed."""
+        # Older allocation logs only recorded the allocation id, so the asset and
+        # employee ids are looked up from the allocation itself (one query per batch).
+        allocation_ids = {
+            entry.details.get('allocation_id') for entry in batch
+            if isinstance(entry.details, dict) and entry.details.get('allocation_id')
+        }
+        allocations = {
+            row['allocation_id']: row
+            for row in Allocation.objects.filter(allocation_id__in=allocation_ids).values('allocation_id', 'asset_id', 'employee_id')
+        }
+
+        changed = []
+        for entry in batch:
+            details = entry.details if isinstance(entry.details, dict) else {}
+            allocation = allocations.get(details.get('allocation_id'))
+            if allocation:
+                details = {'asset_id': allocation['asset_id'], 'employee_id': allocation['employee_id'], **details}
+
+            columns = AuditLog.search_columns(details)
+            if any(value is not None for value in columns.values()):
+                for column, value in columns.items():
+                    setattr(entry, column, value)
+                changed.append(entry)
+        return changed
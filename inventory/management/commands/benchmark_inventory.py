@@ -0,0 +1,98 @@
+# inventory/management/commands/benchmark_inventory.py
+
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from inventory.management import benchmark
+from inventory.services import synthetic
+
+
+class Command(BaseCommand):
+    """
+    Times every inventory URL and the CSV import paths on the current
+    database (see management/benchmark.py), writes the p50/p95 latency and
+    query counts to a JSON file and fails if they regressed past the stored
+    baseline of this database vendor. Typical use, once per backend:
+    $ python manage.py seed_inventory --employees 2000 --assets 10000 --allocations 50000 --logs 100000
+    $ python manage.py benchmark_inventory --save-baseline        # on the reference commit
+    $ python manage.py benchmark_inventory                        # later: compare
+    $ DATABASE_ENGINE=sqlite3 python manage.py benchmark_inventory
+    """
+
+    help = 'Benchmarks the inventory URLs and CSV imports and compares them with a stored baseline.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=benchmark.DEFAULT_REPEAT, help='Timed requests per URL.')
+        parser.add_argument('--import-rows', type=int, default=benchmark.DEFAULT_IMPORT_ROWS,
+                            help='Rows per benchmarked import file (0 skips the imports).')
+        parser.add_argument('--import-repeat', type=int, default=benchmark.DEFAULT_IMPORT_REPEAT,
+                            help='Timed runs per import path.')
+        parser.add_argument('--only', help='Only run the benchmarks whose name contains this text.')
+        parser.add_argument('--shapes', default=str(settings.BASE_DIR / 'test.csv'),
+                            help='Asset import CSV whose rows the imported hardware is drawn from.')
+        parser.add_argument('-o', '--output', help='Results file (default: benchmark-<vendor>.json).')
+        parser.add_argument('--baseline', default=str(settings.BASE_DIR / 'benchmark-baseline.json'),
+                            help='Baseline file, with one section per database vendor.')
+        parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline.')
+        parser.add_argument('--latency-tolerance', type=float, default=benchmark.DEFAULT_LATENCY_TOLERANCE,
+                            help='Allowed p95 growth as a fraction, e.g. 0.25 for 25%%.')
+        parser.add_argument('--query-tolerance', type=int, default=0, help='Allowed extra queries per benchmark.')
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1 or options['import_repeat'] < 1:
+            raise CommandError('--repeat and --import-repeat must be at least 1.')
+        try:
+            with open(options['shapes'], newline='', encoding='utf-8-sig') as f:
+                shapes = synthetic.load_asset_shapes(f) or None
+        except OSError:
+            shapes = None
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Running inventory benchmarks...'))
+        try:
+            report = benchmark.run(
+                repeat=options['repeat'],
+                import_rows=options['import_rows'],
+                import_repeat=options['import_repeat'],
+                shapes=shapes,
+                only=options['only'],
+                on_result=lambda name, result: self.stdout.write(
+                    f"  {name:<45} p50 {result['p50_ms']:>8.1f} ms  p95 {result['p95_ms']:>8.1f} ms  "
+                    f"{result['queries']:>4} queries"
+                ),
+            )
+        except benchmark.BenchmarkError as e:
+            raise CommandError(str(e))
+
+        for name, reason in report['skipped'].items():
+            self.stdout.write(f"  {name:<45} skipped: {reason}")
+
+        output = options['output'] or f"benchmark-{report['vendor']}.json"
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(self.style.SUCCESS(f"✓ {len(report['results'])} benchmarks on {report['vendor']} written to {output}"))
+
+        if options['save_baseline']:
+            benchmark.save_baseline(options['baseline'], report)
+            self.stdout.write(self.style.SUCCESS(f"✓ Stored as the {report['vendor']} baseline in {options['baseline']}"))
+            return
+
+        baseline = benchmark.load_baseline(options['baseline']).get(report['vendor'])
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(
+                f"No {report['vendor']} baseline in {options['baseline']}; store one with --save-baseline."
+            ))
+            return
+        if baseline.get('dataset') != report['dataset']:
+            self.stdout.write(self.style.WARNING(
+                f"The baseline was measured on a different dataset ({baseline.get('dataset')}); timings may not compare."
+            ))
+
+        regressions = benchmark.compare(report, baseline, options['latency_tolerance'], options['query_tolerance'])
+        if regressions:
+            for message in regressions:
+                self.stdout.write(self.style.ERROR(f"✗ {message}"))
+            raise CommandError(f"{len(regressions)} benchmark regressions against the {report['vendor']} baseline.")
+        self.stdout.write(f"Summary: no regressions against the {report['vendor']} baseline.")
@@ -0,0 +1,29 @@
+# inventory/management/commands/rebuild_dashboard_stats.py
+
+from django.core.management.base import BaseCommand
+
+from inventory.services.dashboard_stats import rebuild_counters
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the materialized dashboard counters (DashboardStat) from the
+    Asset and Employee tables and reports any counter that had drifted.
+
+    Safe to run at any time, e.g. nightly from cron or after raw SQL changes:
+    $ python manage.py rebuild_dashboard_stats
+    """
+
+    help = 'Rebuilds the dashboard counters from the source tables and reports drift.'
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(self.style.MIGRATE_HEADING('Rebuilding dashboard counters...'))
+
+        drifted = rebuild_counters()
+
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS('✓ All counters were already in sync.'))
+            return
+        for name, (old_value, new_value) in sorted(drifted.items()):
+            self.stdout.write(self.style.WARNING(f"✓ {name}: {old_value} -> {new_value}"))
+        self.stdout.write(f"Summary: {len(drifted)} counters corrected.")
@@ -0,0 +1,152 @@
+# inventory/management/commands/run_import_worker.py
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+# NOTE: Nothing that touches the models may be imported at module level. Spawned
+# pool processes unpickle `_run_job_in_worker` by importing this module before
+# `_init_worker_process` has had a chance to call django.setup().
+
+# Seconds between checks for running jobs whose worker has died.
+RECLAIM_INTERVAL = 60
+
+
+def _init_worker_process(settings_module):
+    """Boots Django inside a freshly spawned pool process."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def _run_job_in_worker(job_id):
+    from inventory.services.import_jobs import run_import_job
+    try:
+        return run_import_job(job_id)
+    finally:
+        # Pool processes are long-lived; don't leave idle DB connections behind.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    """
+    Processes queued CSV imports (ImportJob rows) in a local process pool.
+    Jobs left Running by a worker that died are reclaimed on start and every
+    RECLAIM_INTERVAL seconds; a pool broken by a dying process is replaced.
+
+    To run this command:
+    $ python manage.py run_import_worker --processes 2
+    """
+
+    help = 'Runs the background worker that processes queued CSV import jobs.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=2, help='Number of worker processes in the pool.')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait between checks for new jobs.')
+        parser.add_argument('--once', action='store_true', help='Process the jobs currently queued, then exit.')
+
+    def handle(self, *args, **options):
+        from inventory.services.import_jobs import claim_next_jobs
+
+        processes = max(options['processes'], 1)
+        poll_interval = options['poll_interval']
+        settings_module = os.environ.get('DJANGO_SETTINGS_MODULE', 'asset_mgmt.settings')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Import worker started with {processes} process(es).'))
+
+        # 'spawn' gives every pool process its own clean Django setup and DB connection
+        # instead of inheriting the parent's open socket through fork().
+        context = multiprocessing.get_context('spawn')
+
+        def new_pool():
+            return ProcessPoolExecutor(max_workers=processes, mp_context=context,
+                                       initializer=_init_worker_process, initargs=(settings_module,))
+
+        pool = new_pool()
+        running = {}
+        next_reclaim = 0
+        try:
+            while True:
+                # Jobs left Running by a worker that died, this one's or a sibling's,
+                # are picked up again (or failed) once their heartbeat is stale.
+                if time.monotonic() >= next_reclaim:
+                    self._reclaim_stale_jobs()
+                    next_reclaim = time.monotonic() + RECLAIM_INTERVAL
+
+                lost = self._collect([f for f in running if f.done()], running)
+
+                free_slots = processes - len(running)
+                job_ids = claim_next_jobs(free_slots) if free_slots > 0 and not lost else []
+                try:
+                    for job_id in job_ids:
+                        self.stdout.write(f'Starting import job #{job_id}...')
+                        running[pool.submit(_run_job_in_worker, job_id)] = job_id
+                except BrokenProcessPool:
+                    lost.extend(job_id for job_id in job_ids if job_id not in running.values())
+
+                if lost:
+                    # A pool process died, which breaks the whole pool: every job still
+                    # in it is lost, not only the one that crashed. Hand them all back
+                    # and carry on with a new pool.
+                    lost.extend(running.values())
+                    running.clear()
+                    self._release(lost)
+                    pool.shutdown(wait=False)
+                    pool = new_pool()
+                    continue
+
+                if options['once'] and not running and not job_ids:
+                    break
+                time.sleep(poll_interval if not job_ids else 0)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Stopping worker; waiting for running jobs to finish...'))
+        finally:
+            pool.shutdown(wait=True)
+
+        lost = self._collect(list(running), running)
+        if lost:
+            self._release(lost)
+
+        self.stdout.write(self.style.SUCCESS('Import worker stopped.'))
+
+    def _collect(self, futures, running):
+        """Reports finished jobs and drops them from `running`; returns the ids lost to a broken pool."""
+        lost = []
+        for future in futures:
+            job_id = running.pop(future)
+            if isinstance(future.exception(), BrokenProcessPool):
+                lost.append(job_id)
+            else:
+                self._report(future, job_id)
+        return lost
+
+    def _release(self, job_ids):
+        from inventory.services.import_jobs import release_jobs
+        requeued, failed = release_jobs(job_ids, 'a process of the import worker pool died')
+        self.stdout.write(self.style.ERROR(
+            f'The worker pool broke; import jobs {", ".join(f"#{job_id}" for job_id in job_ids)} '
+            f'were interrupted ({requeued} requeued, {failed} failed).'
+        ))
+
+    def _reclaim_stale_jobs(self):
+        from inventory.services.import_jobs import reclaim_stale_jobs
+        requeued, failed = reclaim_stale_jobs()
+        if requeued or failed:
+            self.stdout.write(self.style.WARNING(
+                f'Reclaimed stale import jobs: {requeued} requeued, {failed} failed.'
+            ))
+
+    def _report(self, future, job_id):
+        from inventory.services.import_jobs import mark_job_failed
+        try:
+            future.result()
+            self.stdout.write(self.style.SUCCESS(f'✓ Import job #{job_id} finished.'))
+        except Exception as e:
+            # The job raised outside the importer's own error handling.
+            mark_job_failed(job_id, e)
+            self.stdout.write(self.style.ERROR(f'Import job #{job_id} crashed: {e}'))
@@ -0,0 +1,152 @@
+# inventory/metrics.py
+
+import collections
+import threading
+import time
+
+from django.conf import settings
+
+# ===================================================================
+# Request and Query Metrics
+# ===================================================================
+# QueryMetricsMiddleware (middleware.py) times every request and, through a
+# connection.execute_wrapper, every SQL statement it runs. It records:
+#   - wall time
+#   - number of queries
+#   - total DB time
+#   - duplicate queries: the same SQL with the same parameters run again in one
+#     request, the usual sign of an N+1 loop
+#
+# Samples are aggregated per URL name (e.g. 'inventory:asset_list'), per
+# process:
+#   - running totals, exposed as Prometheus counters
+#   - a ring buffer of the last INVENTORY_METRICS_BUFFER_SIZE requests, for
+#     recent latency and query-count quantiles
+# Both are served by the Super_Admin-only /metrics endpoint (api_views.metrics).
+# Responses to staff users (or every response with DEBUG on) also carry the
+# request's own numbers in a Server-Timing header, which the browser's
+# network panel shows. Anonymous clients never see backend timings.
+#
+# Queries run while a streaming response is consumed (the exports) happen
+# after the middleware returns and are not counted.
+
+UNRESOLVED = '<unresolved>'
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class QueryRecorder:
+    """An execute_wrapper that counts and times the SQL statements of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self._statements = collections.Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+            self._statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        """Statements that repeated an earlier one exactly (same SQL and parameters)."""
+        return sum(times - 1 for times in self._statements.values())
+
+
+class _ViewTotals:
+    __slots__ = ('requests', 'server_errors', 'wall_seconds', 'db_seconds', 'queries', 'duplicate_queries')
+
+    def __init__(self):
+        self.requests = self.server_errors = self.queries = self.duplicate_queries = 0
+        self.wall_seconds = self.db_seconds = 0.0
+
+
+_lock = threading.Lock()
+_totals = collections.defaultdict(_ViewTotals)
+_recent = collections.deque(maxlen=getattr(settings, 'INVENTORY_METRICS_BUFFER_SIZE', 1000))
+
+
+def record(view_name, status_code, wall_seconds, recorder):
+    """Adds one finished request to the totals and the ring buffer."""
+    with _lock:
+        totals = _totals[view_name]
+        totals.requests += 1
+        totals.server_errors += status_code >= 500
+        totals.wall_seconds += wall_seconds
+        totals.db_seconds += recorder.duration
+        totals.queries += recorder.count
+        totals.duplicate_queries += recorder.duplicates
+        _recent.append((view_name, wall_seconds, recorder.count))
+
+
+def server_timing(wall_seconds, recorder):
+    """The Server-Timing header value for one request (durations in milliseconds)."""
+    return (
+        f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries, {recorder.duplicates} duplicate", '
+        f'total;dur={wall_seconds * 1000:.1f}'
+    )
+
+
+def _quantile(sorted_values, q):
+    return sorted_values[min(int(q * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def _number(value):
+    # Exact: ':g' keeps only 6 significant digits, so a counter past a million
+    # would stop moving in small steps. Integers as such, floats round-tripped.
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    with _lock:
+        totals = {view: (t.requests, t.server_errors, t.wall_seconds, t.db_seconds, t.queries, t.duplicate_queries)
+                  for view, t in _totals.items()}
+        recent = list(_recent)
+
+    counters = (
+        ('inventory_requests_total', 'Requests handled.', 0),
+        ('inventory_request_server_errors_total', 'Requests answered with a 5xx status.', 1),
+        ('inventory_request_seconds_total', 'Wall time spent handling requests.', 2),
+        ('inventory_db_seconds_total', 'Time spent executing SQL.', 3),
+        ('inventory_db_queries_total', 'SQL statements executed.', 4),
+        ('inventory_db_duplicate_queries_total', 'SQL statements that repeated an earlier one in the same request.', 5),
+    )
+    lines = []
+    for name, help_text, index in counters:
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+        lines += [f'{name}{{view="{_label(view)}"}} {_number(values[index])}' for view, values in sorted(totals.items())]
+
+    # Summaries: latency and query-count quantiles of the recent requests per
+    # view (from the ring buffer), with the running totals as _sum and _count.
+    samples = collections.defaultdict(lambda: ([], []))
+    for view, wall_seconds, queries in recent:
+        samples[view][0].append(wall_seconds)
+        samples[view][1].append(queries)
+    for name, help_text, position, sum_index in (
+        ('inventory_recent_request_seconds', 'Wall time of the most recent requests.', 0, 2),
+        ('inventory_recent_db_queries', 'SQL statements per request, most recent requests.', 1, 4),
+    ):
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} summary']
+        for view, values in sorted(totals.items()):
+            label = f'view="{_label(view)}"'
+            if view in samples:
+                ordered = sorted(samples[view][position])
+                lines += [f'{name}{{{label},quantile="{q}"}} {_number(_quantile(ordered, q))}' for q in QUANTILES]
+            lines += [f'{name}_sum{{{label}}} {_number(values[sum_index])}', f'{name}_count{{{label}}} {_number(values[0])}']
+    return '\n'.join(lines) + '\n'
+
+
+def reset():
+    """Forgets everything recorded so far (for tests and benchmarks)."""
+    with _lock:
+        _totals.clear()
+        _recent.clear()
@@ -1,6 +1,12 @@
 # inventory/middleware.py
 
 import threading
+import time
+
+from django.conf import settings
+from django.db import connection
+
+from . import metrics
 
 _request_storage = threading.local()
 
@@ -14,10 +20,47 @@ class RequestMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
+        # Imported here because the audit writer itself depends on this module.
+        from .services.audit_writer import flush_request_entries
+
         _request_storage.request = request
-        response = self.get_response(request)
-        if hasattr(_request_storage, 'request'):
-            del _request_storage.request
+        try:
+            response = self.get_response(request)
+        finally:
+            if hasattr(_request_storage, 'request'):
+                del _request_storage.request
+            # Audit entries recorded outside a transaction are written once per request.
+            flush_request_entries(request)
+        return response
+
+class QueryMetricsMiddleware:
+    """
+    Records each request's wall time, SQL query count, DB time and duplicate
+    queries per URL name (see metrics.py). Staff users (anyone with DEBUG on)
+    also get them in a Server-Timing header; the timings are not for
+    anonymous clients. Listed first in MIDDLEWARE so the session and
+    authentication queries are counted too.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'INVENTORY_QUERY_METRICS', True)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        recorder = metrics.QueryRecorder()
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        wall_seconds = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else metrics.UNRESOLVED
+        metrics.record(view_name, response.status_code, wall_seconds, recorder)
+        user = getattr(request, 'user', None)
+        if settings.DEBUG or (user is not None and user.is_authenticated and user.is_staff):
+            response['Server-Timing'] = metrics.server_timing(wall_seconds, recorder)
         return response
 
 def get_current_request():
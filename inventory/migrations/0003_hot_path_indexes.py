@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_importjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='allocation',
+            index=models.Index(fields=['employee', 'transaction_status'], name='alloc_employee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='allocation',
+            index=models.Index(fields=['asset', 'transaction_status'], name='alloc_asset_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='allocation',
+            index=models.Index(fields=['assigned_date'], name='alloc_assigned_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['status'], name='asset_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['action_type', 'timestamp'], name='auditlog_action_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['status'], name='employee_status_idx'),
+        ),
+    ]
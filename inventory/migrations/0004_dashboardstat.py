@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:42
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_dashboard_stats(apps, schema_editor):
+    """Seeds the counters from the existing rows so dashboards are correct right away."""
+    Asset = apps.get_model('inventory', 'Asset')
+    Employee = apps.get_model('inventory', 'Employee')
+    DashboardStat = apps.get_model('inventory', 'DashboardStat')
+
+    stats = [
+        DashboardStat(name=f"assets:status:{row['status']}", value=row['count'])
+        for row in Asset.objects.order_by().values('status').annotate(count=Count('pk'))
+    ]
+    stats.append(DashboardStat(name='employees:active', value=Employee.objects.filter(status='Active').count()))
+    DashboardStat.objects.bulk_create(stats)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(populate_dashboard_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:45
+
+import re
+
+from django.db import migrations, models
+
+# A frozen copy of the tokenizer and fields of inventory/services/search.py as
+# they were when this migration was written, so later changes to the live
+# search code cannot change what it does. `manage.py rebuild_search_index`
+# brings the index up to date with the current tokenizer.
+SEARCH_FIELDS = {
+    'asset': ('asset_id', 'serial_number', 'brand', 'model'),
+    'employee': ('full_name', 'email', 'designation'),
+}
+MAX_TOKEN_LENGTH = 100
+_WORD_SPLIT = re.compile(r'[\W_]+')
+
+
+def tokenize(value):
+    if value is None:
+        return set()
+    value = str(value).strip().lower()
+    tokens = {word for word in _WORD_SPLIT.split(value) if word}
+    if value and not any(char.isspace() for char in value):
+        tokens.add(value)
+    return {token[:MAX_TOKEN_LENGTH] for token in tokens}
+
+
+def document_tokens(kind, row):
+    tokens = set()
+    for field in SEARCH_FIELDS[kind]:
+        tokens |= tokenize(row[field])
+    return tokens
+
+
+def populate_search_index(apps, schema_editor):
+    """Indexes the existing assets and employees so search works right after migrating."""
+    SearchEntry = apps.get_model('inventory', 'SearchEntry')
+    models_by_kind = {'asset': apps.get_model('inventory', 'Asset'), 'employee': apps.get_model('inventory', 'Employee')}
+
+    for kind, model in models_by_kind.items():
+        batch = []
+        for row in model.objects.order_by().values('pk', *SEARCH_FIELDS[kind]).iterator(chunk_size=2000):
+            batch.extend(
+                SearchEntry(kind=kind, object_id=str(row['pk']), token=token)
+                for token in document_tokens(kind, row)
+            )
+            if len(batch) >= 2000:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_dashboardstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('asset', 'Asset'), ('employee', 'Employee')], max_length=10)),
+                ('object_id', models.CharField(max_length=50)),
+                ('token', models.CharField(max_length=100)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'token'], name='search_kind_token_idx'), models.Index(fields=['kind', 'object_id'], name='search_kind_object_idx')],
+            },
+        ),
+        migrations.RunPython(populate_search_index, migrations.RunPython.noop),
+    ]
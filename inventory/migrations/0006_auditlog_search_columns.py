@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_searchentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='asset_id',
+            field=models.CharField(blank=True, db_index=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='asset_serial',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='employee_id',
+            field=models.IntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='auditlog',
+            name='employee_name',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+    ]
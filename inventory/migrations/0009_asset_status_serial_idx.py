@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['status', 'serial_number'], name='asset_status_serial_idx'),
+        ),
+    ]
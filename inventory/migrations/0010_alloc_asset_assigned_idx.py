@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0009_asset_status_serial_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='allocation',
+            index=models.Index(fields=['asset', 'assigned_date'], name='alloc_asset_assigned_idx'),
+        ),
+    ]
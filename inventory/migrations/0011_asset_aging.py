@@ -0,0 +1,46 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0010_alloc_asset_assigned_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetAging',
+            fields=[
+                ('asset', models.OneToOneField(db_column='asset_id', on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='aging', serialize=False, to='inventory.asset')),
+                ('warranty_bucket', models.CharField(max_length=20)),
+                ('age_bucket', models.CharField(max_length=20)),
+                ('warranty_expiry', models.DateField(blank=True, null=True)),
+                ('purchase_date', models.DateField(blank=True, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AssetAgingSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(max_length=10)),
+                ('bucket', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('computed_on', models.DateField()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='assetagingsummary',
+            constraint=models.UniqueConstraint(fields=('kind', 'bucket'), name='aging_summary_kind_bucket_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='assetaging',
+            index=models.Index(fields=['warranty_bucket', 'warranty_expiry'], name='aging_warranty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assetaging',
+            index=models.Index(fields=['age_bucket', 'purchase_date'], name='aging_age_idx'),
+        ),
+    ]
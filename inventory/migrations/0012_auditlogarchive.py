@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-17 02:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0011_asset_aging'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditLogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(max_length=255, unique=True)),
+                ('first_timestamp', models.DateTimeField()),
+                ('last_timestamp', models.DateTimeField()),
+                ('first_id', models.BigIntegerField()),
+                ('last_id', models.BigIntegerField()),
+                ('entry_count', models.IntegerField()),
+                ('action_types', models.JSONField(default=list)),
+                ('size_bytes', models.BigIntegerField()),
+                ('checksum', models.CharField(help_text='SHA-256 of the compressed file.', max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-last_timestamp'],
+                'indexes': [models.Index(fields=['last_timestamp', 'first_timestamp'], name='auditarchive_range_idx')],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 # ===================================================================
 # Employee Model
@@ -17,10 +18,26 @@ class Employee(models.Model):
     status = models.CharField(max_length=50, default='Active')
     designation = models.CharField(max_length=255, null=True, blank=True)
     date_of_joining = models.DateField(null=True, blank=True)
+
+    # Version stamp for conditional GETs (see inventory/http_cache.py). Queryset
+    # update() and bulk_update() skip auto_now, so those callers set it themselves.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         db_table = 'inventory_employee'
         ordering = ['full_name'] # Good practice to have a default order
+        indexes = [
+            # Dashboard head-count of active employees.
+            models.Index(fields=['status'], name='employee_status_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so the dashboard counters can tell what changed on save.
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
 
     def __str__(self):
         return self.full_name
@@ -41,10 +58,35 @@ class Asset(models.Model):
     warranty_expiry = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=50, default='Available')
     remarks = models.TextField(null=True, blank=True)
+
+    # Version stamp for conditional GETs; see Employee.updated_at.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         db_table = 'inventory_asset'
         ordering = ['-purchase_date']
+        indexes = [
+            # Dashboard counters and the "Available" dropdown filter on status.
+            models.Index(fields=['status'], name='asset_status_idx'),
+            # The allocation form's asset picker matches a serial number prefix among
+            # available assets. (The asset ID prefix uses asset_status_idx: InnoDB
+            # secondary indexes end with the primary key.)
+            models.Index(fields=['status', 'serial_number'], name='asset_status_serial_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so the dashboard counters can tell what changed on save.
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
+
+    def save(self, *args, **kwargs):
+        # A forced insert creates the row, so there is no stored status to look up.
+        if kwargs.get('force_insert'):
+            self._loaded_status = None
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.brand} {self.model} ({self.serial_number})"
@@ -83,13 +125,30 @@ class Allocation(models.Model):
     remarks = models.TextField(null=True, blank=True)
     
     transaction_status = models.CharField(max_length=50, default='Allocated')
+
+    # Version stamp for conditional GETs; see Employee.updated_at.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     class Meta:
         db_table = 'inventory_allocation'
         ordering = ['-assigned_date']
+        indexes = [
+            # "Which assets does this employee hold right now?"
+            models.Index(fields=['employee', 'transaction_status'], name='alloc_employee_status_idx'),
+            # "Who holds this asset right now?"
+            models.Index(fields=['asset', 'transaction_status'], name='alloc_asset_status_idx'),
+            # An asset's history timeline, newest first, a page at a time.
+            models.Index(fields=['asset', 'assigned_date'], name='alloc_asset_assigned_idx'),
+            # Every allocation list is ordered newest first.
+            models.Index(fields=['assigned_date'], name='alloc_assigned_date_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.employee.full_name} - {self.asset.serial_number}"
+        # Only use the related objects when they are already loaded, so rendering
+        # an allocation never costs extra queries.
+        employee = self.employee.full_name if Allocation.employee.is_cached(self) else f"Employee #{self.employee_id}"
+        asset = self.asset.serial_number if Allocation.asset.is_cached(self) else f"Asset {self.asset_id}"
+        return f"{employee} - {asset}"
 
 # ===================================================================
 # Audit Log Model
@@ -104,15 +163,36 @@ class AuditLog(models.Model):
     # A short, machine-readable code for the type of action performed.
     action_type = models.CharField(max_length=50)
     
-    # Automatically records the timestamp when the log is created.
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Records when the action happened. Set when the entry is built rather than
+    # when it is inserted, because the audit writer inserts entries in batches.
+    timestamp = models.DateTimeField(default=timezone.now)
     
     # JSONField is a flexible way to store rich, structured data about the event.
     # This is where we'll save details like serial numbers, employee names, etc.
     details = models.JSONField(default=dict)
-    
+
+    # Searchable copies of the most common `details` keys, filled in by
+    # signals.create_audit_log. Searching these indexed columns avoids casting
+    # every row's JSON to text.
+    asset_id = models.CharField(max_length=50, null=True, blank=True, db_index=True)
+    asset_serial = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+    employee_id = models.IntegerField(null=True, blank=True, db_index=True)
+    employee_name = models.CharField(max_length=255, null=True, blank=True, db_index=True)
+
+    # details key(s) each searchable column is copied from; deletion logs use the `deleted_` variant.
+    SEARCH_COLUMN_SOURCES = {
+        'asset_id': ('asset_id', 'deleted_asset_id'),
+        'asset_serial': ('asset_serial', 'deleted_asset_serial'),
+        'employee_id': ('employee_id', 'deleted_employee_id'),
+        'employee_name': ('employee_name', 'deleted_employee_name'),
+    }
+
     class Meta:
         ordering = ['-timestamp'] # Always show the most recent logs first.
+        indexes = [
+            # The log viewer filters by action type and sorts by time.
+            models.Index(fields=['action_type', 'timestamp'], name='auditlog_action_time_idx'),
+        ]
 
     # ===================================================================
     # THE FIX: Added a property to format the action_type for display.
@@ -122,6 +202,192 @@ class AuditLog(models.Model):
         """Replaces underscores with spaces and applies title case for clean display."""
         return self.action_type.replace('_', ' ').title()
 
+    @classmethod
+    def search_columns(cls, details):
+        """Extracts the searchable column values from a details dict (missing keys become None)."""
+        columns = {}
+        for column, keys in cls.SEARCH_COLUMN_SOURCES.items():
+            value = next((details[key] for key in keys if details.get(key) not in (None, '')), None)
+            # Bulk import entries hold lists of ids; those are not copied.
+            if isinstance(value, (list, dict)):
+                value = None
+            if value is not None and column == 'employee_id':
+                try:
+                    value = int(value)
+                except (TypeError, ValueError):
+                    value = None
+            elif value is not None:
+                value = str(value)[:cls._meta.get_field(column).max_length]
+            columns[column] = value
+        return columns
+
     def __str__(self):
         actor_name = self.actor.username if self.actor else "System"
-        return f"{actor_name} performed {self.action_type} on {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{actor_name} performed {self.action_type} on {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+
+# ===================================================================
+# Audit Log Archive Model
+# The index of the compressed segment files that old audit entries are moved
+# to by `manage.py archive_audit_logs` (see services/audit_archive.py): one
+# row per file, with the time range it covers and the SHA-256 of its bytes,
+# which is checked every time the file is read.
+# ===================================================================
+class AuditLogArchive(models.Model):
+    file_name = models.CharField(max_length=255, unique=True)
+    first_timestamp = models.DateTimeField()
+    last_timestamp = models.DateTimeField()
+    first_id = models.BigIntegerField()
+    last_id = models.BigIntegerField()
+    entry_count = models.IntegerField()
+    # The distinct action types in the segment, so a filtered search can skip it.
+    action_types = models.JSONField(default=list)
+    size_bytes = models.BigIntegerField()
+    checksum = models.CharField(max_length=64, help_text="SHA-256 of the compressed file.")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-last_timestamp']
+        indexes = [
+            # Finds the segments a date range reaches into.
+            models.Index(fields=['last_timestamp', 'first_timestamp'], name='auditarchive_range_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name} ({self.entry_count} entries)"
+
+# ===================================================================
+# Dashboard Stat Model
+# Materialized counters (asset counts by status, active employees) that are
+# kept up to date incrementally, so dashboards read a handful of rows instead
+# of aggregating the whole inventory. See services/dashboard_stats.py.
+# ===================================================================
+class DashboardStat(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
+
+
+# ===================================================================
+# Import Job Model
+# A DB-backed queue of CSV imports, processed by `manage.py run_import_worker`.
+# ===================================================================
+class ImportJob(models.Model):
+    KIND_ASSETS = 'assets'
+    KIND_EMPLOYEES = 'employees'
+    KIND_CHOICES = [(KIND_ASSETS, 'Assets'), (KIND_EMPLOYEES, 'Employees')]
+
+    STATUS_QUEUED = 'Queued'
+    STATUS_RUNNING = 'Running'
+    STATUS_COMPLETED = 'Completed'
+    STATUS_FAILED = 'Failed'
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, default=STATUS_QUEUED, db_index=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='import_jobs')
+    file_name = models.CharField(max_length=255, blank=True)
+
+    # The raw CSV text is stored with the job so any worker process can pick it up.
+    payload = models.TextField()
+
+    # Progress counters, updated by the worker after every chunk.
+    total_rows = models.IntegerField(default=0)
+    rows_processed = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    updated_count = models.IntegerField(default=0)
+    error_count = models.IntegerField(default=0)
+    errors = models.JSONField(default=list)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    # Refreshed by the worker on claim and after every chunk; a running job whose
+    # heartbeat stops is reclaimed (see services/import_jobs.reclaim_stale_jobs).
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    # How often the job has been claimed; a job that keeps losing its worker is failed.
+    attempts = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    def __str__(self):
+        return f"Import #{self.pk} ({self.kind}, {self.status})"
+
+
+# ===================================================================
+# Search Entry Model
+# The token index behind the asset and employee search boxes: one row per
+# (document, token), so prefix searches become index range scans instead of
+# LIKE '%q%' table scans. Maintained by services/search.py.
+# ===================================================================
+class SearchEntry(models.Model):
+    KIND_ASSET = 'asset'
+    KIND_EMPLOYEE = 'employee'
+    KIND_CHOICES = [(KIND_ASSET, 'Asset'), (KIND_EMPLOYEE, 'Employee')]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # Asset.asset_id or Employee.employee_id, stored as text so both fit one column.
+    object_id = models.CharField(max_length=50)
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            # Serves "token starts with ..." lookups for one kind.
+            models.Index(fields=['kind', 'token'], name='search_kind_token_idx'),
+            # Serves reindexing and removing a single document.
+            models.Index(fields=['kind', 'object_id'], name='search_kind_object_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id} -> {self.token}"
+
+
+# ===================================================================
+# Asset Aging Models
+# Every asset's warranty-expiry horizon and age bucket, precomputed by
+# `manage.py refresh_asset_aging` (see services/asset_aging.py), so due lists
+# are index range scans and the dashboard widget reads a few summary rows.
+# ===================================================================
+class AssetAging(models.Model):
+    asset = models.OneToOneField(Asset, on_delete=models.CASCADE, primary_key=True, db_column='asset_id', related_name='aging')
+    warranty_bucket = models.CharField(max_length=20)
+    age_bucket = models.CharField(max_length=20)
+    # Copied from the asset so a bucket can be listed in date order from the index.
+    warranty_expiry = models.DateField(null=True, blank=True)
+    purchase_date = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # "Which warranties expire in the next 30 days?", soonest first.
+            models.Index(fields=['warranty_bucket', 'warranty_expiry'], name='aging_warranty_idx'),
+            # "Which laptops are older than four years?", oldest first.
+            models.Index(fields=['age_bucket', 'purchase_date'], name='aging_age_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.asset_id}: warranty {self.warranty_bucket}, age {self.age_bucket}"
+
+
+class AssetAgingSummary(models.Model):
+    KIND_WARRANTY = 'warranty'
+    KIND_AGE = 'age'
+
+    kind = models.CharField(max_length=10)
+    bucket = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    # The day the buckets were computed for; they are relative to it.
+    computed_on = models.DateField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'bucket'], name='aging_summary_kind_bucket_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.bucket} = {self.count} ({self.computed_on})"
@@ -0,0 +1,207 @@
+# inventory/pagination.py
+
+import base64
+import json
+
+from django.db import connection
+from django.db.models import Q
+
+# ===================================================================
+# Keyset (Cursor) Pagination
+# ===================================================================
+# Django's Paginator runs a full COUNT(*) and then skips rows with OFFSET,
+# so each page gets slower the deeper you go. The CursorPaginator instead
+# remembers the sort key of the last row shown and asks for "rows after this
+# key", which an index can answer directly at any depth.
+#
+# NULL handling follows MySQL (and SQLite): NULL sorts before every value,
+# i.e. first in ascending and last in descending order. The last ordering
+# field must be unique (normally the primary key) so every row has a distinct key.
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token is malformed or belongs to another ordering."""
+
+
+class CursorPage:
+    """One page of results plus the cursors needed to move to the neighbouring pages."""
+
+    def __init__(self, object_list, has_next, has_previous, next_cursor, previous_cursor, total_count=None):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        # Only set when the caller asked for it; may be an estimate (see approximate_count).
+        self.total_count = total_count
+
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+class CursorPaginator:
+    """
+    Paginates a queryset by keyset on the given ordering, e.g.
+    CursorPaginator(Allocation.objects.all(), ('-assigned_date', '-allocation_id'), 15).
+    Works with model instances as well as values() dictionaries.
+    """
+
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset
+        self.ordering = [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+        self.per_page = per_page
+
+    # --- Cursor encoding -------------------------------------------------
+
+    def _encode(self, direction, row):
+        values = [self._value_of(row, name) for name, _ in self.ordering]
+        payload = json.dumps([direction, values], default=str, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            direction, values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        except (ValueError, TypeError):
+            raise InvalidCursor("Malformed cursor.")
+        if direction not in (NEXT, PREVIOUS) or not isinstance(values, list) or len(values) != len(self.ordering):
+            raise InvalidCursor("The cursor does not match this list.")
+
+        model = self.queryset.model
+        try:
+            values = [
+                None if value is None else model._meta.get_field(name).to_python(value)
+                for (name, _), value in zip(self.ordering, values)
+            ]
+        except Exception:
+            raise InvalidCursor("The cursor contains invalid values.")
+        return direction, values
+
+    @staticmethod
+    def _value_of(row, name):
+        return row[name] if isinstance(row, dict) else getattr(row, name)
+
+    # --- Query building --------------------------------------------------
+
+    def _beyond(self, name, descending, value):
+        """Rows strictly after `value` for a single field, or None if there are none."""
+        if descending:
+            # NULLs come last in descending order, so they are "after" every value.
+            return None if value is None else Q(**{f'{name}__lt': value}) | Q(**{f'{name}__isnull': True})
+        return Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__gt': value})
+
+    @staticmethod
+    def _equal(name, value):
+        return Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+
+    def _after(self, values, reverse):
+        """(k1 > v1) OR (k1 = v1 AND k2 > v2) OR ... in the (optionally reversed) sort order."""
+        condition = Q(pk__in=[])
+        prefix = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            beyond = self._beyond(name, descending != reverse, value)
+            if beyond is not None:
+                condition |= prefix & beyond
+            prefix &= self._equal(name, value)
+        return condition
+
+    def _order_by(self, reverse):
+        return [f"{'-' if descending != reverse else ''}{name}" for name, descending in self.ordering]
+
+    # --- Public API ------------------------------------------------------
+
+    def _rows(self, values, reverse):
+        """Up to per_page + 1 rows after the key `values` (None: from the start), in page order."""
+        queryset = self.queryset.order_by(*self._order_by(reverse))
+        if values is not None:
+            queryset = queryset.filter(self._after(values, reverse))
+        return list(queryset[:self.per_page + 1])
+
+    def _count(self):
+        return approximate_count(self.queryset)
+
+    def page(self, cursor=None, with_count=False):
+        direction, values = self._decode(cursor) if cursor else (NEXT, None)
+        reverse = direction == PREVIOUS
+
+        rows = self._rows(values, reverse)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        has_next = True if reverse else has_more
+        has_previous = has_more if reverse else values is not None
+
+        return CursorPage(
+            rows,
+            has_next=has_next and bool(rows),
+            has_previous=has_previous and bool(rows),
+            next_cursor=self._encode(NEXT, rows[-1]) if has_next and rows else None,
+            previous_cursor=self._encode(PREVIOUS, rows[0]) if has_previous and rows else None,
+            total_count=self._count() if with_count else None,
+        )
+
+
+def approximate_count(queryset):
+    """
+    Returns a cheap row count for the list header. On MySQL an unfiltered table
+    uses the InnoDB statistics estimate instead of a full COUNT(*); everything
+    else falls back to an exact count.
+    """
+    if connection.vendor == 'mysql' and not queryset.query.where:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row and row[0] is not None:
+            return row[0]
+    return queryset.count()
+
+
+def paginate_request(request, queryset, ordering, per_page):
+    """
+    Convenience wrapper for list views: reads `?cursor=` and `?count=1` from the
+    request and falls back to the first page when the cursor is invalid.
+    """
+    return request_page(request, CursorPaginator(queryset, ordering, per_page))
+
+
+def request_page(request, paginator):
+    """The page of any CursorPaginator that the request's `?cursor=` and `?count=1` ask for."""
+    with_count = request.GET.get('count') == '1'
+    try:
+        return paginator.page(request.GET.get('cursor'), with_count=with_count)
+    except InvalidCursor:
+        return paginator.page(None, with_count=with_count)
+
+
+def keyset_batches(queryset, ordering, batch_size):
+    """
+    Yields every row of the queryset as lists of up to `batch_size` rows,
+    walking it page by page in keyset order. For jobs that must visit a
+    whole table without holding it in memory.
+    """
+    paginator = CursorPaginator(queryset, ordering, batch_size)
+    cursor = None
+    while True:
+        page = paginator.page(cursor)
+        if page:
+            yield page.object_list
+        cursor = page.next_cursor
+        if cursor is None:
+            return
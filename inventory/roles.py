@@ -0,0 +1,94 @@
+# inventory/roles.py
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .middleware import get_current_request
+
+# ===================================================================
+# Role Resolution Layer
+# ===================================================================
+# A user's group names are loaded with a single query the first time they are
+# needed and cached on the user object, which lives for exactly one request.
+# The decorator, template filters and views all read from here, so a page
+# render costs one group query instead of one per check.
+#
+# With INVENTORY_ROLE_SESSION_CACHE enabled the names are also kept in the
+# session, so most requests cost no group query at all. Membership changes bump
+# a per-user version in the cache (see signals.invalidate_role_cache), which
+# makes stale session copies be ignored. Use a shared cache backend in
+# multi-process deployments so every worker sees the new version.
+
+_USER_ATTR = '_inventory_role_names'
+_SESSION_KEY = '_inventory_roles'
+
+
+def _version_key(user_id):
+    return f'inventory:roles-version:{user_id}'
+
+
+def _current_version(user_id):
+    """
+    The user's role version. A missing key (never set, or evicted) gets a new
+    token, so a session copy from before the eviction cannot match it again.
+    """
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def _session_for(user):
+    """Returns the session of the current request if it belongs to this user."""
+    if not getattr(settings, 'INVENTORY_ROLE_SESSION_CACHE', False):
+        return None
+    request = get_current_request()
+    if request is None or not hasattr(request, 'session'):
+        return None
+    if getattr(request, 'user', None) is None or request.user.pk != user.pk:
+        return None
+    return request.session
+
+
+def get_user_roles(user):
+    """Returns the names of all groups the user belongs to, as a frozenset."""
+    if not getattr(user, 'is_authenticated', False):
+        return frozenset()
+
+    roles = getattr(user, _USER_ATTR, None)
+    if roles is not None:
+        return roles
+
+    session = _session_for(user)
+    if session is not None:
+        cached = session.get(_SESSION_KEY)
+        version = _current_version(user.pk)
+        if cached and version is not None and cached.get('version') == version:
+            roles = frozenset(cached['roles'])
+        else:
+            roles = frozenset(user.groups.values_list('name', flat=True))
+            session[_SESSION_KEY] = {'roles': sorted(roles), 'version': version}
+    else:
+        roles = frozenset(user.groups.values_list('name', flat=True))
+
+    setattr(user, _USER_ATTR, roles)
+    return roles
+
+
+def has_role(user, *role_names):
+    """True if the user belongs to at least one of the given groups."""
+    return not get_user_roles(user).isdisjoint(role_names)
+
+
+def invalidate_user_roles(user_id, user=None):
+    """Forgets cached roles for a user, both on the object and in any session."""
+    if user is not None and hasattr(user, _USER_ATTR):
+        delattr(user, _USER_ATTR)
+    # A fresh, never-repeating token (rather than a counter) means a version key
+    # that was evicted and recreated (see _current_version) can never match an
+    # old session copy.
+    cache.set(_version_key(user_id), time.time_ns(), None)
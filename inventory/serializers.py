@@ -0,0 +1,153 @@
+# inventory/serializers.py
+
+from django.db.models import F
+
+from .models import Asset, Employee, Allocation, AuditLog
+from .services import search
+from .services.queries import visible_audit_logs
+
+# ===================================================================
+# API v1 Resources
+# ===================================================================
+# Each resource describes what the /api/v1/ endpoints may expose for a model:
+# the public field names and the ORM lookups behind them, the query parameters
+# that filter it, and a stable ordering for cursor pagination.
+#
+# Rows are serialized straight from a values() projection, so only the
+# requested columns are SELECTed, related columns come from a JOIN, and no
+# model instances are built. JsonResponse encodes dates and datetimes as ISO 8601.
+
+
+class Resource:
+    """A read-only API projection of one model."""
+
+    def __init__(self, model, fields, default_fields, filters, ordering, search_kind=None, versioned_by=(),
+                 visible_to=None):
+        self.model = model
+        # {public name: ORM lookup}; related lookups are exposed under a flat name.
+        self.fields = fields
+        self.default_fields = default_fields
+        # {query parameter: ORM lookup}
+        self.filters = filters
+        # Must end with a unique column (see pagination.CursorPaginator).
+        self.ordering = ordering
+        self.search_kind = search_kind
+        # Models whose table revisions cover every field; enables 304 responses (see http_cache.table_version).
+        self.versioned_by = versioned_by
+        # function(user) -> the rows that user may see; default: every row.
+        self.visible_to = visible_to
+
+    @property
+    def pk_name(self):
+        return self.model._meta.pk.name
+
+    def base_queryset(self, request):
+        """The rows the requesting user may see, before any filter is applied."""
+        if self.visible_to is not None:
+            return self.visible_to(request.user)
+        return self.model.objects.all()
+
+    def parse_fields(self, value):
+        """Returns the requested field names, or raises ValueError naming the unknown ones."""
+        if not value:
+            return list(self.default_fields)
+        requested = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in requested if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}.")
+        return list(dict.fromkeys(requested))
+
+    def project(self, queryset, field_names):
+        """
+        A values() queryset with the requested fields. The ordering columns
+        are always selected too, because the cursor is built from them.
+        """
+        names = list(dict.fromkeys(field_names + [name.lstrip('-') for name in self.ordering]))
+        plain = [name for name in names if self.fields.get(name, name) == name]
+        aliased = {name: F(self.fields[name]) for name in names if self.fields.get(name, name) != name}
+        return queryset.values(*plain, **aliased)
+
+    @staticmethod
+    def serialize(rows, field_names):
+        return [{name: row[name] for name in field_names} for row in rows]
+
+    def filter(self, queryset, params):
+        """Applies the supported filters from the query string (and `q` for searchable resources)."""
+        for param, lookup in self.filters.items():
+            value = params.get(param, '').strip()
+            if value:
+                queryset = queryset.filter(**{lookup: value})
+        query = params.get('q', '').strip()
+        if query and self.search_kind:
+            queryset = queryset.filter(pk__in=search.matching_ids(self.search_kind, query))
+        return queryset
+
+
+RESOURCES = {
+    'assets': Resource(
+        Asset,
+        fields={name: name for name in (
+            'asset_id', 'asset_type', 'brand', 'model', 'serial_number', 'processor', 'ram_gb',
+            'storage_size_gb', 'purchase_date', 'warranty_expiry', 'status', 'remarks',
+        )},
+        default_fields=('asset_id', 'asset_type', 'brand', 'model', 'serial_number', 'status'),
+        filters={'status': 'status__iexact', 'asset_type': 'asset_type__iexact', 'brand': 'brand__iexact'},
+        ordering=('asset_id',),
+        search_kind=search.ASSET,
+        versioned_by=(Asset,),
+    ),
+    'employees': Resource(
+        Employee,
+        fields={name: name for name in ('employee_id', 'full_name', 'email', 'status', 'designation', 'date_of_joining')},
+        default_fields=('employee_id', 'full_name', 'email', 'status', 'designation'),
+        filters={'status': 'status__iexact', 'email': 'email__iexact'},
+        ordering=('full_name', 'employee_id'),
+        search_kind=search.EMPLOYEE,
+        versioned_by=(Employee,),
+    ),
+    'allocations': Resource(
+        Allocation,
+        fields=dict(
+            {name: name for name in (
+                'allocation_id', 'asset_id', 'employee_id', 'transaction_status', 'assigned_date', 'returned_date',
+                'allocation_reason', 'allocation_location', 'delivery_type', 'return_reason', 'return_location', 'remarks',
+            )},
+            asset_serial='asset__serial_number',
+            asset_brand='asset__brand',
+            asset_model='asset__model',
+            employee_name='employee__full_name',
+            employee_email='employee__email',
+        ),
+        default_fields=('allocation_id', 'asset_id', 'asset_serial', 'employee_id', 'employee_name', 'transaction_status', 'assigned_date', 'returned_date'),
+        filters={
+            'status': 'transaction_status__iexact',
+            'asset_id': 'asset_id',
+            'employee_id': 'employee_id',
+            'employee_email': 'employee__email__iexact',
+            'assigned_after': 'assigned_date__gte',
+            'assigned_before': 'assigned_date__lt',
+        },
+        ordering=('-assigned_date', '-allocation_id'),
+        versioned_by=(Allocation, Asset, Employee),
+    ),
+    'audit-logs': Resource(
+        AuditLog,
+        fields=dict(
+            {name: name for name in ('id', 'action_type', 'timestamp', 'actor_id', 'asset_id', 'asset_serial', 'employee_id', 'employee_name', 'details')},
+            actor_username='actor__username',
+        ),
+        default_fields=('id', 'action_type', 'timestamp', 'actor_username', 'asset_id', 'employee_id', 'employee_name'),
+        filters={
+            'action_type': 'action_type',
+            'actor_id': 'actor_id',
+            'asset_id': 'asset_id',
+            'employee_id': 'employee_id',
+            'since': 'timestamp__gte',
+            'until': 'timestamp__lt',
+        },
+        # Audit entries have no version stamp; the log grows too fast for a useful one.
+        ordering=('-timestamp', '-id'),
+        # The same role-based visibility as the audit log viewer and exports.
+        visible_to=visible_audit_logs,
+    ),
+}
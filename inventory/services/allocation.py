@@ -0,0 +1,161 @@
+# inventory/services/allocation.py
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Coalesce, Now
+from django.utils import timezone
+
+from .. import caching
+from ..models import Asset, Allocation
+from ..middleware import get_current_user
+from ..signals import create_audit_log
+from .dashboard_stats import adjust_counters, asset_status_delta
+
+# ===================================================================
+# Allocation State Machine
+# ===================================================================
+# Assigning and returning an asset each touch two tables (Allocation and
+# Asset.status). Both happen here in one transaction, with the asset row
+# locked (SELECT ... FOR UPDATE) for the duration, so concurrent requests for
+# the same asset are serialized and the two tables can never disagree.
+#
+# The only valid transitions are:
+#   Asset 'Available' --assign-->  'Allocated'  (new Allocation, 'Allocated')
+#   Asset 'Allocated' --return-->  'Available'  (open Allocation -> 'Returned')
+# Every status change is also a conditional UPDATE (WHERE status = <expected>),
+# so even a database without row locks cannot apply a transition twice.
+
+ASSET_AVAILABLE = 'Available'
+ASSET_ALLOCATED = 'Allocated'
+ALLOCATION_OPEN = 'Allocated'
+ALLOCATION_RETURNED = 'Returned'
+
+# Allocation columns the state machine manages itself; callers cannot set them.
+MANAGED_FIELDS = {'allocation_id', 'asset', 'employee', 'transaction_status', 'assigned_date', 'returned_date'}
+
+
+class AllocationError(ValueError):
+    """Raised when an assignment or return is not a valid transition; the message is shown to the user."""
+
+
+def allocation_details(values):
+    """Keeps only the Allocation columns a caller may fill in (e.g. from form.cleaned_data)."""
+    allowed = {field.name for field in Allocation._meta.concrete_fields} - MANAGED_FIELDS
+    return {name: value for name, value in values.items() if name in allowed}
+
+
+def _lock_asset(asset_id):
+    try:
+        return Asset.objects.select_for_update().only('asset_id', 'status').get(pk=asset_id)
+    except Asset.DoesNotExist:
+        raise AllocationError(f"Asset '{asset_id}' does not exist.")
+
+
+def _set_asset_status(asset_id, expected, new_status):
+    """Conditional status UPDATE; returns the stored status it replaced."""
+    locked = _lock_asset(asset_id)
+    if locked.status.lower() != expected.lower():
+        raise AllocationError(f"Asset '{asset_id}' is {locked.status}, not {expected}.")
+    if not Asset.objects.filter(pk=asset_id, status=locked.status).update(status=new_status, updated_at=timezone.now()):
+        raise AllocationError(f"Asset '{asset_id}' was changed by someone else. Please try again.")
+    # A queryset UPDATE bypasses the post_save counter handler.
+    adjust_counters(asset_status_delta(locked.status, new_status))
+    return locked.status
+
+
+def assign(asset, employee, details=None):
+    """
+    Allocates an available asset to an employee and returns the new Allocation.
+    `asset` and `employee` should be the objects the caller already loaded; they
+    are attached to the allocation so the audit handler needs no extra queries.
+    `details` may hold further Allocation columns (charger status, location, ...).
+    """
+    with transaction.atomic():
+        _set_asset_status(asset.pk, ASSET_AVAILABLE, ASSET_ALLOCATED)
+
+        allocation = Allocation(
+            asset=asset,
+            employee=employee,
+            transaction_status=ALLOCATION_OPEN,
+            assigned_date=timezone.now(),
+            **allocation_details(details or {})
+        )
+        # The ASSET_ASSIGNED audit entry is written by signals.log_allocation_change.
+        allocation.save(force_insert=True)
+
+    asset.status = asset._loaded_status = ASSET_ALLOCATED
+    return allocation
+
+
+def return_asset(asset, employee=None, details=None, actor=None):
+    """
+    Closes the open allocation of an asset and makes the asset available again.
+    When `employee` is given, the open allocation must belong to them.
+    Returns the updated Allocation.
+    """
+    actor = actor or get_current_user()
+    with transaction.atomic():
+        _set_asset_status(asset.pk, ASSET_ALLOCATED, ASSET_AVAILABLE)
+
+        # The asset row is locked, so the open allocation cannot change under us.
+        open_allocations = Allocation.objects.filter(asset_id=asset.pk, transaction_status=ALLOCATION_OPEN)
+        if employee is not None:
+            open_allocations = open_allocations.filter(employee=employee)
+        allocation = open_allocations.first()
+        if allocation is None:
+            raise AllocationError("Could not find an active allocation for this asset and employee combination.")
+
+        now = timezone.now()
+        values = dict(allocation_details(details or {}), transaction_status=ALLOCATION_RETURNED, returned_date=now, updated_at=now)
+        if not Allocation.objects.filter(pk=allocation.pk, transaction_status=ALLOCATION_OPEN).update(**values):
+            raise AllocationError("This allocation was already returned.")
+        for name, value in values.items():
+            setattr(allocation, name, value)
+
+        allocation.asset = asset
+        if employee is not None:
+            allocation.employee = employee
+        # The UPDATE bypasses post_save, so the return is logged and uncached here.
+        _log_return(actor, allocation)
+        caching.allocations_changed([(allocation.asset_id, allocation.employee_id)])
+
+    asset.status = asset._loaded_status = ASSET_AVAILABLE
+    return allocation
+
+
+def held_assets(employee_id):
+    """The employee's open allocations with their assets, newest first. Cached until they change."""
+    return caching.get_or_set(caching.EMPLOYEE_ASSETS, employee_id, lambda: list(
+        Allocation.objects.filter(employee_id=employee_id, transaction_status=ALLOCATION_OPEN)
+        .select_related('asset').order_by('-assigned_date')
+    ))
+
+
+def asset_history(asset_id):
+    """
+    The asset's allocations as values() rows for its history timeline:
+    allocation_id, employee_name, assigned_date, returned_date and `held`,
+    how long the employee had the asset (a timedelta computed by the database,
+    up to now for the open allocation).
+    """
+    return Allocation.objects.filter(asset_id=asset_id).values(
+        'allocation_id', 'assigned_date', 'returned_date',
+        employee_name=F('employee__full_name'),
+        held=Coalesce('returned_date', Now()) - F('assigned_date'),
+    )
+
+
+def _log_return(actor, allocation):
+    """Mirrors log_allocation_change: only actions by an authenticated user are logged."""
+    if not actor:
+        return
+    details = {
+        "actor_name": actor.get_full_name() or actor.username,
+        "asset_id": allocation.asset_id,
+        "asset_serial": allocation.asset.serial_number,
+        "asset_model": allocation.asset.model,
+        "employee_id": allocation.employee_id,
+        "employee_name": allocation.employee.full_name,
+        "allocation_id": allocation.allocation_id,
+    }
+    create_audit_log(actor, "ASSET_RETURNED", details)
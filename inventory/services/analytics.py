@@ -0,0 +1,189 @@
+# inventory/services/analytics.py
+
+import datetime
+
+import numpy as np
+from django.conf import settings
+from django.db.models import DateTimeField, DurationField, ExpressionWrapper, F, Value
+from django.utils import timezone
+
+from .. import caching
+from ..models import Allocation
+from ..pagination import keyset_batches
+
+# ===================================================================
+# Asset Lifecycle Analytics
+# ===================================================================
+# Utilization metrics over the whole allocation history:
+#   - days allocated per allocation and per asset
+#   - idle days between an asset's return and its next allocation
+#   - churn (allocations per asset) by brand and model
+#   - damage rates: assets handed out damaged (asset_condition_on_alloc)
+#     and returned with a damaged screen (asset_screen_status)
+#
+# The history is read as plain values, not model instances, in keyset
+# batches of ANALYTICS_BATCH_SIZE rows. The database returns the start and
+# end of every allocation as an offset from the Unix epoch, so each batch is
+# appended straight to NumPy column arrays and only one batch of rows is held
+# in memory at a time.
+# Every metric is then computed with vectorized operations (bincount,
+# shifted comparisons), with no Python loop over the rows. Open allocations
+# count up to now.
+#
+# The result is cached for INVENTORY_ANALYTICS_TIMEOUT seconds (see caching.py).
+
+DAMAGE_VALUES = ('Damage', 'Flickering')
+SECONDS_PER_DAY = 86400
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+ANALYTICS_BATCH_SIZE = 20000
+
+
+def lifecycle_metrics():
+    """The metrics described above, as a JSON-serializable dict (cached)."""
+    return caching.get_or_set(
+        caching.ANALYTICS, None, compute_metrics, timeout=getattr(settings, 'INVENTORY_ANALYTICS_TIMEOUT', 900)
+    )
+
+
+def _load_columns():
+    """
+    Every dated allocation ordered by asset and start, as a dict of arrays:
+    asset_id, label ("Brand Model"), start, end (seconds since the epoch;
+    end is NaN while open), damaged_on_alloc and screen_damaged (booleans).
+    """
+    epoch = Value(EPOCH, output_field=DateTimeField())
+    history = (
+        Allocation.objects.filter(assigned_date__isnull=False)
+        .annotate(
+            start=ExpressionWrapper(F('assigned_date') - epoch, output_field=DurationField()),
+            end=ExpressionWrapper(F('returned_date') - epoch, output_field=DurationField()),
+        )
+        .values('asset_id', 'assigned_date', 'allocation_id', 'start', 'end',
+                'asset_condition_on_alloc', 'asset_screen_status',
+                brand=F('asset__brand'), model=F('asset__model'))
+    )
+    batches = [
+        _batch_columns(rows)
+        for rows in keyset_batches(history, ('asset_id', 'assigned_date', 'allocation_id'), ANALYTICS_BATCH_SIZE)
+    ]
+    if not batches:
+        return None
+    return {name: np.concatenate([batch[name] for batch in batches]) for name in batches[0]}
+
+
+def _column(rows, name, dtype):
+    return np.fromiter((row[name] for row in rows), dtype=dtype, count=len(rows))
+
+
+def _batch_columns(rows):
+    """The arrays of _load_columns for one batch of rows."""
+    end_deltas = _column(rows, 'end', 'timedelta64[s]')
+    return {
+        'asset_id': _column(rows, 'asset_id', object),
+        'label': np.char.add(np.char.add(_text(_column(rows, 'brand', object)), ' '), _text(_column(rows, 'model', object))),
+        'start': _column(rows, 'start', 'timedelta64[s]').astype(np.float64),
+        # NaT (open allocation) becomes NaN.
+        'end': np.where(np.isnat(end_deltas), np.nan, end_deltas.astype(np.float64)),
+        'damaged_on_alloc': np.isin(_column(rows, 'asset_condition_on_alloc', object), DAMAGE_VALUES),
+        'screen_damaged': np.isin(_column(rows, 'asset_screen_status', object), DAMAGE_VALUES),
+    }
+
+
+def _text(values):
+    """A string array with NULLs as ''."""
+    return np.where(np.equal(values, None), '', values).astype(str)
+
+
+def _safe_ratio(numerator, denominator):
+    """Element-wise numerator / denominator, NaN where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.full_like(numerator, np.nan), where=denominator > 0)
+
+
+def _round(value, digits=1):
+    """A float for JSON: rounded, with NaN (no data) as None."""
+    value = float(value)
+    return None if np.isnan(value) else round(value, digits)
+
+
+def compute_metrics(now=None):
+    """Computes the lifecycle metrics from the database (uncached)."""
+    now = now or timezone.now()
+    generated_at = now.isoformat()
+    columns = _load_columns()
+    if columns is None:
+        return {'generated_at': generated_at, 'summary': {'allocations': 0, 'assets': 0}, 'by_model': []}
+
+    now_seconds = (now - EPOCH).total_seconds()
+    start = columns['start']
+    returned = ~np.isnan(columns['end'])
+    end = np.where(returned, columns['end'], now_seconds)
+    held_days = np.clip(end - start, 0, None) / SECONDS_PER_DAY
+
+    # Rows are sorted by asset, so each asset is a contiguous run; number the runs.
+    asset_ids = columns['asset_id']
+    first_of_asset = np.concatenate(([True], asset_ids[1:] != asset_ids[:-1]))
+    asset_code = np.cumsum(first_of_asset) - 1
+    asset_count = int(asset_code[-1]) + 1
+
+    allocations_per_asset = np.bincount(asset_code, minlength=asset_count)
+    days_per_asset = np.bincount(asset_code, weights=held_days, minlength=asset_count)
+
+    # Idle time: from a return to the next allocation of the same asset.
+    follows_return = (asset_code[1:] == asset_code[:-1]) & returned[:-1]
+    idle_days = np.clip(start[1:] - end[:-1], 0, None)[follows_return] / SECONDS_PER_DAY
+    idle_row = np.nonzero(follows_return)[0] + 1  # the allocation that ended the idle period
+
+    # Brand/model groups, from the first row of each asset.
+    group_labels, asset_group = np.unique(columns['label'][first_of_asset], return_inverse=True)
+    row_group = asset_group[asset_code]
+    group_count = len(group_labels)
+
+    group_assets = np.bincount(asset_group, minlength=group_count)
+    group_allocations = np.bincount(row_group, minlength=group_count)
+    group_days = np.bincount(row_group, weights=held_days, minlength=group_count)
+    group_idle_days = np.bincount(row_group[idle_row], weights=idle_days, minlength=group_count)
+    group_idle_periods = np.bincount(row_group[idle_row], minlength=group_count)
+    group_damaged = np.bincount(row_group, weights=columns['damaged_on_alloc'], minlength=group_count)
+    group_returns = np.bincount(row_group, weights=returned, minlength=group_count)
+    group_screen_damaged = np.bincount(row_group, weights=columns['screen_damaged'] & returned, minlength=group_count)
+
+    avg_days = _safe_ratio(group_days, group_allocations)
+    churn = _safe_ratio(group_allocations, group_assets)
+    avg_idle = _safe_ratio(group_idle_days, group_idle_periods)
+    damage_rate = _safe_ratio(group_damaged, group_allocations) * 100
+    screen_rate = _safe_ratio(group_screen_damaged, group_returns) * 100
+
+    # Busiest models first.
+    order = np.lexsort((group_labels, -group_allocations))
+    by_model = [
+        {
+            'model': group_labels[i].strip() or 'Unknown',
+            'assets': int(group_assets[i]),
+            'allocations': int(group_allocations[i]),
+            'churn': _round(churn[i], 2),
+            'avg_days_per_allocation': _round(avg_days[i]),
+            'avg_idle_days': _round(avg_idle[i]),
+            'damaged_on_allocation_pct': _round(damage_rate[i]),
+            'screen_damaged_on_return_pct': _round(screen_rate[i]),
+        }
+        for i in order
+    ]
+
+    return {
+        'generated_at': generated_at,
+        'summary': {
+            'allocations': int(len(start)),
+            'assets': asset_count,
+            'open_allocations': int((~returned).sum()),
+            'avg_days_per_allocation': _round(held_days.mean()),
+            'avg_days_allocated_per_asset': _round(days_per_asset.mean()),
+            'avg_allocations_per_asset': _round(allocations_per_asset.mean(), 2),
+            'avg_idle_days': _round(idle_days.mean()) if len(idle_days) else None,
+            'median_idle_days': _round(np.median(idle_days)) if len(idle_days) else None,
+            'damaged_on_allocation_pct': _round(columns['damaged_on_alloc'].mean() * 100),
+            'screen_damaged_on_return_pct': _round(_safe_ratio((columns['screen_damaged'] & returned).sum(), returned.sum()) * 100),
+        },
+        'by_model': by_model,
+    }
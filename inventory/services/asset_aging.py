@@ -0,0 +1,132 @@
+# inventory/services/asset_aging.py
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ..models import Asset, AssetAging, AssetAgingSummary
+from ..pagination import keyset_batches
+
+# ===================================================================
+# Warranty-Expiry and Aging Buckets
+# ===================================================================
+# "Which warranties expire in the next 30/60/90 days?" would be a date-range
+# scan over the whole asset table on every request. Instead,
+# `manage.py refresh_asset_aging` (run daily from cron) puts every asset into
+#   a warranty bucket: expired, 0-30, 31-60, 61-90, 90+ days left, or unknown
+#   an age bucket:     <1y, 1-2y, 2-3y, 3-4y, 4y+ since purchase, or unknown
+# stored in AssetAging (indexed on the buckets) plus one AssetAgingSummary row
+# per bucket with its size. The dashboard widget reads the summary rows, and
+# a due list is an index range scan of one bucket.
+#
+# Buckets are relative to the day of the refresh (`computed_on`); assets
+# added or changed since then are picked up by the next refresh.
+
+WARRANTY_EXPIRED = 'expired'
+WARRANTY_30 = '0-30'
+WARRANTY_60 = '31-60'
+WARRANTY_90 = '61-90'
+WARRANTY_LATER = '90+'
+UNKNOWN = 'unknown'
+
+# Display order; also the valid values of AssetAging.warranty_bucket and age_bucket.
+WARRANTY_BUCKETS = (WARRANTY_EXPIRED, WARRANTY_30, WARRANTY_60, WARRANTY_90, WARRANTY_LATER, UNKNOWN)
+AGE_BUCKETS = ('<1y', '1-2y', '2-3y', '3-4y', '4y+', UNKNOWN)
+
+# (last day of the horizon, bucket)
+WARRANTY_HORIZONS = ((30, WARRANTY_30), (60, WARRANTY_60), (90, WARRANTY_90))
+
+# How each kind's due list is ordered: soonest expiry first, oldest purchase first.
+LIST_ORDERING = {
+    AssetAgingSummary.KIND_WARRANTY: ('warranty_expiry', 'asset_id'),
+    AssetAgingSummary.KIND_AGE: ('purchase_date', 'asset_id'),
+}
+
+REFRESH_BATCH_SIZE = 2000
+
+
+def warranty_bucket(warranty_expiry, today):
+    if warranty_expiry is None:
+        return UNKNOWN
+    days_left = (warranty_expiry - today).days
+    if days_left < 0:
+        return WARRANTY_EXPIRED
+    for last_day, bucket in WARRANTY_HORIZONS:
+        if days_left <= last_day:
+            return bucket
+    return WARRANTY_LATER
+
+
+def age_bucket(purchase_date, today):
+    if purchase_date is None:
+        return UNKNOWN
+    # Whole years since purchase; a future purchase date counts as new.
+    years = max((today - purchase_date).days, 0) // 365
+    return AGE_BUCKETS[min(years, 4)]
+
+
+@transaction.atomic
+def refresh(today=None):
+    """
+    Recomputes every asset's buckets and the summary rows for `today`
+    (default: the current local date). Readers see the old or the new
+    buckets, never a mix. Returns {kind: {bucket: count}}.
+    """
+    today = today or timezone.localdate()
+    counts = {
+        AssetAgingSummary.KIND_WARRANTY: dict.fromkeys(WARRANTY_BUCKETS, 0),
+        AssetAgingSummary.KIND_AGE: dict.fromkeys(AGE_BUCKETS, 0),
+    }
+
+    AssetAging.objects.all().delete()
+    assets = Asset.objects.values('asset_id', 'warranty_expiry', 'purchase_date')
+    for rows in keyset_batches(assets, ('asset_id',), REFRESH_BATCH_SIZE):
+        agings = []
+        for row in rows:
+            aging = AssetAging(
+                asset_id=row['asset_id'],
+                warranty_bucket=warranty_bucket(row['warranty_expiry'], today),
+                age_bucket=age_bucket(row['purchase_date'], today),
+                warranty_expiry=row['warranty_expiry'],
+                purchase_date=row['purchase_date'],
+            )
+            counts[AssetAgingSummary.KIND_WARRANTY][aging.warranty_bucket] += 1
+            counts[AssetAgingSummary.KIND_AGE][aging.age_bucket] += 1
+            agings.append(aging)
+        AssetAging.objects.bulk_create(agings)
+
+    AssetAgingSummary.objects.all().delete()
+    AssetAgingSummary.objects.bulk_create([
+        AssetAgingSummary(kind=kind, bucket=bucket, count=count, computed_on=today)
+        for kind, buckets in counts.items()
+        for bucket, count in buckets.items()
+    ])
+    return counts
+
+
+def aging_summary():
+    """
+    The bucket sizes from the last refresh, in one query:
+    {'computed_on': date or None, 'warranty': [{'bucket', 'count'}, ...], 'age': [...]}.
+    """
+    rows = {(row.kind, row.bucket): row for row in AssetAgingSummary.objects.all()}
+    computed_on = next(iter(rows.values())).computed_on if rows else None
+    return {
+        'computed_on': computed_on,
+        **{
+            kind: [{'bucket': bucket, 'count': rows[kind, bucket].count if (kind, bucket) in rows else 0} for bucket in buckets]
+            for kind, buckets in ((AssetAgingSummary.KIND_WARRANTY, WARRANTY_BUCKETS), (AssetAgingSummary.KIND_AGE, AGE_BUCKETS))
+        },
+    }
+
+
+def bucket_assets(kind, bucket):
+    """The assets of one bucket as values() rows, for paging in LIST_ORDERING[kind]."""
+    bucket_field = 'warranty_bucket' if kind == AssetAgingSummary.KIND_WARRANTY else 'age_bucket'
+    return AssetAging.objects.filter(**{bucket_field: bucket}).values(
+        'asset_id', 'warranty_expiry', 'purchase_date',
+        serial_number=F('asset__serial_number'),
+        brand=F('asset__brand'),
+        model=F('asset__model'),
+        status=F('asset__status'),
+    )
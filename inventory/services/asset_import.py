@@ -0,0 +1,206 @@
+# inventory/services/asset_import.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .. import caching
+from ..models import Asset, Allocation
+from ..signals import create_audit_log
+from .dashboard_stats import adjust_counters, asset_status_delta, merge_deltas
+from .search import ASSET, index_documents
+from .csv_import import (
+    DEFAULT_CHUNK_SIZE, ImportResult, RowError,
+    clean_text, iter_row_chunks, parse_int, parse_iso_date,
+)
+
+# ===================================================================
+# Batched Bulk Asset Import Engine
+# ===================================================================
+# Each chunk of the CSV costs one SELECT (to find the existing asset_id /
+# serial_number keys), one bulk INSERT, one bulk UPDATE and one summarized
+# audit entry, all inside a single transaction.
+
+# Every column the CSV is allowed to overwrite on an existing asset.
+ASSET_UPDATE_FIELDS = [
+    'serial_number', 'asset_type', 'brand', 'model', 'processor', 'ram_gb',
+    'storage_size_gb', 'purchase_date', 'warranty_expiry', 'status', 'remarks',
+    # bulk_update() skips auto_now, so the version stamp is written explicitly.
+    'updated_at',
+]
+
+
+def parse_asset_row(row):
+    """Converts a raw CSV row into Asset field values, raising RowError on bad data."""
+    asset_id = clean_text(row, 'asset_id')
+    serial_number = clean_text(row, 'serial_number')
+    if not asset_id or not serial_number:
+        raise RowError("`asset_id` and `serial_number` are required fields.")
+
+    return {
+        'asset_id': asset_id,
+        'serial_number': serial_number,
+        'asset_type': clean_text(row, 'asset_type', 'Laptop'),
+        'brand': clean_text(row, 'brand'),
+        'model': clean_text(row, 'model'),
+        'processor': clean_text(row, 'processor'),
+        'ram_gb': parse_int(row, 'ram_gb'),
+        'storage_size_gb': parse_int(row, 'storage_size_gb'),
+        'purchase_date': parse_iso_date(row, 'purchase_date'),
+        'warranty_expiry': parse_iso_date(row, 'warranty_expiry'),
+        'status': clean_text(row, 'status', 'Available'),
+        'remarks': clean_text(row, 'remarks'),
+    }
+
+
+def import_assets(lines, actor=None, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """
+    Imports assets from an iterable of CSV text lines.
+    New asset_ids are inserted, known ones are updated in place.
+    `on_chunk(result)` is called after every chunk so callers can report progress.
+    Returns an ImportResult with per-row errors.
+    """
+    result = ImportResult()
+    seen_asset_ids = {}
+
+    for chunk_number, chunk in enumerate(iter_row_chunks(lines, chunk_size), 1):
+        parsed_rows = []
+        for row_num, row in chunk:
+            result.rows_processed += 1
+            try:
+                values = parse_asset_row(row)
+            except RowError as e:
+                result.add_error(row_num, str(e))
+                continue
+
+            # Validation: A file must not mention the same asset twice, otherwise
+            # the later row would silently overwrite the earlier one.
+            first_row = seen_asset_ids.get(values['asset_id'])
+            if first_row:
+                result.add_error(row_num, f"Duplicate `asset_id` '{values['asset_id']}' (already imported from row {first_row}).")
+                continue
+            seen_asset_ids[values['asset_id']] = row_num
+            parsed_rows.append((row_num, values))
+
+        if parsed_rows:
+            _apply_chunk(chunk_number, parsed_rows, actor, result)
+        if on_chunk:
+            on_chunk(result)
+
+    return result
+
+
+def _apply_chunk(chunk_number, parsed_rows, actor, result):
+    """Writes one chunk of validated rows using bulk operations in a single transaction."""
+    asset_ids = [values['asset_id'] for _, values in parsed_rows]
+    serials = [values['serial_number'] for _, values in parsed_rows]
+
+    # Pre-fetch every existing key this chunk could collide with in one query.
+    # The stored status comes along so the dashboard counters can be adjusted.
+    status_by_id = {}
+    id_by_serial = {}
+    existing_keys = Asset.objects.filter(
+        Q(asset_id__in=asset_ids) | Q(serial_number__in=serials)
+    ).order_by().values_list('asset_id', 'serial_number', 'status')
+    for asset_id, serial_number, status in existing_keys:
+        status_by_id[asset_id] = status
+        id_by_serial[serial_number] = asset_id
+
+    to_create = []
+    to_update = []
+    now = timezone.now()
+    for row_num, values in parsed_rows:
+        owner = id_by_serial.get(values['serial_number'])
+        if owner is not None and owner != values['asset_id']:
+            result.add_error(row_num, f"The serial number '{values['serial_number']}' already belongs to asset '{owner}'.")
+            continue
+        id_by_serial[values['serial_number']] = values['asset_id']
+
+        asset = Asset(updated_at=now, **values)
+        if values['asset_id'] in status_by_id:
+            to_update.append((row_num, asset))
+        else:
+            to_create.append((row_num, asset))
+
+    try:
+        with transaction.atomic():
+            Asset.objects.bulk_create([asset for _, asset in to_create])
+            Asset.objects.bulk_update([asset for _, asset in to_update], ASSET_UPDATE_FIELDS)
+            _record_chunk(actor, chunk_number, parsed_rows, to_create, to_update, status_by_id)
+    except IntegrityError:
+        # Another writer changed the table between the pre-fetch and the write.
+        # Fall back to row-by-row savepoints so only the offending rows fail,
+        # still in one transaction with the chunk's bookkeeping.
+        with transaction.atomic():
+            to_create, to_update, status_by_id = _apply_rows_individually(to_create, to_update, result)
+            _record_chunk(actor, chunk_number, parsed_rows, to_create, to_update, status_by_id)
+
+    result.created_count += len(to_create)
+    result.updated_count += len(to_update)
+
+
+def _apply_rows_individually(to_create, to_update, result):
+    """
+    Writes the rows one savepoint at a time. Whether a row is inserted or
+    updated is decided again from the stored row, whose status is re-read
+    (and locked) so the counters see what the row actually changed from.
+    Returns (created, updated, status_by_id).
+    """
+    created, updated, status_by_id = [], [], {}
+    for row_num, asset in to_create + to_update:
+        try:
+            with transaction.atomic():
+                stored_status = Asset.objects.select_for_update().filter(pk=asset.pk).values_list('status', flat=True).first()
+                if stored_status is None:
+                    Asset.objects.bulk_create([asset])
+                    created.append((row_num, asset))
+                else:
+                    Asset.objects.filter(pk=asset.pk).update(**{f: getattr(asset, f) for f in ASSET_UPDATE_FIELDS})
+                    updated.append((row_num, asset))
+                    status_by_id[asset.pk] = stored_status
+        except IntegrityError:
+            result.add_error(row_num, f"A database error occurred. The serial number '{asset.serial_number}' might already exist.")
+    return created, updated, status_by_id
+
+
+def _record_chunk(actor, chunk_number, parsed_rows, to_create, to_update, status_by_id):
+    """
+    Applies the chunk's net dashboard counter changes, search index updates and
+    cache invalidation (bulk writes bypass the post_save handlers) and emits one
+    summarized audit entry for the chunk.
+    """
+    deltas = {}
+    for _, asset in to_create + to_update:
+        merge_deltas(deltas, asset_status_delta(status_by_id.get(asset.asset_id), asset.status))
+    adjust_counters(deltas)
+    index_documents(ASSET, [asset for _, asset in to_create + to_update])
+    _uncache_chunk(to_create, to_update)
+    _log_chunk(actor, chunk_number, parsed_rows, to_create, to_update)
+
+
+def _uncache_chunk(to_create, to_update):
+    holder_ids = Allocation.objects.filter(
+        asset_id__in=[asset.asset_id for _, asset in to_update], transaction_status='Allocated'
+    ).values_list('employee_id', flat=True) if to_update else ()
+    caching.assets_changed([asset.asset_id for _, asset in to_create + to_update], holder_ids)
+
+
+def _log_chunk(actor, chunk_number, parsed_rows, to_create, to_update):
+    """
+    Emits one summarized audit entry for the whole chunk.
+    Mirrors log_asset_save: only Super Admin activity on the inventory is logged.
+    """
+    if not actor or not actor.is_superuser or not (to_create or to_update):
+        return
+
+    details = {
+        "actor_name": actor.get_full_name() or actor.username,
+        "chunk": chunk_number,
+        "first_row": parsed_rows[0][0],
+        "last_row": parsed_rows[-1][0],
+        "created_count": len(to_create),
+        "updated_count": len(to_update),
+        "created_asset_ids": [asset.asset_id for _, asset in to_create],
+        "updated_asset_ids": [asset.asset_id for _, asset in to_update],
+    }
+    create_audit_log(actor, "ASSET_BULK_IMPORTED", details)
@@ -0,0 +1,403 @@
+# inventory/services/audit_archive.py
+
+import datetime
+import gzip
+import hashlib
+import heapq
+import json
+import os
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..models import AuditLog, AuditLogArchive
+from ..pagination import CursorPaginator, keyset_batches
+from .queries import AUDIT_SUMMARY_KEYS, parse_filter_date
+
+# ===================================================================
+# Audit Log Archive
+# ===================================================================
+# AuditLog is append-only, so it grows without bound while the viewer almost
+# only shows recent entries. `manage.py archive_audit_logs --older-than 365`
+# moves old entries out of the table into gzip-compressed JSON Lines segment
+# files, one per calendar month, under INVENTORY_AUDIT_ARCHIVE_DIR. Each
+# segment is recorded in AuditLogArchive (the index) with:
+#   - its time and id range
+#   - its action types
+#   - the SHA-256 of the file
+#
+# Entries stay immutable:
+#   - a segment is written and made read-only before its index row exists
+#   - the index row is created in the same transaction that deletes the
+#     archived rows, so every entry is in exactly one place at any time
+#   - the checksum is verified the first time a process reads a segment, and
+#     every time by --verify; a segment that fails it is never shown
+#
+# The viewer only reads segments when its date filter reaches into the
+# archive (see ArchivedAuditLogPaginator). Without a start date, or with one
+# after the archived range, it stays on the table. A page then reads only the
+# segments that can hold its entries, streaming them from disk.
+#
+# The exports reach into the archive the same way, with the viewer's filters,
+# merging the archived entries into the rows from the table (see
+# entries_newest_first and exports.archived_rows).
+#
+# This is an archive rather than MySQL partitioning: partitioned tables
+# cannot have the foreign key to auth_user and need the partitioning column
+# in every unique key.
+
+ARCHIVE_BATCH_SIZE = 5000
+READ_CHUNK_SIZE = 1024 * 1024
+
+# The columns copied into each archived entry, besides the actor's names.
+ENTRY_FIELDS = (
+    'id', 'timestamp', 'action_type', 'actor_id', 'details',
+    'asset_id', 'asset_serial', 'employee_id', 'employee_name',
+)
+
+
+class ArchiveIntegrityError(Exception):
+    """Raised when a segment file is missing or does not match its checksum."""
+
+
+def archive_dir():
+    return getattr(settings, 'INVENTORY_AUDIT_ARCHIVE_DIR', str(settings.BASE_DIR / 'audit_archive'))
+
+
+def segment_path(file_name):
+    return os.path.join(archive_dir(), file_name)
+
+
+# --- Writing ---------------------------------------------------------------
+
+def _month_of(timestamp):
+    local = timezone.localtime(timestamp)
+    return local.year, local.month
+
+
+def archive(cutoff, batch_size=ARCHIVE_BATCH_SIZE, dry_run=False, on_segment=None):
+    """
+    Moves every audit entry older than `cutoff` (an aware datetime) into
+    monthly segments, streaming the rows into each file as they are read.
+    `on_segment(segment)` is called after each one. A dry run only compresses
+    (to count and measure) and writes, indexes and deletes nothing.
+    Returns the segments (unsaved on a dry run).
+    """
+    entries = AuditLog.objects.filter(timestamp__lt=cutoff).values(
+        *ENTRY_FIELDS,
+        actor_username=F('actor__username'),
+        actor_first_name=F('actor__first_name'),
+        actor_last_name=F('actor__last_name'),
+    )
+    segments, writer = [], None
+    try:
+        for rows in keyset_batches(entries, ('timestamp', 'id'), batch_size):
+            for row in rows:
+                month = _month_of(row['timestamp'])
+                if writer is not None and writer.month != month:
+                    segments.append(writer.finish())
+                    writer = None
+                    if on_segment:
+                        on_segment(segments[-1])
+                if writer is None:
+                    writer = _SegmentWriter(month, dry_run)
+                writer.add(row)
+        if writer is not None:
+            segments.append(writer.finish())
+            writer = None
+            if on_segment:
+                on_segment(segments[-1])
+    finally:
+        if writer is not None:
+            writer.discard()
+    return segments
+
+
+class _HashingSink:
+    """A write-only file object that hashes and counts the bytes, and passes them on to `target` if given."""
+
+    def __init__(self, target=None):
+        self.target = target
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        if self.target is not None:
+            self.target.write(data)
+        return len(data)
+
+    def flush(self):
+        if self.target is not None:
+            self.target.flush()
+
+
+class _SegmentWriter:
+    """Compresses one month's entries (oldest first) into a segment file as they are added."""
+
+    def __init__(self, month, dry_run):
+        self.month = month
+        self.dry_run = dry_run
+        self.ids = []
+        self.action_types = set()
+        self.first_timestamp = self.last_timestamp = None
+        self.temporary = None
+        target = None
+        if not dry_run:
+            os.makedirs(archive_dir(), exist_ok=True)
+            self.temporary = segment_path(f".partial-{month[0]:04d}-{month[1]:02d}-{os.getpid()}")
+            target = open(self.temporary, 'wb')
+        self.sink = _HashingSink(target)
+        # mtime=0 keeps the bytes (and so the checksum) a function of the content alone.
+        self.gzip = gzip.GzipFile(fileobj=self.sink, mode='wb', mtime=0)
+
+    def add(self, row):
+        # The timestamp is written by hand: the JSON encoder would cut it to milliseconds.
+        entry = {**row, 'timestamp': row['timestamp'].isoformat()}
+        self.gzip.write(json.dumps(entry, cls=DjangoJSONEncoder, sort_keys=True).encode('utf-8') + b'\n')
+        self.ids.append(row['id'])
+        self.action_types.add(row['action_type'])
+        self.first_timestamp = self.first_timestamp or row['timestamp']
+        self.last_timestamp = row['timestamp']
+
+    def _close(self):
+        if self.gzip.closed:
+            return
+        self.gzip.close()
+        if self.sink.target is not None:
+            self.sink.target.flush()
+            os.fsync(self.sink.target.fileno())
+            self.sink.target.close()
+
+    def discard(self):
+        self._close()
+        if self.temporary and os.path.exists(self.temporary):
+            os.remove(self.temporary)
+
+    def finish(self):
+        """Completes the file, then indexes it and deletes its rows in one transaction."""
+        self._close()
+        year, month = self.month
+        segment = AuditLogArchive(
+            file_name=f"audit-{year:04d}-{month:02d}-{min(self.ids)}-{max(self.ids)}.jsonl.gz",
+            first_timestamp=self.first_timestamp,
+            last_timestamp=self.last_timestamp,
+            first_id=min(self.ids),
+            last_id=max(self.ids),
+            entry_count=len(self.ids),
+            action_types=sorted(self.action_types),
+            size_bytes=self.sink.size,
+            checksum=self.sink.sha256.hexdigest(),
+        )
+        if self.dry_run:
+            return segment
+
+        path = segment_path(segment.file_name)
+        os.chmod(self.temporary, 0o444)
+        os.replace(self.temporary, path)
+        try:
+            with transaction.atomic():
+                segment.save()
+                for start in range(0, len(self.ids), ARCHIVE_BATCH_SIZE):
+                    AuditLog.objects.filter(pk__in=self.ids[start:start + ARCHIVE_BATCH_SIZE]).delete()
+        except Exception:
+            # The rows are still in the table, so the file must not survive either.
+            os.remove(path)
+            raise
+        return segment
+
+
+# --- Reading ---------------------------------------------------------------
+
+# (path, checksum) of the segments this process has verified. Segment
+# files are read-only and never rewritten, so one check per process suffices.
+_verified_segments = set()
+
+
+def _check_checksum(segment):
+    sha256 = hashlib.sha256()
+    try:
+        with open(segment_path(segment.file_name), 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+    except OSError as e:
+        raise ArchiveIntegrityError(f"Archive segment {segment.file_name} cannot be read: {e}")
+    if sha256.hexdigest() != segment.checksum:
+        raise ArchiveIntegrityError(f"Archive segment {segment.file_name} does not match its checksum.")
+
+
+def check_segment(segment, recheck=False):
+    """
+    Raises ArchiveIntegrityError unless the segment file matches its checksum.
+    Checked once per process, or every time with `recheck`.
+    """
+    key = (segment_path(segment.file_name), segment.checksum)
+    if recheck or key not in _verified_segments:
+        _check_checksum(segment)
+        _verified_segments.add(key)
+
+
+def read_segment(segment, recheck=False):
+    """
+    Yields the entries of a segment as dicts (timestamp as an aware datetime),
+    oldest first, streaming the file. It is checked against its checksum
+    (see check_segment) before the first entry.
+    """
+    check_segment(segment, recheck)
+    try:
+        with gzip.open(segment_path(segment.file_name), 'rb') as f:
+            for line in f:
+                entry = json.loads(line)
+                entry['timestamp'] = parse_datetime(entry['timestamp'])
+                yield entry
+    except OSError as e:
+        raise ArchiveIntegrityError(f"Archive segment {segment.file_name} cannot be read: {e}")
+
+
+def verify(segment):
+    """Checks a segment's checksum and entry count; raises ArchiveIntegrityError on a mismatch."""
+    count = sum(1 for _ in read_segment(segment, recheck=True))
+    if count != segment.entry_count:
+        raise ArchiveIntegrityError(
+            f"Archive segment {segment.file_name} holds {count} entries, the index says {segment.entry_count}."
+        )
+
+
+def archived_before():
+    """The timestamp of the newest archived entry, or None if nothing is archived."""
+    return AuditLogArchive.objects.aggregate(newest=Max('last_timestamp'))['newest']
+
+
+def segments_for(params):
+    """
+    The segments the viewer's filters reach into: none without a start date,
+    otherwise those overlapping [start_date, end_date] that hold the filtered
+    action type.
+    """
+    start_date = parse_filter_date(params.get('start_date'))
+    if start_date is None:
+        return []
+    segments = AuditLogArchive.objects.filter(last_timestamp__gte=_start_of_day(start_date))
+    end_date = parse_filter_date(params.get('end_date'))
+    if end_date:
+        segments = segments.filter(first_timestamp__lt=_start_of_day(end_date + datetime.timedelta(days=1)))
+    action_type = params.get('action_type')
+    return [segment for segment in segments if not action_type or action_type in segment.action_types]
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def as_log(entry):
+    """
+    An archived entry as an unsaved AuditLog, with its actor and summary_*
+    attributes set like audit_log_summaries rows, so the same templates
+    render it. `archived` tells the two apart.
+    """
+    log = AuditLog(**{name: entry[name] for name in ENTRY_FIELDS if name != 'actor_id'})
+    log.actor = None if entry['actor_id'] is None else User(
+        id=entry['actor_id'],
+        username=entry['actor_username'] or '',
+        first_name=entry['actor_first_name'] or '',
+        last_name=entry['actor_last_name'] or '',
+    )
+    details = entry['details'] or {}
+    for name, keys in AUDIT_SUMMARY_KEYS.items():
+        setattr(log, name, next((details[key] for key in keys if details.get(key) is not None), None))
+    log.archived = True
+    return log
+
+
+def _sort_key(row):
+    return (row['timestamp'], row['id']) if isinstance(row, dict) else (row.timestamp, row.id)
+
+
+def entries_newest_first(segments, matches):
+    """
+    Yields the entries of `segments` accepted by `matches`, newest first, for
+    reading them all (the exports). Files are stored oldest first, so each
+    segment's matching entries are reversed in memory; segments whose time
+    ranges overlap are merged, the others read one after another.
+    """
+    for group in _overlapping(sorted(segments, key=lambda s: s.last_timestamp, reverse=True)):
+        yield from heapq.merge(
+            *[reversed([entry for entry in read_segment(segment) if matches(entry)]) for segment in group],
+            key=_sort_key, reverse=True,
+        )
+
+
+def _overlapping(segments):
+    """Splits segments sorted newest first into runs of overlapping time ranges."""
+    group, earliest = [], None
+    for segment in segments:
+        if group and segment.last_timestamp < earliest:
+            yield group
+            group = []
+        earliest = segment.first_timestamp if not group else min(earliest, segment.first_timestamp)
+        group.append(segment)
+    if group:
+        yield group
+
+
+class ArchivedAuditLogPaginator(CursorPaginator):
+    """
+    Pages newest first through the live entries of `queryset` and the
+    archived entries of `segments` accepted by `matches`, as one list.
+    Each page merges the next rows of both. It reads only the segments whose
+    time range can still hold entries of the page, nearest first, and stops
+    once a full page is found. Every segment is read for the total count.
+    """
+
+    def __init__(self, queryset, segments, matches, per_page):
+        super().__init__(queryset, ('-timestamp', '-id'), per_page)
+        self.segments = segments
+        self.matches = matches
+        # {file name: matching entries} of the segments read so far, for _count.
+        self._match_counts = {}
+
+    def _scan(self, segment):
+        count = 0
+        for entry in read_segment(segment):
+            if self.matches(entry):
+                count += 1
+                yield entry
+        self._match_counts[segment.file_name] = count
+
+    def _rows(self, values, reverse):
+        # Page order is newest first, or oldest first when paging backwards.
+        pick = heapq.nsmallest if reverse else heapq.nlargest
+        limit = self.per_page + 1
+        bound = tuple(values) if values is not None else None
+        rows = super()._rows(values, reverse)
+
+        for segment in sorted(self.segments, key=lambda s: s.first_timestamp if reverse else s.last_timestamp,
+                              reverse=not reverse):
+            # Entirely on the wrong side of the cursor.
+            if bound is not None and (segment.last_timestamp < bound[0] if reverse else segment.first_timestamp > bound[0]):
+                continue
+            # The page is full and this segment (like all later ones) lies beyond its last row.
+            if len(rows) >= limit:
+                edge = _sort_key(rows[-1])[0]
+                if segment.first_timestamp > edge if reverse else segment.last_timestamp < edge:
+                    break
+            entries = self._scan(segment)
+            if bound is not None:
+                entries = (entry for entry in entries if (_sort_key(entry) > bound if reverse else _sort_key(entry) < bound))
+            rows = pick(limit, rows + [as_log(entry) for entry in pick(limit, entries, key=_sort_key)], key=_sort_key)
+        return rows
+
+    def _count(self):
+        archived = 0
+        for segment in self.segments:
+            if segment.file_name not in self._match_counts:
+                for _ in self._scan(segment):
+                    pass
+            archived += self._match_counts[segment.file_name]
+        return super()._count() + archived
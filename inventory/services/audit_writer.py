@@ -0,0 +1,197 @@
+# inventory/services/audit_writer.py
+
+import atexit
+import logging
+import queue
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+
+from ..models import AuditLog
+from ..middleware import get_current_request
+
+logger = logging.getLogger(__name__)
+
+# ===================================================================
+# Batched Audit Log Writer
+# ===================================================================
+# Audit entries are not INSERTed one by one while a request runs. Instead:
+#   * inside a transaction they are buffered and written with one bulk_create
+#     when it commits (transaction.on_commit), and dropped if it rolls back,
+#     exactly like the changes they describe;
+#   * outside a transaction, during a request, they are buffered on the request
+#     and written by RequestMiddleware once the response is ready;
+#   * anywhere else (shell, scripts) they are written immediately.
+#
+# With INVENTORY_AUDIT_ASYNC enabled, a flush hands the batch to a background
+# thread instead of writing it in the caller's thread. The queue is bounded:
+# when the writer falls behind, callers wait up to INVENTORY_AUDIT_QUEUE_TIMEOUT
+# seconds for space and then write the batch themselves. Entries are therefore
+# never dropped under load. They can only be lost if the process dies hard
+# while its queue is non-empty; a normal interpreter shutdown drains the queue.
+
+# Upper bound on entries per INSERT when the background writer merges queued batches.
+MAX_WRITE_BATCH = 1000
+WRITE_ATTEMPTS = 3
+
+_local = threading.local()
+_REQUEST_ATTR = '_audit_log_entries'
+
+
+def record(entry):
+    """Schedules an unsaved AuditLog instance to be written (see module comment)."""
+    if connection.in_atomic_block:
+        _transaction_buffer().entries.append(entry)
+        return
+
+    request = get_current_request()
+    if request is not None:
+        request.__dict__.setdefault(_REQUEST_ATTR, []).append(entry)
+        return
+
+    write_entries([entry])
+
+
+def flush_request_entries(request):
+    """Writes the entries buffered on a request. Called by RequestMiddleware."""
+    write_entries(request.__dict__.pop(_REQUEST_ATTR, []))
+
+
+def write_entries(entries):
+    if not entries:
+        return
+    if getattr(settings, 'INVENTORY_AUDIT_ASYNC', False):
+        _background_writer().submit(entries)
+    else:
+        AuditLog.objects.bulk_create(entries)
+
+
+# --- Per-transaction buffers ---------------------------------------------
+
+class _TransactionBuffer:
+    def __init__(self, savepoint_ids):
+        self.entries = []
+        self.savepoint_ids = savepoint_ids
+        self.scheduled = False
+        self._callback = None
+
+    def schedule(self):
+        """Registers the flush to run when the transaction commits."""
+        def flush():
+            self.flush()
+        # Held weakly: when a rollback discards the callback, Django drops its
+        # only strong reference and the buffer is known to be dead.
+        self._callback = weakref.ref(flush)
+        self.scheduled = True
+        transaction.on_commit(flush)
+
+    @property
+    def pending(self):
+        """False once the flush has run or was discarded by a rollback."""
+        return self.scheduled and self._callback() is not None
+
+    def flush(self):
+        self.scheduled = False
+        entries, self.entries = self.entries, []
+        write_entries(entries)
+
+
+def _transaction_buffer():
+    """
+    Returns the buffer for the current transaction (or savepoint), starting a
+    new one when there is none yet. Buffers are tied to a savepoint so that
+    rolling back a nested atomic block discards the entries recorded inside it,
+    along with its on_commit callback.
+    """
+    savepoint_ids = tuple(connection.savepoint_ids)
+    buffer = getattr(_local, 'buffer', None)
+    if buffer is None or buffer.savepoint_ids != savepoint_ids or not buffer.pending:
+        buffer = _TransactionBuffer(savepoint_ids)
+        _local.buffer = buffer
+        buffer.schedule()
+    return buffer
+
+
+# --- Background writer ---------------------------------------------------
+
+class BackgroundAuditWriter:
+    """A daemon thread that INSERTs queued batches, merging them when it falls behind."""
+
+    _STOP = object()
+
+    def __init__(self, max_batches, put_timeout):
+        self.queue = queue.Queue(maxsize=max_batches)
+        self.put_timeout = put_timeout
+        self.thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, entries):
+        try:
+            self.queue.put(entries, timeout=self.put_timeout)
+        except queue.Full:
+            # Backpressure: rather than dropping entries, the caller pays for the INSERT.
+            logger.warning("Audit log queue is full; writing %d entries synchronously.", len(entries))
+            AuditLog.objects.bulk_create(entries)
+
+    def stop(self, timeout=10):
+        """Writes everything still queued, then ends the thread."""
+        try:
+            self.queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            logger.error("Audit log writer did not drain in time; %d batches are still queued.", self.queue.qsize())
+            return
+        self.thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = self.queue.get()
+            if batch is self._STOP:
+                break
+            entries = list(batch)
+            # Merge whatever else is already waiting into the same INSERT.
+            while len(entries) < MAX_WRITE_BATCH:
+                try:
+                    batch = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if batch is self._STOP:
+                    stopping = True
+                    break
+                entries.extend(batch)
+            self._write(entries)
+        connection.close()
+
+    def _write(self, entries):
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                AuditLog.objects.bulk_create(entries, batch_size=MAX_WRITE_BATCH)
+                return
+            except DatabaseError:
+                logger.exception("Writing %d audit entries failed (attempt %d of %d).", len(entries), attempt, WRITE_ATTEMPTS)
+                # Drop a possibly broken connection; the next query opens a fresh one.
+                connection.close()
+                time.sleep(attempt)
+        # Last resort: keep the entries in the application log so they can be replayed by hand.
+        for entry in entries:
+            logger.error("Unwritten audit entry: actor_id=%s action=%s timestamp=%s details=%s",
+                         entry.actor_id, entry.action_type, entry.timestamp.isoformat(), entry.details)
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def _background_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundAuditWriter(
+                max_batches=getattr(settings, 'INVENTORY_AUDIT_QUEUE_SIZE', 1000),
+                put_timeout=getattr(settings, 'INVENTORY_AUDIT_QUEUE_TIMEOUT', 2.0),
+            )
+            atexit.register(_writer.stop)
+    return _writer
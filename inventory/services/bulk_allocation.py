@@ -0,0 +1,261 @@
+# inventory/services/bulk_allocation.py
+
+import csv
+import io
+import json
+
+from django.db import models, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .. import caching
+from ..models import Asset, Allocation, Employee
+from ..signals import create_audit_log
+from .allocation import (
+    ALLOCATION_OPEN, ALLOCATION_RETURNED, ASSET_ALLOCATED, ASSET_AVAILABLE,
+    AllocationError, allocation_details,
+)
+from .csv_import import ImportResult, RowError, clean_text, parse_int
+from .dashboard_stats import adjust_counters, asset_status_delta, merge_deltas
+
+# ===================================================================
+# Bulk Allocation and Return
+# ===================================================================
+# Onboarding and offboarding waves submit hundreds of (employee, asset) pairs
+# at once. A batch costs a fixed number of queries, however many rows it has:
+# employees and assets are resolved with one IN-query each, availability is
+# checked in memory, and all Allocation rows and Asset statuses are written
+# in one transaction.
+#
+# Invalid rows are reported and skipped; the valid rows are written together.
+# Bulk writes bypass the signal handlers, so counters, caches and the audit
+# log are updated here.
+# The asset rows are locked (SELECT ... FOR UPDATE) like in services/allocation.py,
+# so a batch cannot race with single assignments through the form.
+
+MODE_ASSIGN = 'assign'
+MODE_RETURN = 'return'
+
+# A batch is held in memory and written in one transaction, so keep it bounded.
+MAX_BULK_ROWS = 5000
+
+
+class BulkAllocationError(ValueError):
+    """Raised when a bulk file cannot be read at all; the message is shown to the user."""
+
+
+def read_rows(text, file_name=''):
+    """
+    Parses an uploaded CSV or JSON (a list of objects) file into (row_num, row) tuples.
+    JSON is detected by the .json extension or a leading '['.
+    """
+    text = text.lstrip('﻿')
+    if file_name.lower().endswith('.json') or text.lstrip().startswith('['):
+        try:
+            data = json.loads(text)
+        except ValueError as e:
+            raise BulkAllocationError(f"The file is not valid JSON: {e}")
+        if not isinstance(data, list) or not all(isinstance(item, dict) for item in data):
+            raise BulkAllocationError("The JSON file must contain a list of objects.")
+        # Cells are normalized to text so both formats go through the same parsing.
+        rows = [
+            (row_num, {key: None if value is None else str(value) for key, value in item.items()})
+            for row_num, item in enumerate(data, 1)
+        ]
+    else:
+        rows = list(enumerate(csv.DictReader(io.StringIO(text)), 2))
+
+    if len(rows) > MAX_BULK_ROWS:
+        raise BulkAllocationError(f"A batch may contain at most {MAX_BULK_ROWS} rows, got {len(rows)}.")
+    return rows
+
+
+def _parse_details(row):
+    """Reads the optional Allocation columns present in the row."""
+    details = {}
+    for name, value in allocation_details(row).items():
+        field = Allocation._meta.get_field(name)
+        if isinstance(field, models.IntegerField):
+            details[name] = parse_int(row, name)
+        elif isinstance(field, (models.CharField, models.TextField)):
+            details[name] = clean_text(row, name)
+        # Date columns are managed by the state machine and not accepted from files.
+    return {name: value for name, value in details.items() if value is not None}
+
+
+def _lock_assets(asset_ids):
+    return {
+        asset.asset_id: asset
+        for asset in Asset.objects.select_for_update().only('asset_id', 'status').filter(asset_id__in=asset_ids).order_by()
+    }
+
+
+def _flip_statuses(assets, expected, new_status):
+    """One conditional UPDATE for all assets; the count must match or the batch is rolled back."""
+    updated = Asset.objects.filter(
+        asset_id__in=[asset.asset_id for asset in assets], status__iexact=expected
+    ).update(status=new_status, updated_at=timezone.now())
+    if updated != len(assets):
+        raise AllocationError("Some assets were changed by someone else during the batch. Please try again.")
+
+    deltas = {}
+    for asset in assets:
+        merge_deltas(deltas, asset_status_delta(asset.status, new_status))
+    # A queryset UPDATE bypasses the post_save counter handler.
+    adjust_counters(deltas)
+
+
+# --- Bulk assign ---------------------------------------------------------
+
+def bulk_assign(rows, actor=None, dry_run=False):
+    """
+    Assigns assets from rows with `employee_email` and `asset_id` columns plus
+    any optional Allocation columns (allocation_reason, charger_status, ...).
+    Returns an ImportResult; created_count is the number of new allocations.
+    """
+    result = ImportResult()
+    errors, parsed = [], []
+    seen_assets = {}
+    for row_num, row in rows:
+        result.rows_processed += 1
+        try:
+            email = clean_text(row, 'employee_email')
+            asset_id = clean_text(row, 'asset_id')
+            if not email or not asset_id:
+                raise RowError("`employee_email` and `asset_id` are required.")
+            if asset_id in seen_assets:
+                raise RowError(f"Asset '{asset_id}' is already assigned in row {seen_assets[asset_id]}.")
+            parsed.append((row_num, email, asset_id, _parse_details(row)))
+            seen_assets[asset_id] = row_num
+        except RowError as e:
+            errors.append((row_num, str(e)))
+
+    if not parsed:
+        return _finish(result, errors)
+
+    with transaction.atomic():
+        # Matched case-insensitively in the query too: an exact email__in misses
+        # "John@x.com" for "john@x.com" on case-sensitive collations.
+        employees = {
+            employee.email.lower(): employee
+            for employee in Employee.objects.annotate(email_lower=Lower('email')).filter(
+                email_lower__in={email.lower() for _, email, _, _ in parsed}
+            ).order_by()
+        }
+        assets = _lock_assets([asset_id for _, _, asset_id, _ in parsed])
+
+        now = timezone.now()
+        allocations = []
+        for row_num, email, asset_id, details in parsed:
+            employee = employees.get(email.lower())
+            asset = assets.get(asset_id)
+            if employee is None:
+                errors.append((row_num, f"Employee with email '{email}' does not exist."))
+            elif asset is None:
+                errors.append((row_num, f"Asset '{asset_id}' does not exist."))
+            elif asset.status.lower() != ASSET_AVAILABLE.lower():
+                errors.append((row_num, f"Asset '{asset_id}' is {asset.status}, not {ASSET_AVAILABLE}."))
+            else:
+                allocations.append(Allocation(
+                    asset=asset, employee=employee, transaction_status=ALLOCATION_OPEN, assigned_date=now, **details
+                ))
+
+        if allocations and not dry_run:
+            Allocation.objects.bulk_create(allocations, batch_size=1000)
+            _flip_statuses([allocation.asset for allocation in allocations], ASSET_AVAILABLE, ASSET_ALLOCATED)
+            _log_batch(actor, "ASSET_BULK_ASSIGNED", allocations)
+            caching.allocations_changed((allocation.asset_id, allocation.employee_id) for allocation in allocations)
+        result.created_count = len(allocations)
+
+    return _finish(result, errors)
+
+
+# --- Bulk return ---------------------------------------------------------
+
+def bulk_return(rows, actor=None, dry_run=False):
+    """
+    Returns assets from rows with an `asset_id` column, an optional
+    `employee_email` (which must match the current holder) and any optional
+    return columns (return_reason, asset_screen_status, ...).
+    Returns an ImportResult; updated_count is the number of closed allocations.
+    """
+    result = ImportResult()
+    errors, parsed = [], []
+    seen_assets = {}
+    for row_num, row in rows:
+        result.rows_processed += 1
+        try:
+            asset_id = clean_text(row, 'asset_id')
+            if not asset_id:
+                raise RowError("`asset_id` is required.")
+            if asset_id in seen_assets:
+                raise RowError(f"Asset '{asset_id}' is already returned in row {seen_assets[asset_id]}.")
+            parsed.append((row_num, asset_id, clean_text(row, 'employee_email'), _parse_details(row)))
+            seen_assets[asset_id] = row_num
+        except RowError as e:
+            errors.append((row_num, str(e)))
+
+    if not parsed:
+        return _finish(result, errors)
+
+    with transaction.atomic():
+        asset_ids = [asset_id for _, asset_id, _, _ in parsed]
+        assets = _lock_assets(asset_ids)
+        open_allocations = {
+            allocation.asset_id: allocation
+            for allocation in Allocation.objects.filter(
+                asset_id__in=asset_ids, transaction_status=ALLOCATION_OPEN
+            ).select_related('employee').order_by()
+        }
+
+        now = timezone.now()
+        returned, changed_fields = [], {'transaction_status', 'returned_date', 'updated_at'}
+        for row_num, asset_id, email, details in parsed:
+            asset = assets.get(asset_id)
+            allocation = open_allocations.get(asset_id)
+            if asset is None:
+                errors.append((row_num, f"Asset '{asset_id}' does not exist."))
+            elif asset.status.lower() != ASSET_ALLOCATED.lower() or allocation is None:
+                errors.append((row_num, f"Asset '{asset_id}' is not currently allocated."))
+            elif email and allocation.employee.email.lower() != email.lower():
+                errors.append((row_num, f"Asset '{asset_id}' is allocated to {allocation.employee.email}, not {email}."))
+            else:
+                for name, value in details.items():
+                    setattr(allocation, name, value)
+                changed_fields.update(details)
+                allocation.transaction_status = ALLOCATION_RETURNED
+                allocation.returned_date = allocation.updated_at = now
+                allocation.asset = asset
+                returned.append(allocation)
+
+        if returned and not dry_run:
+            Allocation.objects.bulk_update(returned, sorted(changed_fields), batch_size=1000)
+            _flip_statuses([allocation.asset for allocation in returned], ASSET_ALLOCATED, ASSET_AVAILABLE)
+            _log_batch(actor, "ASSET_BULK_RETURNED", returned)
+            caching.allocations_changed((allocation.asset_id, allocation.employee_id) for allocation in returned)
+        result.updated_count = len(returned)
+
+    return _finish(result, errors)
+
+
+def _finish(result, errors):
+    """Reports the skipped rows in file order, whichever check rejected them."""
+    for row_num, message in sorted(errors):
+        result.add_error(row_num, message)
+    return result
+
+
+def _log_batch(actor, action_type, allocations):
+    """
+    Emits one summarized audit entry for the whole batch (bulk writes bypass
+    log_allocation_change). Like it, only actions by an authenticated user are logged.
+    """
+    if not actor:
+        return
+    details = {
+        "actor_name": actor.get_full_name() or actor.username,
+        "allocation_count": len(allocations),
+        "asset_ids": [allocation.asset_id for allocation in allocations],
+        "employee_ids": [allocation.employee_id for allocation in allocations],
+    }
+    create_audit_log(actor, action_type, details)
@@ -0,0 +1,82 @@
+# inventory/services/csv_import.py
+
+import csv
+from itertools import islice
+
+from django.utils.dateparse import parse_date
+
+# ===================================================================
+# Shared helpers for the chunked CSV import engines
+# ===================================================================
+# Rows are read lazily from the uploaded file and handed to the engines in
+# fixed-size chunks, so memory use stays flat no matter how large the CSV is.
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+class RowError(ValueError):
+    """Raised while parsing a single CSV row; the message is shown to the user."""
+
+
+class ImportResult:
+    """Collects the outcome of a bulk import run."""
+
+    def __init__(self):
+        self.rows_processed = 0
+        self.created_count = 0
+        self.updated_count = 0
+        self.errors = []
+
+    def add_error(self, row_num, message):
+        self.errors.append(f"Row {row_num}: {message}")
+
+    def __repr__(self):
+        return (
+            f"<ImportResult processed={self.rows_processed} created={self.created_count} "
+            f"updated={self.updated_count} errors={len(self.errors)}>"
+        )
+
+
+def iter_row_chunks(lines, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yields lists of (row_num, row) tuples read from an iterable of CSV text lines.
+    Row numbers start at 2 so they match the line numbers users see in a spreadsheet.
+    """
+    reader = enumerate(csv.DictReader(lines), 2)
+    while True:
+        chunk = list(islice(reader, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def clean_text(row, key, default=None):
+    """Returns a stripped value from the row, or the default for missing/empty cells."""
+    value = row.get(key)
+    if value is None:
+        return default
+    value = value.strip()
+    return value or default
+
+
+def parse_int(row, key):
+    value = clean_text(row, key)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise RowError(f"`{key}` must be a whole number, got '{value}'.")
+
+
+def parse_iso_date(row, key):
+    value = clean_text(row, key)
+    if value is None:
+        return None
+    try:
+        parsed = parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise RowError(f"`{key}` must be a valid date in YYYY-MM-DD format, got '{value}'.")
+    return parsed
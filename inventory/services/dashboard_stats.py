@@ -0,0 +1,109 @@
+# inventory/services/dashboard_stats.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .. import caching
+from ..models import Asset, Employee, DashboardStat
+
+# ===================================================================
+# Materialized Dashboard Counters
+# ===================================================================
+# The signal handlers, the allocation flow and the bulk importers report
+# every change as a small delta ({counter name: +/-n}). The dashboards then
+# read all counters with a single query, which is itself cached until the
+# next delta. `manage.py rebuild_dashboard_stats` recomputes everything from
+# scratch for reconciliation.
+
+ASSET_STATUS_PREFIX = 'assets:status:'
+ACTIVE_EMPLOYEES = 'employees:active'
+
+
+def asset_status_key(status):
+    return f"{ASSET_STATUS_PREFIX}{status}"
+
+
+def asset_status_delta(old_status, new_status):
+    """Returns the counter changes for an asset moving from one status to another (None = absent)."""
+    deltas = {}
+    if old_status == new_status:
+        return deltas
+    if old_status is not None:
+        deltas[asset_status_key(old_status)] = -1
+    if new_status is not None:
+        deltas[asset_status_key(new_status)] = 1
+    return deltas
+
+
+def employee_status_delta(old_status, new_status):
+    return {ACTIVE_EMPLOYEES: int(new_status == 'Active') - int(old_status == 'Active')}
+
+
+def merge_deltas(target, deltas):
+    for name, delta in deltas.items():
+        target[name] = target.get(name, 0) + delta
+    return target
+
+
+def adjust_counters(deltas):
+    """Applies {counter name: delta} with atomic in-database increments."""
+    if any(deltas.values()):
+        caching.counters_changed()
+    for name, delta in deltas.items():
+        if not delta:
+            continue
+        if DashboardStat.objects.filter(name=name).update(value=F('value') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                DashboardStat.objects.create(name=name, value=delta)
+        except IntegrityError:
+            # Another request created the row first; increment it instead.
+            DashboardStat.objects.filter(name=name).update(value=F('value') + delta)
+
+
+def read_counters():
+    """Returns every counter as a {name: value} dict in one query."""
+    return dict(DashboardStat.objects.values_list('name', 'value'))
+
+
+def cached_counters():
+    """read_counters() through the cache; for the dashboards and list pages."""
+    return caching.get_or_set(caching.DASHBOARD_COUNTERS, None, read_counters)
+
+
+def asset_status_counts(counters):
+    """Returns [{'status': ..., 'count': ...}] like the old GROUP BY status aggregate."""
+    return [
+        {'status': name[len(ASSET_STATUS_PREFIX):], 'count': value}
+        for name, value in sorted(counters.items())
+        if name.startswith(ASSET_STATUS_PREFIX) and value > 0
+    ]
+
+
+def compute_counters():
+    """Recomputes every counter from the source tables."""
+    counters = {
+        asset_status_key(row['status']): row['count']
+        for row in Asset.objects.order_by().values('status').annotate(count=Count('pk'))
+    }
+    counters[ACTIVE_EMPLOYEES] = Employee.objects.filter(status='Active').count()
+    return counters
+
+
+@transaction.atomic
+def rebuild_counters():
+    """
+    Replaces the stored counters with freshly computed values.
+    Returns {name: (old value, new value)} for every counter that had drifted.
+    """
+    stored = read_counters()
+    fresh = compute_counters()
+    DashboardStat.objects.all().delete()
+    DashboardStat.objects.bulk_create([DashboardStat(name=name, value=value) for name, value in fresh.items()])
+    caching.counters_changed()
+    return {
+        name: (stored.get(name, 0), fresh.get(name, 0))
+        for name in set(stored) | set(fresh)
+        if stored.get(name, 0) != fresh.get(name, 0)
+    }
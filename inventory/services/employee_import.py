@@ -0,0 +1,196 @@
+# inventory/services/employee_import.py
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .. import caching
+from ..models import Allocation, Employee
+from ..signals import create_audit_log
+from .dashboard_stats import adjust_counters, employee_status_delta, merge_deltas
+from .search import EMPLOYEE, index_documents
+from .csv_import import (
+    DEFAULT_CHUNK_SIZE, ImportResult, RowError,
+    clean_text, iter_row_chunks, parse_iso_date,
+)
+
+# ===================================================================
+# Streaming Bulk Employee Import Engine
+# ===================================================================
+# The existing Employee table is read once into a case-insensitive email
+# index. The CSV is then streamed in fixed-size batches: every row is matched
+# against the index in memory and each batch is written with one bulk INSERT
+# and one bulk UPDATE, so the number of queries no longer grows with the file.
+
+# Every column the CSV is allowed to overwrite on an existing employee.
+# The stored email is kept as-is, so a row that differs only in letter case
+# updates the existing record instead of tripping the unique constraint.
+# bulk_update() skips auto_now, so the version stamp is written explicitly.
+EMPLOYEE_UPDATE_FIELDS = ['full_name', 'designation', 'status', 'date_of_joining', 'updated_at']
+
+
+def parse_employee_row(row):
+    """Converts a raw CSV row into Employee field values, raising RowError on bad data."""
+    full_name = clean_text(row, 'full_name')
+    email = clean_text(row, 'email')
+    if not full_name or not email:
+        raise RowError("`full_name` and `email` are required.")
+
+    return {
+        'full_name': full_name,
+        'email': email,
+        'designation': clean_text(row, 'designation'),
+        'status': clean_text(row, 'status', 'Active'),
+        'date_of_joining': parse_iso_date(row, 'date_of_joining'),
+    }
+
+
+def build_email_index():
+    """
+    Returns {lower-cased email: (employee_id, status)} for the whole table, read in
+    one streamed query. The status is kept so the dashboard counters can be adjusted.
+    """
+    rows = Employee.objects.order_by().values_list('email', 'employee_id', 'status').iterator(chunk_size=5000)
+    return {email.lower(): (employee_id, status) for email, employee_id, status in rows}
+
+
+def import_employees(lines, actor=None, chunk_size=DEFAULT_CHUNK_SIZE, on_chunk=None):
+    """
+    Imports employees from an iterable of CSV text lines, matching on email
+    case-insensitively. A second row for the same email is reported as an
+    error instead of silently overwriting the first one.
+    `on_chunk(result)` is called after every batch so callers can report progress.
+    """
+    result = ImportResult()
+    email_index = build_email_index()
+    first_row_by_email = {}
+
+    for chunk_number, chunk in enumerate(iter_row_chunks(lines, chunk_size), 1):
+        to_create, to_update = [], []
+        old_status_by_id = {}
+        for row_num, row in chunk:
+            result.rows_processed += 1
+            try:
+                values = parse_employee_row(row)
+            except RowError as e:
+                result.add_error(row_num, str(e))
+                continue
+
+            key = values['email'].lower()
+            first_row = first_row_by_email.get(key)
+            if first_row:
+                result.add_error(row_num, f"Duplicate email '{values['email']}' (already imported from row {first_row}).")
+                continue
+            first_row_by_email[key] = row_num
+
+            existing = email_index.get(key)
+            if existing is None:
+                to_create.append((row_num, Employee(**values)))
+            else:
+                employee_id, old_status_by_id[employee_id] = existing
+                values.pop('email')
+                to_update.append((row_num, Employee(employee_id=employee_id, updated_at=timezone.now(), **values)))
+
+        if to_create or to_update:
+            with transaction.atomic():
+                to_create, to_update = _write_batch(to_create, to_update, result)
+                _count_batch(to_create, to_update, old_status_by_id)
+                _index_batch(to_create, to_update)
+                _uncache_batch(to_update)
+                _log_chunk(actor, chunk_number, chunk, to_create, to_update)
+            result.created_count += len(to_create)
+            result.updated_count += len(to_update)
+        if on_chunk:
+            on_chunk(result)
+
+    return result
+
+
+def _write_batch(to_create, to_update, result):
+    """Writes one batch with bulk operations; returns the rows that were actually saved."""
+    try:
+        with transaction.atomic():
+            Employee.objects.bulk_create([employee for _, employee in to_create])
+            Employee.objects.bulk_update([employee for _, employee in to_update], EMPLOYEE_UPDATE_FIELDS)
+        return to_create, to_update
+    except IntegrityError:
+        # Someone added a clashing email after the index was built.
+        # Retry row by row so only the offending rows fail.
+        pass
+
+    created, updated = [], []
+    for row_num, employee in to_create:
+        try:
+            with transaction.atomic():
+                Employee.objects.bulk_create([employee])
+            created.append((row_num, employee))
+        except IntegrityError:
+            result.add_error(row_num, f"Employee with email '{employee.email}' might already exist.")
+    for row_num, employee in to_update:
+        with transaction.atomic():
+            Employee.objects.bulk_update([employee], EMPLOYEE_UPDATE_FIELDS)
+        updated.append((row_num, employee))
+    return created, updated
+
+
+def _count_batch(to_create, to_update, old_status_by_id):
+    """Applies the batch's net dashboard counter changes; bulk writes bypass the post_save handlers."""
+    deltas = {}
+    for _, employee in to_create:
+        merge_deltas(deltas, employee_status_delta(None, employee.status))
+    for _, employee in to_update:
+        merge_deltas(deltas, employee_status_delta(old_status_by_id[employee.employee_id], employee.status))
+    adjust_counters(deltas)
+
+
+def _index_batch(to_create, to_update):
+    """
+    Reindexes the batch for search. The rows are re-read in one query because
+    bulk_create does not return primary keys on MySQL and the update objects
+    carry no email.
+    """
+    if not (to_create or to_update):
+        return
+    saved = Employee.objects.filter(
+        Q(email__in=[employee.email for _, employee in to_create]) |
+        Q(employee_id__in=[employee.employee_id for _, employee in to_update])
+    )
+    index_documents(EMPLOYEE, saved)
+
+
+def _uncache_batch(to_update):
+    """
+    Every written batch changes the employee table (and so the list's ETag).
+    New employees have nothing cached yet; updated ones may appear as holders
+    in cached asset details.
+    """
+    if not to_update:
+        caching.tables_changed(('employee',))
+        return
+    employee_ids = [employee.employee_id for _, employee in to_update]
+    held_asset_ids = Allocation.objects.filter(
+        employee_id__in=employee_ids, transaction_status='Allocated'
+    ).order_by().values_list('asset_id', flat=True)
+    caching.employees_changed(employee_ids, held_asset_ids)
+
+
+def _log_chunk(actor, chunk_number, chunk, to_create, to_update):
+    """
+    Emits one summarized audit entry for the whole batch.
+    Mirrors log_employee_save: only Super Admin activity is logged.
+    """
+    if not actor or not actor.is_superuser or not (to_create or to_update):
+        return
+
+    details = {
+        "actor_name": actor.get_full_name() or actor.username,
+        "chunk": chunk_number,
+        "first_row": chunk[0][0],
+        "last_row": chunk[-1][0],
+        "created_count": len(to_create),
+        "updated_count": len(to_update),
+        # bulk_create does not return primary keys on MySQL, so new rows are identified by email.
+        "created_employee_emails": [employee.email for _, employee in to_create],
+        "updated_employee_ids": [employee.employee_id for _, employee in to_update],
+    }
+    create_audit_log(actor, "EMPLOYEE_BULK_IMPORTED", details)
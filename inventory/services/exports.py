@@ -0,0 +1,169 @@
+# inventory/services/exports.py
+
+import csv
+import datetime
+import heapq
+import itertools
+import json
+import zlib
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..pagination import keyset_batches
+from ..serializers import RESOURCES
+from . import audit_archive
+from .queries import audit_log_matcher, filter_audit_logs, search_transactions, visible_audit_logs
+from .search import ASSET, EMPLOYEE, matching_ids
+
+# ===================================================================
+# Streaming Exports
+# ===================================================================
+# Assets, employees, allocations and audit logs can be exported as CSV or
+# JSON Lines, optionally gzip-compressed, by the export views and by
+# `manage.py export_inventory`. The columns are those of the /api/v1/
+# resources (serializers.RESOURCES).
+#
+# Rows are read in keyset batches of EXPORT_BATCH_SIZE (see pagination.py)
+# and each batch is encoded and handed on before the next one is read, so
+# memory stays flat however large the table is. A plain .iterator() would
+# not do on MySQL: mysqlclient buffers the whole result set client-side.
+# Keyset batches also keep every query short, and each one is answered
+# from the ordering index.
+#
+# An audit log export whose start date reaches into the archive (see
+# audit_archive.py) merges the archived entries in, as the viewer does.
+# Those are held in memory one segment (a month) at a time.
+
+KINDS = ('assets', 'employees', 'allocations', 'audit-logs')
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+FORMATS = (FORMAT_CSV, FORMAT_JSONL)
+
+CONTENT_TYPES = {FORMAT_CSV: 'text/csv; charset=utf-8', FORMAT_JSONL: 'application/x-ndjson'}
+
+EXPORT_BATCH_SIZE = 2000
+
+
+def export_queryset(kind, params, user=None):
+    """
+    The rows of `kind` to export, with the same filters and visibility
+    rules as the page they come from (dict-like `params`):
+      assets, employees   ?q= as on the asset and employee lists
+      allocations         ?search_type=&query= as in the transaction search (all without a query)
+      audit-logs          the audit log viewer's filters, as seen by `user`
+    """
+    model = RESOURCES[kind].model
+    query = (params.get('q') or params.get('query') or '').strip()
+
+    if kind == 'assets':
+        queryset = model.objects.all()
+        if query:
+            queryset = queryset.filter(asset_id__in=matching_ids(ASSET, query))
+    elif kind == 'employees':
+        queryset = model.objects.all()
+        if query:
+            queryset = queryset.filter(employee_id__in=matching_ids(EMPLOYEE, query))
+    elif kind == 'allocations':
+        queryset = model.objects.all()
+        if query:
+            queryset = search_transactions(params.get('search_type') or 'employee', query)
+            if queryset is None:
+                raise ValueError("search_type must be 'employee' or 'asset'.")
+    else:
+        queryset = filter_audit_logs(visible_audit_logs(user), params)
+    return queryset
+
+
+def archived_rows(kind, params, user=None):
+    """
+    The archived audit entries the filters reach into, as export rows newest
+    first, or None when there are none (see audit_archive.segments_for). The
+    segments' checksums are checked here, so a damaged one fails the export
+    with ArchiveIntegrityError before anything is sent.
+    """
+    if kind != 'audit-logs':
+        return None
+    segments = audit_archive.segments_for(params)
+    if not segments:
+        return None
+    for segment in segments:
+        audit_archive.check_segment(segment)
+    field_names = list(RESOURCES[kind].fields)
+    entries = audit_archive.entries_newest_first(segments, audit_log_matcher(params, user))
+    return ({name: entry[name] for name in field_names} for entry in entries)
+
+
+def export_batches(kind, queryset, batch_size=EXPORT_BATCH_SIZE, archived=None):
+    """
+    Yields the queryset's rows as lists of values() dicts, one keyset batch at
+    a time, with the `archived` rows (see archived_rows) merged in.
+    """
+    resource = RESOURCES[kind]
+    batches = keyset_batches(resource.project(queryset, list(resource.fields)), resource.ordering, batch_size)
+    if archived is None:
+        return batches
+    # Both are newest first, the audit-logs ordering.
+    rows = heapq.merge(itertools.chain.from_iterable(batches), archived,
+                       key=lambda row: (row['timestamp'], row['id']), reverse=True)
+    return _batched(rows, batch_size)
+
+
+def _batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- Encoding ------------------------------------------------------------
+
+class _Echo:
+    """A file-like object whose write() returns the line, so csv.writer can build strings."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, cls=DjangoJSONEncoder)
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def encode(kind, batches, file_format):
+    """Yields one text chunk per batch: CSV with a header row, or one JSON object per line."""
+    field_names = list(RESOURCES[kind].fields)
+    if file_format == FORMAT_CSV:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(field_names)
+        for rows in batches:
+            yield ''.join(writer.writerow([_csv_value(row[name]) for name in field_names]) for row in rows)
+    else:
+        for rows in batches:
+            yield ''.join(
+                json.dumps({name: row[name] for name in field_names}, cls=DjangoJSONEncoder) + '\n' for row in rows
+            )
+
+
+def gzip_chunks(chunks):
+    """Compresses text chunks into a gzip stream as they come."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def file_name(kind, file_format, compressed, today=None):
+    today = today or datetime.date.today()
+    return f"{kind}-{today:%Y%m%d}.{file_format}{'.gz' if compressed else ''}"
@@ -0,0 +1,194 @@
+# inventory/services/import_jobs.py
+
+import csv
+import datetime
+import io
+import logging
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ..models import ImportJob
+from .asset_import import import_assets
+from .employee_import import import_employees
+
+logger = logging.getLogger(__name__)
+
+# ===================================================================
+# Background CSV Import Jobs
+# ===================================================================
+# Views enqueue a job and return immediately; `manage.py run_import_worker`
+# claims queued jobs and runs them in a local process pool. A running job
+# keeps its heartbeat_at fresh; if its worker dies, the job is reclaimed once
+# the heartbeat is older than INVENTORY_IMPORT_STALE_AFTER seconds.
+#
+# A job that lost its worker is queued again from the start, up to
+# MAX_ATTEMPTS claims, and failed after that. Imports are upserts keyed on the
+# asset ID / employee email, so running a partly imported file again ends
+# with the same rows; the audit log records both runs.
+
+IMPORTERS = {
+    ImportJob.KIND_ASSETS: import_assets,
+    ImportJob.KIND_EMPLOYEES: import_employees,
+}
+
+# Only the first errors are kept on the job row; error_count always has the full total.
+MAX_STORED_ERRORS = 500
+
+MAX_ATTEMPTS = 3
+
+
+class ImportJobError(ValueError):
+    """Raised when an uploaded file cannot be queued for import."""
+
+
+def enqueue_import(kind, uploaded_file, user):
+    """Stores the uploaded CSV on a new ImportJob and returns the job."""
+    try:
+        payload = uploaded_file.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ImportJobError("The uploaded file must be UTF-8 encoded CSV.")
+
+    # Counting with the csv module keeps quoted multi-line cells from skewing the total.
+    total_rows = max(sum(1 for _ in csv.reader(io.StringIO(payload))) - 1, 0)
+
+    return ImportJob.objects.create(
+        kind=kind,
+        created_by=user,
+        file_name=getattr(uploaded_file, 'name', '') or '',
+        payload=payload,
+        total_rows=total_rows,
+    )
+
+
+def find_import_job(job_id, kind):
+    """Returns the job of the given kind, or None for a missing or malformed id."""
+    if not job_id or not (str(job_id).isascii() and str(job_id).isdigit()):
+        return None
+    return ImportJob.objects.filter(pk=job_id, kind=kind).first()
+
+
+def claim_next_jobs(limit):
+    """
+    Atomically moves up to `limit` queued jobs to Running and returns their ids.
+    The conditional UPDATE makes it safe to run several workers side by side.
+    """
+    claimed = []
+    candidate_ids = ImportJob.objects.filter(
+        status=ImportJob.STATUS_QUEUED
+    ).order_by('created_at').values_list('pk', flat=True)[:limit]
+
+    for job_id in candidate_ids:
+        now = timezone.now()
+        updated = ImportJob.objects.filter(pk=job_id, status=ImportJob.STATUS_QUEUED).update(
+            status=ImportJob.STATUS_RUNNING, started_at=now, heartbeat_at=now, attempts=F('attempts') + 1
+        )
+        if updated:
+            claimed.append(job_id)
+    return claimed
+
+
+def release_jobs(job_ids, reason):
+    """
+    Hands running jobs whose worker was lost back to the queue, or fails those
+    that have used up their MAX_ATTEMPTS. Returns (requeued, failed).
+    """
+    return _release(ImportJob.objects.filter(pk__in=job_ids), reason)
+
+
+def _release(jobs, reason):
+    jobs = jobs.filter(status=ImportJob.STATUS_RUNNING)
+    requeued = jobs.filter(attempts__lt=MAX_ATTEMPTS).update(
+        status=ImportJob.STATUS_QUEUED, started_at=None, heartbeat_at=None,
+        rows_processed=0, created_count=0, updated_count=0, error_count=0, errors=[],
+    )
+    failed = jobs.update(
+        status=ImportJob.STATUS_FAILED,
+        finished_at=timezone.now(),
+        error_count=F('error_count') + 1,
+        errors=[f"The import stopped unexpectedly: {reason}. "
+                "Rows before that point were imported; upload the file again to finish it."],
+    )
+    return requeued, failed
+
+
+def reclaim_stale_jobs(stale_after=None):
+    """
+    Releases (see release_jobs) the running jobs whose worker has stopped
+    reporting: no heartbeat for `stale_after` seconds,
+    INVENTORY_IMPORT_STALE_AFTER by default. Returns (requeued, failed).
+    """
+    if stale_after is None:
+        stale_after = getattr(settings, 'INVENTORY_IMPORT_STALE_AFTER', 600)
+    cutoff = timezone.now() - datetime.timedelta(seconds=stale_after)
+    # Jobs claimed before heartbeats were recorded only have started_at.
+    stale = ImportJob.objects.filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    return _release(stale, f"the worker stopped responding for {stale_after} seconds")
+
+
+def run_import_job(job_id):
+    """Processes a single claimed job. Runs inside a worker process."""
+    job = ImportJob.objects.select_related('created_by').get(pk=job_id)
+    importer = IMPORTERS[job.kind]
+
+    def report_progress(result):
+        ImportJob.objects.filter(pk=job_id).update(
+            rows_processed=result.rows_processed,
+            created_count=result.created_count,
+            updated_count=result.updated_count,
+            error_count=len(result.errors),
+            errors=result.errors[:MAX_STORED_ERRORS],
+            heartbeat_at=timezone.now(),
+        )
+
+    try:
+        result = importer(io.StringIO(job.payload), actor=job.created_by, on_chunk=report_progress)
+    except Exception as e:
+        logger.exception("Import job %s failed", job_id)
+        mark_job_failed(job_id, e)
+        return job_id
+
+    report_progress(result)
+    # The CSV is no longer needed once the job has finished; drop it to keep the table small.
+    # (A job reclaimed as stale in the meantime keeps the status it was given.)
+    ImportJob.objects.filter(pk=job_id, status=ImportJob.STATUS_RUNNING).update(
+        status=ImportJob.STATUS_COMPLETED, finished_at=timezone.now(), payload=''
+    )
+    return job_id
+
+
+def mark_job_failed(job_id, error):
+    ImportJob.objects.filter(pk=job_id).exclude(status=ImportJob.STATUS_COMPLETED).update(
+        status=ImportJob.STATUS_FAILED,
+        finished_at=timezone.now(),
+        error_count=F('error_count') + 1,
+        errors=[f"The import stopped unexpectedly: {error}"],
+    )
+
+
+def job_progress(job):
+    """Builds the JSON-friendly progress report used by the polling API."""
+    end = job.finished_at or timezone.now()
+    elapsed = (end - job.started_at).total_seconds() if job.started_at else 0
+    percent = round(100 * job.rows_processed / job.total_rows, 1) if job.total_rows else (100.0 if job.is_finished else 0.0)
+
+    return {
+        'id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'file_name': job.file_name,
+        'total_rows': job.total_rows,
+        'rows_processed': job.rows_processed,
+        'percent': percent,
+        'created_count': job.created_count,
+        'updated_count': job.updated_count,
+        'error_count': job.error_count,
+        'errors': job.errors[:50],
+        'elapsed_seconds': round(elapsed, 2),
+        'rows_per_second': round(job.rows_processed / elapsed, 1) if elapsed > 0 else 0,
+        'is_finished': job.is_finished,
+    }
+
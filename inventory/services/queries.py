@@ -0,0 +1,166 @@
+# inventory/services/queries.py
+
+import datetime
+
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import AuditLog, Allocation
+from ..roles import has_role
+from .search import ASSET, EMPLOYEE, matching_ids
+
+# ===================================================================
+# Shared List Filters and Visibility Rules
+# ===================================================================
+# The audit log viewer, the transaction search and the exports of the same
+# data must show exactly the same rows, so their filters live here.
+
+SEARCH_BY_EMPLOYEE = 'employee'
+SEARCH_BY_ASSET = 'asset'
+
+# What the log lists (audit log viewer, dashboard activity feed) load per
+# entry. The `details` JSON blob is deferred: its searchable keys have their
+# own columns (AuditLog.SEARCH_COLUMN_SOURCES), and the few other keys the
+# one-line summaries show are extracted by the database as
+# summary_<name> annotations. The full details of one entry are fetched
+# on demand (api_views.get_audit_log_details).
+AUDIT_LIST_FIELDS = (
+    'id', 'timestamp', 'action_type', 'asset_serial', 'employee_name',
+    'actor__username', 'actor__first_name', 'actor__last_name',
+)
+AUDIT_SUMMARY_KEYS = {
+    'summary_actor_name': ('actor_name',),
+    'summary_asset_model': ('asset_model', 'deleted_asset_model'),
+    'summary_employee_email': ('employee_email', 'deleted_employee_email'),
+}
+
+
+def visible_audit_logs(user=None):
+    """
+    The audit entries `user` may see. IT Admins (who are not Super Admins)
+    only see entries by other IT Admins, and no deletions. Without a user
+    (e.g. a management command) every entry is visible.
+    """
+    queryset = AuditLog.objects.all()
+    if user is not None and not user.is_superuser and has_role(user, 'IT_Admin'):
+        # IT Admins can only see logs from other IT Admins.
+        queryset = queryset.filter(actor__groups__name='IT_Admin')
+        # They also cannot see sensitive deletion logs.
+        queryset = queryset.exclude(action_type__icontains='DELETED')
+    # Super Admins can see everything, so no additional filtering is needed for them.
+    return queryset
+
+
+def audit_log_summaries(queryset):
+    """The entries of `queryset` projected for the log lists (see AUDIT_LIST_FIELDS), with their actors."""
+    annotations = {}
+    for name, keys in AUDIT_SUMMARY_KEYS.items():
+        values = [KT(f'details__{key}') for key in keys]
+        annotations[name] = Coalesce(*values) if len(values) > 1 else values[0]
+    return queryset.select_related('actor').only(*AUDIT_LIST_FIELDS).annotate(**annotations)
+
+
+def filter_audit_logs(queryset, params):
+    """
+    Applies the audit log viewer's filters from a dict-like `params`:
+    query, actor, action_type, start_date and end_date.
+    """
+    query = (params.get('query') or '').strip()
+    actor_id = params.get('actor')
+    action_type = params.get('action_type')
+    # Malformed dates are ignored, as the date inputs never send them.
+    start_date = parse_filter_date(params.get('start_date'))
+    end_date = parse_filter_date(params.get('end_date'))
+
+    if query:
+        # Prefix search on the indexed columns extracted from 'details'
+        # (see AuditLog.search_columns) and on the actor's names.
+        search_filter = (
+            Q(asset_id__istartswith=query) |
+            Q(asset_serial__istartswith=query) |
+            Q(employee_name__istartswith=query) |
+            Q(actor__username__istartswith=query) |
+            Q(actor__first_name__istartswith=query) |
+            Q(actor__last_name__istartswith=query)
+        )
+        # isdigit() alone also accepts characters such as '²' that int() rejects.
+        if query.isascii() and query.isdigit():
+            search_filter |= Q(employee_id=int(query))
+        queryset = queryset.filter(search_filter)
+
+    if actor_id:
+        queryset = queryset.filter(actor_id=actor_id)
+
+    if action_type:
+        queryset = queryset.filter(action_type=action_type)
+
+    if start_date:
+        queryset = queryset.filter(timestamp__date__gte=start_date)
+
+    if end_date:
+        queryset = queryset.filter(timestamp__date__lte=end_date)
+
+    return queryset
+
+
+def parse_filter_date(value):
+    """A YYYY-MM-DD filter value as a date, or None if it is empty or invalid."""
+    try:
+        return datetime.date.fromisoformat((value or '').strip())
+    except ValueError:
+        return None
+
+
+def audit_log_matcher(params, user=None):
+    """
+    visible_audit_logs(user) and filter_audit_logs(params) as a predicate on
+    archived entries (dicts, see services/audit_archive.py), which are not
+    in the database. Keep the two in step.
+    """
+    checks = []
+    if user is not None and not user.is_superuser and has_role(user, 'IT_Admin'):
+        it_admin_ids = set(User.objects.filter(groups__name='IT_Admin').values_list('id', flat=True))
+        checks.append(lambda entry: entry['actor_id'] in it_admin_ids and 'DELETED' not in entry['action_type'].upper())
+
+    query = (params.get('query') or '').strip().lower()
+    if query:
+        searched = ('asset_id', 'asset_serial', 'employee_name', 'actor_username', 'actor_first_name', 'actor_last_name')
+        employee_id = int(query) if query.isascii() and query.isdigit() else None
+        checks.append(lambda entry: (employee_id is not None and entry['employee_id'] == employee_id) or any(
+            (entry[key] or '').lower().startswith(query) for key in searched
+        ))
+
+    actor_id = params.get('actor')
+    if actor_id:
+        checks.append(lambda entry: str(entry['actor_id']) == str(actor_id))
+
+    action_type = params.get('action_type')
+    if action_type:
+        checks.append(lambda entry: entry['action_type'] == action_type)
+
+    start_date = parse_filter_date(params.get('start_date'))
+    if start_date:
+        checks.append(lambda entry: timezone.localdate(entry['timestamp']) >= start_date)
+
+    end_date = parse_filter_date(params.get('end_date'))
+    if end_date:
+        checks.append(lambda entry: timezone.localdate(entry['timestamp']) <= end_date)
+
+    return lambda entry: all(check(entry) for check in checks)
+
+
+def search_transactions(search_type, query):
+    """
+    The allocations of the employees or assets matching `query` ('Know
+    Transaction'), via the search index; None for an unknown search type.
+    """
+    if search_type == SEARCH_BY_EMPLOYEE:
+        # Search by employee name or email
+        return Allocation.objects.filter(employee_id__in=matching_ids(EMPLOYEE, query))
+    if search_type == SEARCH_BY_ASSET:
+        # Search by asset serial number or ID
+        return Allocation.objects.filter(asset_id__in=matching_ids(ASSET, query))
+    return None
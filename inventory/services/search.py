@@ -0,0 +1,195 @@
+# inventory/services/search.py
+
+import re
+from functools import reduce
+from operator import add, and_, or_
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Max, Q, Value, When
+from django.db.models.functions import Cast
+
+from ..models import Asset, Employee, SearchEntry
+
+# ===================================================================
+# Search Index
+# ===================================================================
+# `icontains` searches across several columns become LIKE '%q%' scans that
+# can never use an index. Instead, every searchable asset and employee is
+# broken into lower-cased tokens stored in SearchEntry, indexed on
+# (kind, token). A search term then becomes an index range scan
+# (token LIKE 'term%'). A result must match every term of the query, and
+# exact token matches rank above prefix matches.
+#
+# The signal handlers keep the index in sync for single saves and deletes,
+# and the bulk importers reindex their batches. `manage.py rebuild_search_index`
+# rebuilds everything, e.g. after raw SQL changes.
+
+ASSET = SearchEntry.KIND_ASSET
+EMPLOYEE = SearchEntry.KIND_EMPLOYEE
+
+# The columns that each kind of document is built from.
+SEARCH_FIELDS = {
+    ASSET: ('asset_id', 'serial_number', 'brand', 'model'),
+    EMPLOYEE: ('full_name', 'email', 'designation'),
+}
+MODELS = {ASSET: Asset, EMPLOYEE: Employee}
+
+MAX_TOKEN_LENGTH = 100
+# Longer queries are cut off; extra terms add little but cost a join condition each.
+MAX_QUERY_TERMS = 5
+BATCH_SIZE = 2000
+
+_WORD_SPLIT = re.compile(r'[\W_]+')
+
+
+def tokenize(value):
+    """
+    Returns the tokens for one column value: each word, plus the whole value
+    when it is a single "word" with punctuation in it (serial numbers, emails),
+    so that 'abc-12' or 'john.doe@' still find it by prefix.
+    """
+    if value is None:
+        return set()
+    value = str(value).strip().lower()
+    tokens = {word for word in _WORD_SPLIT.split(value) if word}
+    if value and not any(char.isspace() for char in value):
+        tokens.add(value)
+    return {token[:MAX_TOKEN_LENGTH] for token in tokens}
+
+
+def document_tokens(kind, obj):
+    """All tokens of one asset or employee. `obj` may be an instance or a values() dict."""
+    tokens = set()
+    for field in SEARCH_FIELDS[kind]:
+        tokens |= tokenize(obj[field] if isinstance(obj, dict) else getattr(obj, field))
+    return tokens
+
+
+def query_terms(query):
+    """Splits a search box value into at most MAX_QUERY_TERMS lower-cased terms."""
+    terms = []
+    for term in (query or '').lower().split():
+        term = term[:MAX_TOKEN_LENGTH]
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+# --- Keeping the index in sync ------------------------------------------
+
+def _entries_for(kind, objects):
+    return [
+        SearchEntry(kind=kind, object_id=str(obj.pk), token=token)
+        for obj in objects
+        for token in document_tokens(kind, obj)
+    ]
+
+
+def index_documents(kind, objects, replace=True):
+    """
+    (Re)indexes the given saved instances, replacing their previous tokens.
+    Pass replace=False for newly created rows, which have no tokens yet.
+    """
+    objects = list(objects)
+    if not objects:
+        return
+    if not replace:
+        SearchEntry.objects.bulk_create(_entries_for(kind, objects), batch_size=BATCH_SIZE)
+        return
+    with transaction.atomic():
+        remove_documents(kind, [obj.pk for obj in objects])
+        SearchEntry.objects.bulk_create(_entries_for(kind, objects), batch_size=BATCH_SIZE)
+
+
+def affects_index(kind, update_fields):
+    """False when a save(update_fields=...) touched none of the indexed columns."""
+    return update_fields is None or not set(update_fields).isdisjoint(SEARCH_FIELDS[kind])
+
+
+def remove_documents(kind, object_ids):
+    SearchEntry.objects.filter(kind=kind, object_id__in=[str(pk) for pk in object_ids]).delete()
+
+
+def rebuild_index(kind=None):
+    """Rebuilds the index for one or all kinds from the source tables; returns {kind: documents}."""
+    indexed = {}
+    for current_kind in ([kind] if kind else SEARCH_FIELDS):
+        model = MODELS[current_kind]
+        fields = ('pk',) + SEARCH_FIELDS[current_kind]
+        count, batch = 0, []
+        with transaction.atomic():
+            SearchEntry.objects.filter(kind=current_kind).delete()
+            for row in model.objects.order_by().values(*fields).iterator(chunk_size=BATCH_SIZE):
+                batch.extend(
+                    SearchEntry(kind=current_kind, object_id=str(row['pk']), token=token)
+                    for token in document_tokens(current_kind, row)
+                )
+                count += 1
+                if len(batch) >= BATCH_SIZE:
+                    SearchEntry.objects.bulk_create(batch)
+                    batch = []
+            SearchEntry.objects.bulk_create(batch)
+        indexed[current_kind] = count
+    return indexed
+
+
+# --- Querying ------------------------------------------------------------
+
+def _term_matches(kind, terms):
+    """
+    One row per matching document: object_id, plus a 0/1 flag per term for
+    "some token starts with it" (m0, m1, ...) and "some token equals it" (e0, e1, ...).
+    Only documents that match every term are kept.
+    """
+    flags = {}
+    for i, term in enumerate(terms):
+        flags[f'm{i}'] = Max(Case(When(token__istartswith=term, then=Value(1)), default=Value(0), output_field=IntegerField()))
+        flags[f'e{i}'] = Max(Case(When(token=term, then=Value(1)), default=Value(0), output_field=IntegerField()))
+
+    return (
+        SearchEntry.objects
+        .filter(kind=kind)
+        .filter(reduce(or_, [Q(token__istartswith=term) for term in terms]))
+        .order_by()
+        .values('object_id')
+        .annotate(**flags)
+        .filter(reduce(and_, [Q(**{f'm{i}': 1}) for i in range(len(terms))]))
+    )
+
+
+def _document_id(kind):
+    # object_id is a varchar for both kinds. Employee keys are integers, and
+    # comparing them with strings would keep MySQL from using the primary key
+    # index for the semijoin, so they are cast back.
+    return Cast('object_id', IntegerField()) if kind == EMPLOYEE else F('object_id')
+
+
+def matching_ids(kind, query):
+    """
+    A subquery of the primary keys of every document matching the query, for
+    filtering a list view (`.filter(pk__in=matching_ids(...))`) that keeps its own ordering.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return SearchEntry.objects.none().values(document_id=_document_id(kind))
+    return _term_matches(kind, terms).values(document_id=_document_id(kind))
+
+
+def search(kind, query, limit=20):
+    """
+    Returns up to `limit` matching primary keys, best match first. Documents
+    with more exact token matches rank higher; ties are ordered by id.
+    """
+    terms = query_terms(query)
+    if not terms:
+        return []
+
+    rows = (
+        _term_matches(kind, terms)
+        .annotate(score=reduce(add, [F(f'e{i}') for i in range(len(terms))]))
+        .order_by('-score', 'object_id')
+        .values_list('object_id', flat=True)[:limit]
+    )
+    if kind == EMPLOYEE:
+        return [int(object_id) for object_id in rows]
+    return list(rows)
@@ -0,0 +1,281 @@
+# inventory/services/synthetic.py
+
+import csv
+import io
+import random
+import datetime
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .. import caching
+from ..models import Employee, Asset, Allocation, AuditLog
+from . import asset_aging
+from .dashboard_stats import rebuild_counters
+from .search import rebuild_index
+
+# ===================================================================
+# Synthetic Data Generator
+# ===================================================================
+# Bulk-inserts realistic-looking inventory data for benchmarks. Every row is
+# tagged with the SYNTHETIC_PREFIX so generated data is easy to tell apart
+# from real records (and to delete again). Seeding again continues the
+# numbering, so a dataset can be grown in steps.
+#
+# Asset hardware (type, brand, model, processor, RAM, storage, warranty
+# length) is drawn from "shapes": the rows of an asset import CSV such as
+# test.csv (see load_asset_shapes), or BRAND_MODELS when none is given.
+# The same shapes produce the CSV files the benchmarks import.
+
+SYNTHETIC_PREFIX = 'BENCH'
+BATCH_SIZE = 5000
+
+BRAND_MODELS = {
+    'HP': ['ProBook 440 G8', 'EliteBook 840 G9'],
+    'Dell': ['Latitude 5420', 'XPS 13 9310'],
+    'Lenovo': ['ThinkPad T14', 'ThinkPad X1 Carbon'],
+    'Apple': ['MacBook Pro 14', 'MacBook Air M2'],
+}
+ASSET_CONDITIONS = ['No Damage'] * 8 + ['Damage', 'Flickering']
+SCREEN_STATUSES = ['No Damage'] * 8 + ['Damage', 'Flickering']
+AUDIT_ACTIONS = ['ASSET_ASSIGNED', 'ASSET_RETURNED', 'ASSET_CREATED', 'ASSET_UPDATED', 'EMPLOYEE_CREATED']
+DESIGNATIONS = ['Engineer', 'Analyst', 'Manager', 'Designer']
+
+# The columns of the asset and employee import CSVs (services/asset_import.py, employee_import.py).
+ASSET_CSV_COLUMNS = [
+    'asset_id', 'serial_number', 'asset_type', 'brand', 'model', 'processor', 'ram_gb',
+    'storage_size_gb', 'purchase_date', 'warranty_expiry', 'status', 'remarks',
+]
+EMPLOYEE_CSV_COLUMNS = ['full_name', 'email', 'designation', 'status', 'date_of_joining']
+
+DEFAULT_WARRANTY_DAYS = 3 * 365
+
+# The order to seed in; allocations need employees and assets.
+SEED_STEPS = ('employees', 'assets', 'allocations', 'logs')
+
+
+def _whole_number(value):
+    value = (value or '').strip()
+    return int(value) if value.isascii() and value.isdigit() else None
+
+
+def load_asset_shapes(lines):
+    """
+    Reads the hardware shapes from the lines of an asset import CSV: one dict
+    per row with a brand, holding its asset_type, brand, model, processor,
+    ram_gb, storage_size_gb and warranty_days (purchase to warranty expiry).
+    """
+    shapes = []
+    for row in csv.DictReader(lines):
+        brand = (row.get('brand') or '').strip()
+        if not brand:
+            continue
+        try:
+            warranty_days = (datetime.date.fromisoformat(row['warranty_expiry'])
+                             - datetime.date.fromisoformat(row['purchase_date'])).days
+        except (KeyError, TypeError, ValueError):
+            warranty_days = DEFAULT_WARRANTY_DAYS
+        shapes.append({
+            'asset_type': (row.get('asset_type') or '').strip() or 'Laptop',
+            'brand': brand,
+            'model': (row.get('model') or '').strip() or None,
+            'processor': (row.get('processor') or '').strip() or None,
+            'ram_gb': _whole_number(row.get('ram_gb')),
+            'storage_size_gb': _whole_number(row.get('storage_size_gb')),
+            'warranty_days': warranty_days,
+        })
+    return shapes
+
+
+def _default_shapes():
+    return [
+        {'asset_type': 'Laptop', 'brand': brand, 'model': model, 'processor': None,
+         'ram_gb': None, 'storage_size_gb': None, 'warranty_days': DEFAULT_WARRANTY_DAYS}
+        for brand, models in BRAND_MODELS.items() for model in models
+    ]
+
+
+def _bulk_insert(model, objects, batch_size=BATCH_SIZE):
+    """Inserts a generator of unsaved objects in fixed-size batches; returns the row count."""
+    batch, total = [], 0
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        model.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def _employee_values(n, prefix, rng):
+    return {
+        'full_name': f"{prefix} Employee {n}",
+        'email': f"{prefix.lower()}.employee{n}@example.com",
+        'status': rng.choice(['Active'] * 9 + ['Inactive']),
+        'designation': rng.choice(DESIGNATIONS),
+        'date_of_joining': datetime.date.today() - datetime.timedelta(days=rng.randint(0, 10 * 365)),
+    }
+
+
+def _asset_values(n, prefix, rng, shapes):
+    shape = rng.choice(shapes)
+    purchase_date = datetime.date.today() - datetime.timedelta(days=rng.randint(0, 5 * 365))
+    return {
+        'asset_id': f"{prefix}{n:08d}",
+        'serial_number': f"{prefix}-SN-{n:08d}",
+        'asset_type': shape['asset_type'],
+        'brand': shape['brand'],
+        'model': shape['model'],
+        'processor': shape['processor'],
+        'ram_gb': shape['ram_gb'],
+        'storage_size_gb': shape['storage_size_gb'],
+        'purchase_date': purchase_date,
+        'warranty_expiry': purchase_date + datetime.timedelta(days=shape['warranty_days']),
+        'status': 'Available',
+    }
+
+
+def seed_employees(count, rng=random):
+    first = Employee.objects.filter(email__startswith=SYNTHETIC_PREFIX.lower()).count()
+    return _bulk_insert(Employee, (Employee(**_employee_values(n, SYNTHETIC_PREFIX, rng)) for n in range(first, first + count)))
+
+
+def seed_assets(count, rng=random, shapes=None):
+    shapes = shapes or _default_shapes()
+    first = Asset.objects.filter(asset_id__startswith=SYNTHETIC_PREFIX).count()
+    return _bulk_insert(Asset, (Asset(**_asset_values(n, SYNTHETIC_PREFIX, rng, shapes)) for n in range(first, first + count)))
+
+
+def seed_allocations(count, rng=random):
+    """
+    Spreads `count` allocations over the synthetic assets that have none yet,
+    as consecutive, non-overlapping custody periods held by active synthetic
+    employees. The newest allocation of roughly a third of the assets is left
+    open, and those assets are marked Allocated. Assets seeded with a history
+    earlier are left alone, so seeding again never overlaps their periods.
+    """
+    asset_ids = list(
+        Asset.objects.filter(asset_id__startswith=SYNTHETIC_PREFIX, allocations__isnull=True)
+        .order_by('asset_id').values_list('asset_id', flat=True)
+    )
+    employee_ids = list(
+        Employee.objects.filter(email__startswith=SYNTHETIC_PREFIX.lower(), status='Active')
+        .order_by('employee_id').values_list('employee_id', flat=True)
+    )
+    if not asset_ids or not employee_ids:
+        raise ValueError("Allocations need active synthetic employees and synthetic assets without allocations; "
+                         "seed more of them first.")
+
+    per_asset, remainder = divmod(count, len(asset_ids))
+    now = timezone.now()
+    open_asset_ids = []
+
+    def generate():
+        for index, asset_id in enumerate(asset_ids):
+            history_length = per_asset + (1 if index < remainder else 0)
+            if not history_length:
+                continue
+            start = now - datetime.timedelta(days=history_length * 60 + rng.randint(0, 30))
+            is_open = rng.random() < 0.33
+            for step in range(history_length):
+                assigned = start + datetime.timedelta(days=step * 60 + rng.randint(0, 5))
+                last = step == history_length - 1
+                returned = None if (last and is_open) else assigned + datetime.timedelta(days=rng.randint(10, 50))
+                yield Allocation(
+                    asset_id=asset_id,
+                    employee_id=rng.choice(employee_ids),
+                    assigned_date=assigned,
+                    returned_date=returned,
+                    asset_condition_on_alloc=rng.choice(ASSET_CONDITIONS),
+                    asset_screen_status=None if returned is None else rng.choice(SCREEN_STATUSES),
+                    transaction_status='Allocated' if returned is None else 'Returned',
+                )
+            if is_open:
+                open_asset_ids.append(asset_id)
+
+    total = _bulk_insert(Allocation, generate())
+    for start in range(0, len(open_asset_ids), BATCH_SIZE):
+        Asset.objects.filter(asset_id__in=open_asset_ids[start:start + BATCH_SIZE]).update(status='Allocated', updated_at=timezone.now())
+    return total
+
+
+def seed_audit_logs(count, rng=random):
+    """Audit entries spread over the last year, so the date filters have something to select."""
+    now = timezone.now()
+
+    def generate():
+        for n in range(count):
+            details = {"synthetic": True, "asset_id": f"{SYNTHETIC_PREFIX}{n:08d}"}
+            yield AuditLog(
+                action_type=rng.choice(AUDIT_ACTIONS),
+                timestamp=now - datetime.timedelta(seconds=rng.randint(0, 365 * 86400)),
+                details=details,
+                **AuditLog.search_columns(details),
+            )
+    return _bulk_insert(AuditLog, generate())
+
+
+def seed(counts, rng=random, shapes=None, on_step=None):
+    """
+    Seeds {'employees': n, 'assets': n, 'allocations': n, 'logs': n} in
+    SEED_STEPS order, each step in its own transaction, then rebuilds the
+    derived data. `on_step(step, inserted, seconds)` reports progress.
+    Returns True if anything was seeded.
+    """
+    seeders = {
+        'employees': lambda count: seed_employees(count, rng),
+        'assets': lambda count: seed_assets(count, rng, shapes),
+        'allocations': lambda count: seed_allocations(count, rng),
+        'logs': lambda count: seed_audit_logs(count, rng),
+    }
+    seeded = False
+    for step in SEED_STEPS:
+        if counts.get(step, 0) > 0:
+            started = time.perf_counter()
+            with transaction.atomic():
+                inserted = seeders[step](counts[step])
+            if on_step:
+                on_step(step, inserted, time.perf_counter() - started)
+            seeded = True
+    if seeded:
+        rebuild_derived_data()
+    return seeded
+
+
+def rebuild_derived_data():
+    """
+    Seeding uses bulk inserts, which bypass the counter, search index and
+    cache signal handlers; this brings all of them up to date.
+    """
+    rebuild_counters()
+    rebuild_index()
+    asset_aging.refresh()
+    caching.invalidate(caching.AVAILABLE_ASSETS)
+    caching.invalidate(caching.ANALYTICS)
+    caching.tables_changed(('asset', 'employee', 'allocation'))
+
+
+# --- Import files ----------------------------------------------------------
+
+def _csv_lines(columns, rows):
+    """Renders rows of values as CSV text lines (header first), as csv.DictReader reads them."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().splitlines(keepends=True)
+
+
+def asset_csv_lines(count, prefix, rng=random, shapes=None):
+    """An asset import file of `count` new assets with IDs starting with `prefix`."""
+    shapes = shapes or _default_shapes()
+    return _csv_lines(ASSET_CSV_COLUMNS, (_asset_values(n, prefix, rng, shapes) for n in range(count)))
+
+
+def employee_csv_lines(count, prefix, rng=random):
+    """An employee import file of `count` new employees with emails starting with `prefix`."""
+    return _csv_lines(EMPLOYEE_CSV_COLUMNS, (_employee_values(n, prefix, rng) for n in range(count)))
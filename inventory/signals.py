@@ -1,20 +1,29 @@
 # inventory/signals.py
 
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 
 from .models import Asset, Employee, Allocation, AuditLog
 from .middleware import get_current_user
+from .roles import invalidate_user_roles
+from .services.dashboard_stats import adjust_counters, asset_status_delta, employee_status_delta
+from .services import audit_writer, search
+from . import caching
 
 # A helper function to avoid repetitive code
 def create_audit_log(actor, action_type, details):
-    """Creates an AuditLog entry."""
-    AuditLog.objects.create(
+    """
+    Records an AuditLog entry, copying the searchable keys of `details` into
+    indexed columns. The entry is written in a batch by services/audit_writer.py,
+    once the surrounding transaction commits or the request finishes.
+    """
+    audit_writer.record(AuditLog(
         actor=actor,
         action_type=action_type,
-        details=details
-    )
+        details=details,
+        **AuditLog.search_columns(details)
+    ))
 
 @receiver(post_save, sender=Allocation)
 def log_allocation_change(sender, instance, created, **kwargs):
@@ -31,12 +40,18 @@ def log_allocation_change(sender, instance, created, **kwargs):
 
     # We only care about the initial creation of the allocation record.
     if created:
+        # The allocation flow assigns the Asset and Employee it has already
+        # loaded, so reading them here costs no extra queries.
+        asset, employee = instance.asset, instance.employee
+
         # Construct a detailed description for the log.
         details = {
             "actor_name": user.get_full_name() or user.username,
-            "asset_serial": instance.asset.serial_number,
-            "asset_model": instance.asset.model,
-            "employee_name": instance.employee.full_name,
+            "asset_id": asset.asset_id,
+            "asset_serial": asset.serial_number,
+            "asset_model": asset.model,
+            "employee_id": employee.employee_id,
+            "employee_name": employee.full_name,
             "allocation_id": instance.allocation_id
         }
         
@@ -136,4 +151,128 @@ def log_employee_delete(sender, instance, **kwargs):
         "deleted_employee_email": instance.email
     }
     
-    create_audit_log(user, "EMPLOYEE_DELETED", details)
\ No newline at end of file
+    create_audit_log(user, "EMPLOYEE_DELETED", details)
+
+@receiver(m2m_changed, sender=User.groups.through)
+def invalidate_role_cache(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Drops cached role names whenever group membership changes, whether it was
+    changed from the user side (user.groups.add) or the group side (group.user_set.add).
+    """
+    if not reverse:
+        if action in ('post_add', 'post_remove', 'post_clear'):
+            invalidate_user_roles(instance.pk, user=instance)
+    elif action in ('post_add', 'post_remove'):
+        for user_id in pk_set:
+            invalidate_user_roles(user_id)
+    elif action == 'pre_clear':
+        # group.user_set.clear() does not say which users are affected,
+        # so they have to be looked up before the rows are gone.
+        for user_id in User.objects.filter(groups=instance).values_list('pk', flat=True):
+            invalidate_user_roles(user_id)
+
+
+# ===================================================================
+# Dashboard Counter Maintenance
+# ===================================================================
+# Unlike the audit handlers above, these run for every change regardless of
+# who made it, because the counters must always match the tables.
+
+@receiver(pre_save, sender=Asset)
+@receiver(pre_save, sender=Employee)
+def remember_stored_status(sender, instance, **kwargs):
+    """
+    Instances loaded from the database already know their stored status (see
+    from_db). Only an object built by hand for an existing row needs a lookup.
+    """
+    if hasattr(instance, '_loaded_status') or instance.pk is None:
+        return
+    instance._loaded_status = sender.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+
+@receiver(post_save, sender=Asset)
+def count_asset_save(sender, instance, created, **kwargs):
+    old_status = None if created else getattr(instance, '_loaded_status', None)
+    adjust_counters(asset_status_delta(old_status, instance.status))
+    instance._loaded_status = instance.status
+
+@receiver(post_delete, sender=Asset)
+def count_asset_delete(sender, instance, **kwargs):
+    adjust_counters(asset_status_delta(getattr(instance, '_loaded_status', instance.status), None))
+
+@receiver(post_save, sender=Employee)
+def count_employee_save(sender, instance, created, **kwargs):
+    old_status = None if created else getattr(instance, '_loaded_status', None)
+    adjust_counters(employee_status_delta(old_status, instance.status))
+    instance._loaded_status = instance.status
+
+@receiver(post_delete, sender=Employee)
+def count_employee_delete(sender, instance, **kwargs):
+    adjust_counters(employee_status_delta(getattr(instance, '_loaded_status', instance.status), None))
+
+
+# ===================================================================
+# Search Index Maintenance
+# ===================================================================
+# Like the counters, the search index must follow every change. Bulk writes
+# (the CSV importers) bypass these handlers and reindex their batches themselves.
+
+@receiver(post_save, sender=Asset)
+def index_asset(sender, instance, created, update_fields, **kwargs):
+    # Status-only saves (allocation and return) leave the index untouched.
+    if search.affects_index(search.ASSET, update_fields):
+        search.index_documents(search.ASSET, [instance], replace=not created)
+
+@receiver(post_delete, sender=Asset)
+def unindex_asset(sender, instance, **kwargs):
+    search.remove_documents(search.ASSET, [instance.pk])
+
+@receiver(post_save, sender=Employee)
+def index_employee(sender, instance, created, update_fields, **kwargs):
+    if search.affects_index(search.EMPLOYEE, update_fields):
+        search.index_documents(search.EMPLOYEE, [instance], replace=not created)
+
+@receiver(post_delete, sender=Employee)
+def unindex_employee(sender, instance, **kwargs):
+    search.remove_documents(search.EMPLOYEE, [instance.pk])
+
+
+# ===================================================================
+# Cache Invalidation
+# ===================================================================
+# Drops exactly the cached payloads a change affects (see caching.py). Bulk
+# writes bypass these handlers and invalidate their batches themselves.
+
+@receiver(post_save, sender=Asset)
+def uncache_asset_save(sender, instance, created, **kwargs):
+    holder_ids = ()
+    if not created and instance.status.lower() == 'allocated':
+        # The holder's asset list shows the brand, model and serial number.
+        holder_ids = list(Allocation.objects.filter(
+            asset_id=instance.pk, transaction_status='Allocated'
+        ).values_list('employee_id', flat=True))
+    caching.assets_changed([instance.pk], holder_ids)
+
+@receiver(post_delete, sender=Asset)
+def uncache_asset_delete(sender, instance, **kwargs):
+    # Its allocations are deleted first, and their handler drops the holders' lists.
+    caching.assets_changed([instance.pk])
+
+@receiver(post_save, sender=Employee)
+def uncache_employee_save(sender, instance, created, **kwargs):
+    held_asset_ids = ()
+    if not created:
+        # The asset details show the current holder's name.
+        held_asset_ids = list(Allocation.objects.filter(
+            employee_id=instance.pk, transaction_status='Allocated'
+        ).order_by().values_list('asset_id', flat=True))
+    caching.employees_changed([instance.pk], held_asset_ids)
+
+@receiver(post_delete, sender=Employee)
+def uncache_employee_delete(sender, instance, **kwargs):
+    caching.employees_changed([instance.pk])
+
+@receiver(post_save, sender=Allocation)
+@receiver(post_delete, sender=Allocation)
+def uncache_allocation(sender, instance, **kwargs):
+    caching.allocations_changed([(instance.asset_id, instance.employee_id)])
+
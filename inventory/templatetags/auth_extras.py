@@ -1,7 +1,8 @@
 # inventory/templatetags/auth_extras.py
 
 from django import template
-from django.contrib.auth.models import Group
+
+from ..roles import get_user_roles
 
 register = template.Library()
 
@@ -23,13 +24,9 @@ def has_group(user, group_name):
     # Validation: Ensure the user object is valid and authenticated
     if not hasattr(user, 'groups'):
         return False
-        
-    try:
-        # Check if a group with the given name exists in the user's groups
-        return user.groups.filter(name=group_name).exists()
-    except Group.DoesNotExist:
-        # Fails safely if the group somehow doesn't exist
-        return False
+
+    # Reads the group names cached for this request instead of querying per check.
+    return group_name in get_user_roles(user)
 
 @register.filter(name='is_in_groups')
 def is_in_groups(user, group_names):
@@ -44,4 +41,4 @@ def is_in_groups(user, group_names):
     
     # Split the string of group names into a list
     group_list = [name.strip() for name in group_names.split(',')]
-    return user.groups.filter(name__in=group_list).exists()
\ No newline at end of file
+    return not get_user_roles(user).isdisjoint(group_list)
\ No newline at end of file
@@ -0,0 +1,20 @@
+# inventory/templatetags/pagination_tags.py
+
+from django import template
+
+register = template.Library()
+
+@register.simple_tag(takes_context=True)
+def cursor_query(context, cursor):
+    """
+    Builds the query string for a pagination link, keeping the current search
+    and filter parameters and replacing only the cursor.
+
+    Usage in a template:
+    {% load pagination_tags %}
+    <a href="{% cursor_query page_obj.next_cursor %}">Next</a>
+    """
+    params = context['request'].GET.copy()
+    params.pop('page', None)
+    params['cursor'] = cursor
+    return f"?{params.urlencode()}"
@@ -1,3 +1,910 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth.models import Group, User
+from django.utils import timezone
+
+from . import caching, metrics
+from .models import Employee, Asset, Allocation, AssetAging, AuditLog, AuditLogArchive, ImportJob
+from .pagination import CursorPaginator
+from .services import allocation as allocation_service
+from .management import benchmark
+from .services import analytics, asset_aging, audit_archive, audit_writer, import_jobs, synthetic
+from .services.allocation import AllocationError
+from .services.bulk_allocation import bulk_assign, read_rows
+from .services.dashboard_stats import rebuild_counters
+from .services.asset_import import import_assets
+from .services.employee_import import import_employees
+
+
+# ===================================================================
+# Query-Count Regression Tests
+# ===================================================================
+# Pin the number of SQL statements of the main write paths, so an extra
+# query sneaking into a view, signal handler or the audit layer fails loudly.
+# Every request costs 2 statements up front: the session and the user.
+# Audit entries are written on commit, so the commit callbacks are run
+# inside assertNumQueries to include that INSERT.
+
+class WritePathQueryCountTests(TestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin)
+        self.employee = Employee.objects.create(full_name='Jane Doe', email='jane@example.com')
+        self.asset = Asset.objects.create(asset_id='LAP-001', serial_number='SN-001', brand='Dell', model='Latitude 5420')
+        # An allocated asset makes sure both status counters exist, so no test pays for creating one.
+        Asset.objects.create(asset_id='LAP-000', serial_number='SN-000', status='Allocated')
+
+    def _post(self, url_name, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse(url_name), data)
+
+    def test_assign_asset(self):
+        data = {'form_type': 'assign', 'employee_email': 'jane@example.com', 'asset': 'LAP-001'}
+        # session, user, asset choice, asset FK check, employee, savepoint,
+        # locked asset read, conditional asset UPDATE, 2 counter updates,
+        # INSERT allocation, savepoint release, audit INSERT
+        with self.assertNumQueries(13):
+            response = self._post('inventory:allocation_form', data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(AuditLog.objects.filter(action_type='ASSET_ASSIGNED', asset_id='LAP-001').count(), 1)
+
+    def test_return_asset(self):
+        self._post('inventory:allocation_form', {'form_type': 'assign', 'employee_email': 'jane@example.com', 'asset': 'LAP-001'})
+
+        data = {'form_type': 'return', 'employee_email': 'jane@example.com', 'asset': 'LAP-001'}
+        # session, user, employee, asset choice, asset FK check, savepoint,
+        # locked asset read, conditional asset UPDATE, 2 counter updates, open
+        # allocation, conditional allocation UPDATE, savepoint release, audit INSERT
+        with self.assertNumQueries(14):
+            response = self._post('inventory:allocation_form', data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Allocation.objects.get().transaction_status, 'Returned')
+
+    def test_create_asset(self):
+        data = {'add_single_asset': '1', 'asset_id': 'LAP-002', 'serial_number': 'SN-002', 'asset_type': 'Laptop', 'status': 'Available'}
+        # session, user, 2 uniqueness checks, savepoint, INSERT asset, counter
+        # update, search index INSERT, savepoint release, audit INSERT
+        with self.assertNumQueries(10):
+            response = self._post('inventory:add_asset', data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(AuditLog.objects.filter(action_type='ASSET_CREATED', asset_id='LAP-002').count(), 1)
+
+    def test_create_asset_losing_a_race(self):
+        # Another request inserts the same asset ID between the form's uniqueness check and the INSERT.
+        data = {'add_single_asset': '1', 'asset_id': 'LAP-001', 'serial_number': 'SN-002', 'asset_type': 'Laptop', 'status': 'Available'}
+        with mock.patch('inventory.forms.AssetForm.validate_unique'):
+            response = self._post('inventory:add_asset', data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('asset_id', response.context['asset_form'].errors)
+        self.assertEqual(Asset.objects.get(pk='LAP-001').serial_number, 'SN-001')
+        self.assertFalse(AuditLog.objects.filter(action_type='ASSET_CREATED').exists())
+
+    def test_create_employee(self):
+        data = {'add_single_employee': '1', 'full_name': 'John Roe', 'email': 'john@example.com', 'status': 'Active'}
+        # session, user, email uniqueness check, INSERT employee, counter update,
+        # search index INSERT, audit INSERT
+        with self.assertNumQueries(7):
+            response = self._post('inventory:add_employee', data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(AuditLog.objects.filter(action_type='EMPLOYEE_CREATED', employee_name='John Roe').count(), 1)
+
+    def test_allocation_str_uses_loaded_objects_only(self):
+        Allocation.objects.create(asset=self.asset, employee=self.employee)
+
+        allocation = Allocation.objects.get()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(allocation), f"Employee #{self.employee.pk} - Asset LAP-001")
+
+        allocation = Allocation.objects.select_related('employee', 'asset').get()
+        with self.assertNumQueries(0):
+            self.assertEqual(str(allocation), "Jane Doe - SN-001")
+
+
+# ===================================================================
+# Role Resolution Tests
+# ===================================================================
+
+@override_settings(INVENTORY_ROLE_SESSION_CACHE=True)
+class RoleSessionCacheTests(TestCase):
+
+    def setUp(self):
+        self.group = Group.objects.create(name='IT_Admin')
+        self.user = User.objects.create_user('it', 'it@example.com', 'password')
+        self.user.groups.add(self.group)
+        self.client.force_login(self.user)
+        self.url = reverse('inventory:asset_list')
+
+    def test_revoked_role_is_not_served_from_session_after_eviction(self):
+        cache.clear()  # The role version was evicted before the first request.
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+        self.user.groups.remove(self.group)
+        cache.clear()  # ...and the bumped version is evicted again.
+        self.assertRedirects(self.client.get(self.url), reverse('inventory:access_denied'), fetch_redirect_response=False)
+
+
+# ===================================================================
+# Allocation Service Tests
+# ===================================================================
+
+class AllocationServiceTests(TestCase):
+
+    def setUp(self):
+        self.employee = Employee.objects.create(full_name='Jane Doe', email='jane@example.com')
+        self.asset = Asset.objects.create(asset_id='LAP-001', serial_number='SN-001')
+
+    def test_assign_then_return(self):
+        allocation = allocation_service.assign(self.asset, self.employee, {'allocation_location': 'HQ', 'asset': 'ignored'})
+        self.assertEqual(Asset.objects.get().status, 'Allocated')
+        self.assertEqual(allocation.allocation_location, 'HQ')
+
+        allocation_service.return_asset(self.asset, self.employee, {'return_location': 'HQ'})
+        allocation.refresh_from_db()
+        self.assertEqual((allocation.transaction_status, allocation.return_location), ('Returned', 'HQ'))
+        self.assertIsNotNone(allocation.returned_date)
+        self.assertEqual(Asset.objects.get().status, 'Available')
+        self.assertEqual(rebuild_counters(), {})
+
+    def test_bulk_assign_matches_emails_in_any_case(self):
+        result = bulk_assign(read_rows('employee_email,asset_id\nJane@Example.COM,LAP-001\n'))
+        self.assertEqual(result.errors, [])
+        self.assertEqual(Allocation.objects.get().employee, self.employee)
+
+    def test_invalid_transitions_change_nothing(self):
+        with self.assertRaises(AllocationError):
+            allocation_service.return_asset(self.asset, self.employee)
+
+        allocation_service.assign(self.asset, self.employee)
+        with self.assertRaises(AllocationError):
+            allocation_service.assign(self.asset, self.employee)
+
+        other = Employee.objects.create(full_name='John Roe', email='john@example.com')
+        with self.assertRaises(AllocationError):
+            allocation_service.return_asset(self.asset, other)
+
+        self.assertEqual(Allocation.objects.count(), 1)
+        self.assertEqual(Asset.objects.get().status, 'Allocated')
+        self.assertEqual(rebuild_counters(), {})
+
+
+# ===================================================================
+# Asset Import Tests
+# ===================================================================
+
+class AssetImportTests(TestCase):
+
+    def test_row_inserted_concurrently_is_counted_as_an_update(self):
+        # Another writer inserts LAP-001 right after the chunk looked up its existing keys.
+        def concurrent_insert(execute, sql, params, many, context):
+            result = execute(sql, params, many, context)
+            if not inserted and sql.startswith('SELECT') and 'inventory_asset' in sql and 'serial_number' in sql:
+                inserted.append(Asset.objects.create(asset_id='LAP-001', serial_number='SN-OLD', status='Allocated'))
+            return result
+
+        inserted = []
+        lines = ['asset_id,serial_number\n', 'LAP-001,SN-001\n', 'LAP-002,SN-002\n']
+        with connection.execute_wrapper(concurrent_insert):
+            result = import_assets(lines)
+
+        self.assertEqual(len(inserted), 1)
+        self.assertEqual((result.created_count, result.updated_count, result.errors), (1, 1, []))
+        self.assertEqual(Asset.objects.get(pk='LAP-001').serial_number, 'SN-001')
+        self.assertEqual(rebuild_counters(), {})
+
+
+# ===================================================================
+# Import Job Tests
+# ===================================================================
+
+class _BrokenOncePool:
+    """Stands in for the worker's ProcessPoolExecutor: the first pool breaks, later ones run jobs in-process."""
+
+    instances = []
+
+    def __init__(self, **kwargs):
+        self.broken = not _BrokenOncePool.instances
+        _BrokenOncePool.instances.append(self)
+
+    def submit(self, fn, job_id):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool('A child process terminated abruptly'))
+        else:
+            future.set_result(import_jobs.run_import_job(job_id))
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class ImportJobReclaimTests(TestCase):
+
+    def _job(self, minutes_since_heartbeat, rows_processed=0, attempts=1):
+        beat = timezone.now() - datetime.timedelta(minutes=minutes_since_heartbeat)
+        return ImportJob.objects.create(
+            kind=ImportJob.KIND_ASSETS, payload='asset_id\n', status=ImportJob.STATUS_RUNNING,
+            started_at=beat, heartbeat_at=beat, rows_processed=rows_processed, attempts=attempts,
+        )
+
+    def test_stale_jobs_are_requeued_or_failed(self):
+        partial = self._job(minutes_since_heartbeat=30, rows_processed=500)
+        exhausted = self._job(minutes_since_heartbeat=30, attempts=import_jobs.MAX_ATTEMPTS)
+        alive = self._job(minutes_since_heartbeat=1, rows_processed=500)
+
+        self.assertEqual(import_jobs.reclaim_stale_jobs(stale_after=600), (1, 1))
+
+        partial.refresh_from_db()
+        exhausted.refresh_from_db()
+        alive.refresh_from_db()
+        self.assertEqual((partial.status, partial.rows_processed), (ImportJob.STATUS_QUEUED, 0))
+        self.assertEqual(import_jobs.claim_next_jobs(5), [partial.pk])
+        self.assertEqual(exhausted.status, ImportJob.STATUS_FAILED)
+        self.assertEqual(exhausted.error_count, 1)
+        self.assertEqual(alive.status, ImportJob.STATUS_RUNNING)
+
+    def test_worker_survives_a_broken_pool(self):
+        payload = 'asset_id,serial_number\n{0},SN-{0}\n'
+        jobs = [ImportJob.objects.create(kind=ImportJob.KIND_ASSETS, payload=payload.format(asset_id))
+                for asset_id in ('LAP-001', 'LAP-002')]
+        _BrokenOncePool.instances = []
+        with mock.patch('inventory.management.commands.run_import_worker.ProcessPoolExecutor', _BrokenOncePool):
+            call_command('run_import_worker', '--once', '--poll-interval', '0', stdout=io.StringIO())
+
+        self.assertEqual(len(_BrokenOncePool.instances), 2)
+        for job in jobs:
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (ImportJob.STATUS_COMPLETED, 2))
+        self.assertEqual(Asset.objects.count(), 2)
+
+    def test_malformed_job_ids_are_ignored(self):
+        self.assertIsNone(import_jobs.find_import_job('²', ImportJob.KIND_ASSETS))
+
+
+@skipUnless(connection.features.has_select_for_update, "Needs a database with row locks (e.g. MySQL).")
+class AllocationConcurrencyTests(TransactionTestCase):
+    """
+    Many threads, each with its own database connection, race to assign and
+    return the same few assets. Afterwards every asset must have at most one
+    open allocation, its status must match, and the counters must be exact.
+    """
+
+    THREADS = 16
+    ROUNDS = 25
+
+    def setUp(self):
+        self.employees = [Employee.objects.create(full_name=f'Employee {n}', email=f'e{n}@example.com') for n in range(self.THREADS)]
+        self.assets = [Asset.objects.create(asset_id=f'LAP-{n:03d}', serial_number=f'SN-{n:03d}') for n in range(3)]
+
+    def _worker(self, employee, barrier, errors):
+        try:
+            barrier.wait()
+            for round_number in range(self.ROUNDS):
+                asset = Asset.objects.get(pk=self.assets[round_number % len(self.assets)].pk)
+                try:
+                    if asset.status == 'Available':
+                        allocation_service.assign(asset, employee)
+                    else:
+                        allocation_service.return_asset(asset)
+                except AllocationError:
+                    pass  # Lost the race; the state machine refused a stale transition.
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def test_concurrent_assign_and_return(self):
+        barrier = threading.Barrier(self.THREADS)
+        errors = []
+        threads = [threading.Thread(target=self._worker, args=(employee, barrier, errors)) for employee in self.employees]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for asset in Asset.objects.all():
+            open_count = Allocation.objects.filter(asset=asset, transaction_status='Allocated').count()
+            self.assertLessEqual(open_count, 1)
+            self.assertEqual(asset.status, 'Allocated' if open_count else 'Available')
+        self.assertEqual(rebuild_counters(), {})
+
+
+class AuditWriterTests(TransactionTestCase):
+    """Buffered audit entries are written when, and only when, their transaction commits."""
+
+    def _record(self, action_type):
+        audit_writer.record(AuditLog(action_type=action_type, details={}))
+
+    def _rolled_back(self, action_type):
+        try:
+            with transaction.atomic():
+                self._record(action_type)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+    def test_rolled_back_entries_are_dropped_and_later_ones_written(self):
+        self._rolled_back('ROLLED_BACK')
+        # A new transaction at the same depth must not reuse the discarded buffer.
+        with transaction.atomic():
+            self._record('OUTER')
+            self._rolled_back('INNER_ROLLED_BACK')
+            self._record('AFTER_INNER')
+        self.assertEqual(sorted(AuditLog.objects.values_list('action_type', flat=True)), ['AFTER_INNER', 'OUTER'])
+
+
+# ===================================================================
+# Cache Invalidation Tests
+# ===================================================================
+# Each write path must drop exactly the cached payloads that show what it
+# changed; the entries are primed with a stale value and must be recomputed.
+
+class CacheInvalidationTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.employee = Employee.objects.create(full_name='Jane Doe', email='jane@example.com')
+        self.asset = Asset.objects.create(asset_id='LAP-001', serial_number='SN-001')
+
+    def _prime(self):
+        self.entries = [
+            (caching.ASSET_DETAIL, self.asset.pk),
+            (caching.EMPLOYEE_ASSETS, self.employee.pk),
+            (caching.AVAILABLE_ASSETS, None),
+        ]
+        for region, key in self.entries:
+            caching.get_or_set(region, key, lambda: 'stale')
+
+    def assertDropped(self):
+        for region, key in self.entries:
+            self.assertEqual(caching.get_or_set(region, key, lambda: 'fresh'), 'fresh', region)
+
+    def test_asset_save(self):
+        allocation_service.assign(self.asset, self.employee)
+        self._prime()
+        asset = Asset.objects.get(pk=self.asset.pk)
+        asset.model = 'Latitude 7440'
+        asset.save()
+        self.assertDropped()
+
+    def test_return_asset(self):
+        allocation_service.assign(self.asset, self.employee)
+        self._prime()
+        allocation_service.return_asset(Asset.objects.get(pk=self.asset.pk), self.employee)
+        self.assertDropped()
+
+    def test_bulk_assign(self):
+        self._prime()
+        result = bulk_assign(read_rows('employee_email,asset_id\njane@example.com,LAP-001\n'))
+        self.assertEqual(Allocation.objects.count(), 1, result)
+        self.assertDropped()
+
+
+# ===================================================================
+# Cursor Pagination Tests
+# ===================================================================
+
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        day = datetime.date(2025, 1, 1)
+        # Ties and NULLs in the leading sort key; asset_id breaks the ties.
+        for n, purchase_date in enumerate([None, day, day, None, day, day + datetime.timedelta(days=1), day]):
+            Asset.objects.create(asset_id=f'LAP-{n:03d}', serial_number=f'SN-{n:03d}', purchase_date=purchase_date)
+
+    def test_walks_forward_and_back_over_tied_keys(self):
+        # NULLs sort first ascending, so last in this descending order.
+        expected = list(Asset.objects.order_by(F('purchase_date').desc(nulls_last=True), 'asset_id'))
+        paginator = CursorPaginator(Asset.objects.all(), ('-purchase_date', 'asset_id'), 2)
+
+        pages = [paginator.page()]
+        while pages[-1].has_next:
+            pages.append(paginator.page(pages[-1].next_cursor))
+        self.assertEqual([asset for page in pages for asset in page], expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+        self.assertFalse(pages[0].has_previous)
+
+        page = pages[-1]
+        for earlier in reversed(pages[:-1]):
+            page = paginator.page(page.previous_cursor)
+            self.assertEqual(list(page), list(earlier))
+        self.assertFalse(page.has_previous)
+
+    def test_page_links_keep_the_search(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        for n in range(12):
+            Employee.objects.create(full_name=f'Bench Employee {n:02d}', email=f'bench{n}@example.com')
+        url = reverse('inventory:employee_list')
+
+        first = self.client.get(url, {'q': 'bench'})
+        cursor = first.context['page_obj'].next_cursor
+        self.assertContains(first, f'href="?q=bench&amp;cursor={cursor}"')
+
+        second = self.client.get(url, {'q': 'bench', 'cursor': cursor})
+        self.assertEqual([employee.full_name for employee in second.context['page_obj']],
+                         ['Bench Employee 10', 'Bench Employee 11'])
+        self.assertTrue(second.context['page_obj'].has_previous)
+
+        # A malformed cursor falls back to the first page.
+        fallback = self.client.get(url, {'q': 'bench', 'cursor': 'not-a-cursor'})
+        self.assertEqual(list(fallback.context['page_obj']), list(first.context['page_obj']))
+
+
+# ===================================================================
+# Search Tests
+# ===================================================================
+
+class SearchTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.jane = Employee.objects.create(full_name='Jane Doe', email='jane@example.com')
+        Employee.objects.create(full_name='John Roe', email='john@example.com')
+        self.dell = Asset.objects.create(asset_id='LAP-001', serial_number='SN-001', brand='Dell', model='Latitude 5420')
+        Asset.objects.create(asset_id='LAP-002', serial_number='SN-002', brand='HP', model='ProBook 440')
+        allocation_service.assign(self.dell, self.jane)
+
+    def _results(self, url_name, **params):
+        return list(self.client.get(reverse(url_name), params).context['page_obj'])
+
+    def test_asset_and_employee_lists(self):
+        self.assertEqual(self._results('inventory:asset_list', q='dell lat'), [Asset.objects.get(pk='LAP-001')])
+        self.assertEqual(self._results('inventory:asset_list', q='sn-00'), list(Asset.objects.order_by('asset_id')))
+        self.assertEqual(self._results('inventory:employee_list', q='JANE'), [self.jane])
+        self.assertEqual(self._results('inventory:employee_list', q='jane roe'), [])
+
+    def test_transaction_search(self):
+        url = reverse('inventory:transaction_search')
+        by_employee = self.client.get(url, {'search_type': 'employee', 'query': 'jane@'}).context['results']
+        self.assertEqual([allocation.asset_id for allocation in by_employee], ['LAP-001'])
+        by_asset = self.client.get(url, {'search_type': 'asset', 'query': 'SN-002'}).context['results']
+        self.assertEqual(list(by_asset), [])
+
+
+# ===================================================================
+# Conditional GET Tests
+# ===================================================================
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.employee = Employee.objects.create(full_name='Jane Doe', email='jane@example.com')
+        self.asset = Asset.objects.create(asset_id='LAP-001', serial_number='SN-001')
+
+    def test_unchanged_list_answers_not_modified_without_scanning_tables(self):
+        url = reverse('inventory:asset_list')
+        etag = self.client.get(url)['ETag']
+        # Only the session and the user are loaded: the version comes from the cache.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_writes_change_the_etag(self):
+        url = reverse('inventory:allocation_list')
+        etag = self.client.get(url)['ETag']
+
+        allocation_service.assign(self.asset, self.employee, {})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+        etag = response['ETag']
+        Employee.objects.filter(pk=self.employee.pk).get().save()
+        self.assertNotEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag)['ETag'], etag)
+
+    def test_create_only_import_changes_the_etag(self):
+        url = reverse('inventory:employee_list')
+        etag = self.client.get(url)['ETag']
+
+        import_employees(['full_name,email\n', 'John Roe,john@example.com\n'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'John Roe')
+
+    def test_revisions_expire(self):
+        caching.table_revision('asset')
+        with mock.patch.object(cache, 'add') as add:
+            cache.delete(caching._revision_key('asset'))
+            caching.table_revision('asset')
+        self.assertEqual(add.call_args.args[2], settings.INVENTORY_REVISION_TIMEOUT)
+
+
+# ===================================================================
+# API v1 Tests
+# ===================================================================
+
+class AuditLogApiVisibilityTests(TestCase):
+
+    def setUp(self):
+        self.it_admin = User.objects.create_user('it', password='pw')
+        self.it_admin.groups.add(Group.objects.get_or_create(name='IT_Admin')[0])
+        self.super_admin = User.objects.create_user('super', password='pw')
+        self.super_admin.groups.add(Group.objects.get_or_create(name='Super_Admin')[0])
+        self.visible = AuditLog.objects.create(actor=self.it_admin, action_type='ASSET_CREATED', details={})
+        self.other_role = AuditLog.objects.create(actor=self.super_admin, action_type='ASSET_CREATED', details={})
+        self.deleted = AuditLog.objects.create(actor=self.it_admin, action_type='ASSET_DELETED', details={'asset_model': 'X'})
+        self.client.force_login(self.it_admin)
+
+    def _ids(self, **params):
+        response = self.client.get(reverse('inventory:api_v1_audit_logs'), {'fields': 'id,details', **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.json()['results']]
+
+    def test_it_admin_sees_only_what_the_viewer_shows(self):
+        self.assertEqual(self._ids(), [self.visible.id])
+        self.assertEqual(self._ids(ids=f'{self.deleted.id},{self.other_role.id},{self.visible.id}'), [self.visible.id])
+
+        self.client.force_login(self.super_admin)
+        self.assertEqual(len(self._ids()), 3)
+
+    def test_details_follow_the_same_visibility(self):
+        def details(log):
+            return self.client.get(reverse('inventory:get_audit_log_details', args=[log.id]))
+
+        response = details(self.visible)
+        self.assertEqual(response.json(), {'id': self.visible.id, 'details': {}})
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(details(self.deleted).status_code, 404)
+        self.assertEqual(details(self.other_role).status_code, 404)
+
+        self.client.force_login(self.super_admin)
+        self.assertEqual(details(self.deleted).json()['details'], {'asset_model': 'X'})
+
+        self.client.force_login(User.objects.create_user('plain', password='pw'))
+        self.assertRedirects(details(self.visible), reverse('inventory:access_denied'), fetch_redirect_response=False)
+
+
+# ===================================================================
+# Export Tests
+# ===================================================================
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.it_admin = User.objects.create_user('it', password='pw')
+        self.it_admin.groups.add(Group.objects.get_or_create(name='IT_Admin')[0])
+        self.created = AuditLog.objects.create(actor=self.it_admin, action_type='ASSET_CREATED', details={})
+        self.assigned = AuditLog.objects.create(actor=self.it_admin, action_type='ASSET_ASSIGNED', details={})
+        AuditLog.objects.create(actor=self.it_admin, action_type='ASSET_DELETED', details={})
+        AuditLog.objects.create(actor=None, action_type='ASSET_CREATED', details={})
+        Asset.objects.create(asset_id='LAP-001', serial_number='SN-001', brand='Dell', model='Latitude 5420')
+        Asset.objects.create(asset_id='LAP-002', serial_number='SN-002', brand='HP', model='ProBook 440')
+
+    def _download(self, url_name, **params):
+        response = self.client.get(reverse(url_name), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def _csv_ids(self, data):
+        return sorted(int(row['id']) for row in csv.DictReader(io.StringIO(data.decode('utf-8'))))
+
+    def test_audit_log_export_matches_the_viewer(self):
+        self.client.force_login(self.it_admin)
+        # IT Admins get neither deletions nor entries by other roles.
+        self.assertEqual(self._csv_ids(self._download('inventory:export_audit_logs')), [self.created.id, self.assigned.id])
+        self.assertEqual(self._csv_ids(self._download('inventory:export_audit_logs', action_type='ASSET_ASSIGNED')),
+                         [self.assigned.id])
+        # The viewer ignores a malformed date; so does the export.
+        self.assertEqual(self._csv_ids(self._download('inventory:export_audit_logs', start_date='2026-13-01')),
+                         [self.created.id, self.assigned.id])
+
+        compressed = self._download('inventory:export_audit_logs', gzip='1', format='jsonl')
+        self.assertEqual(sorted(json.loads(line)['id'] for line in gzip.decompress(compressed).splitlines()),
+                         [self.created.id, self.assigned.id])
+        self.assertEqual(self.client.get(reverse('inventory:export_assets'), {'format': 'xml'}).status_code, 400)
+
+    def test_export_inventory_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'assets.jsonl.gz')
+            call_command('export_inventory', 'assets', '--query', 'dell', '--format', 'jsonl', '--gzip', '-o', path,
+                         stdout=io.StringIO())
+            with open(path, 'rb') as f:
+                rows = [json.loads(line) for line in gzip.decompress(f.read()).splitlines()]
+        self.assertEqual([row['asset_id'] for row in rows], ['LAP-001'])
+
+        output = io.StringIO()
+        with mock.patch('sys.stdout', mock.Mock(buffer=io.BytesIO())) as stdout:
+            call_command('export_inventory', 'audit-logs', '--as-user', 'it', stdout=output, stderr=io.StringIO())
+        self.assertEqual(self._csv_ids(stdout.buffer.getvalue()), [self.created.id, self.assigned.id])
+
+        with self.assertRaises(CommandError):
+            call_command('export_inventory', 'audit-logs', '--start-date', '2026-02-30', stdout=io.StringIO())
+
+
+# ===================================================================
+# Query Metrics Tests
+# ===================================================================
+
+class QueryMetricsTests(TestCase):
+
+    def setUp(self):
+        metrics.reset()
+
+    def test_server_timing_is_only_sent_to_staff(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('inventory:login')))
+
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        self.assertIn('db;dur=', self.client.get(reverse('inventory:asset_list'))['Server-Timing'])
+
+        exposition = metrics.render_prometheus()
+        self.assertIn('# TYPE inventory_recent_request_seconds summary', exposition)
+        self.assertIn('inventory_recent_db_queries_count{view="inventory:asset_list"} 1', exposition)
+
+    def test_large_counters_are_exported_exactly(self):
+        recorder = mock.Mock(duration=0.25, count=1234567, duplicates=0)
+        metrics.record('inventory:asset_list', 200, 1234567.125, recorder)
+
+        exposition = metrics.render_prometheus()
+        self.assertIn('inventory_db_queries_total{view="inventory:asset_list"} 1234567\n', exposition)
+        self.assertIn('inventory_request_seconds_total{view="inventory:asset_list"} 1234567.125\n', exposition)
+
+
+# ===================================================================
+# Asset Aging Tests
+# ===================================================================
+
+class AssetAgingTests(TestCase):
+
+    def test_buckets_at_the_boundaries(self):
+        today = datetime.date(2026, 6, 1)
+        days = datetime.timedelta(days=1)
+        expected = {
+            # warranty days left -> bucket
+            -1: 'expired', 0: '0-30', 30: '0-30', 31: '31-60', 60: '31-60', 61: '61-90', 90: '61-90', 91: '90+',
+            None: 'unknown',
+        }
+        for n, days_left in enumerate(expected):
+            Asset.objects.create(
+                asset_id=f'LAP-{n:03d}', serial_number=f'SN-{n:03d}',
+                warranty_expiry=None if days_left is None else today + days_left * days,
+            )
+        # Days since purchase -> age bucket; a future purchase date counts as new.
+        ages = {-10: '<1y', 364: '<1y', 365: '1-2y', 4 * 365 - 1: '3-4y', 4 * 365: '4y+', None: 'unknown'}
+        for n, age in enumerate(ages, start=100):
+            Asset.objects.create(asset_id=f'LAP-{n:03d}', serial_number=f'SN-{n:03d}',
+                                 purchase_date=None if age is None else today - age * days)
+
+        call_command('refresh_asset_aging', '--date', today.isoformat(), stdout=io.StringIO())
+
+        buckets = dict(AssetAging.objects.values_list('asset_id', 'warranty_bucket'))
+        for n, bucket in enumerate(expected.values()):
+            self.assertEqual(buckets[f'LAP-{n:03d}'], bucket, f'LAP-{n:03d}')
+        age_buckets = dict(AssetAging.objects.values_list('asset_id', 'age_bucket'))
+        for n, bucket in enumerate(ages.values(), start=100):
+            self.assertEqual(age_buckets[f'LAP-{n:03d}'], bucket, f'LAP-{n:03d}')
+
+        summary = asset_aging.aging_summary()
+        self.assertEqual(summary['computed_on'], today)
+        self.assertEqual({row['bucket']: row['count'] for row in summary['warranty']},
+                         {'expired': 1, '0-30': 2, '31-60': 2, '61-90': 2, '90+': 1, 'unknown': 7})
+
+
+# ===================================================================
+# Lifecycle Analytics Tests
+# ===================================================================
+
+class LifecycleAnalyticsTests(TestCase):
+
+    def test_metrics_of_a_fixed_history(self):
+        def day(n):
+            return datetime.datetime(2026, 1, n, tzinfo=datetime.timezone.utc)
+
+        employee = Employee.objects.create(full_name='Jane Doe', email='jane@example.com')
+        probook = Asset.objects.create(asset_id='LAP-001', serial_number='SN-001', brand='HP', model='ProBook')
+        latitude = Asset.objects.create(asset_id='LAP-002', serial_number='SN-002', brand='Dell', model='Latitude')
+        for asset, assigned, returned, condition, screen in [
+            (probook, day(1), day(11), 'No Damage', 'Damage'),
+            (probook, day(21), None, 'No Damage', None),
+            (latitude, day(1), day(31), 'Damage', 'No Damage'),
+        ]:
+            Allocation.objects.create(asset=asset, employee=employee, assigned_date=assigned, returned_date=returned,
+                                      asset_condition_on_alloc=condition, asset_screen_status=screen)
+
+        # Batches of two rows split the first asset's history across batches.
+        with mock.patch.object(analytics, 'ANALYTICS_BATCH_SIZE', 2):
+            metrics = analytics.compute_metrics(now=day(31))
+
+        self.assertEqual(metrics['summary'], {
+            'allocations': 3,
+            'assets': 2,
+            'open_allocations': 1,
+            'avg_days_per_allocation': 16.7,
+            'avg_days_allocated_per_asset': 25.0,
+            'avg_allocations_per_asset': 1.5,
+            'avg_idle_days': 10.0,
+            'median_idle_days': 10.0,
+            'damaged_on_allocation_pct': 33.3,
+            'screen_damaged_on_return_pct': 50.0,
+        })
+        self.assertEqual(metrics['by_model'], [
+            {'model': 'HP ProBook', 'assets': 1, 'allocations': 2, 'churn': 2.0, 'avg_days_per_allocation': 10.0,
+             'avg_idle_days': 10.0, 'damaged_on_allocation_pct': 0.0, 'screen_damaged_on_return_pct': 100.0},
+            {'model': 'Dell Latitude', 'assets': 1, 'allocations': 1, 'churn': 1.0, 'avg_days_per_allocation': 30.0,
+             'avg_idle_days': None, 'damaged_on_allocation_pct': 100.0, 'screen_damaged_on_return_pct': 0.0},
+        ])
+
+
+# ===================================================================
+# Synthetic Data and Benchmark Harness Tests
+# ===================================================================
+
+class SyntheticDataTests(TestCase):
+
+    def test_seeded_dataset_is_consistent(self):
+        shapes = synthetic.load_asset_shapes([
+            'asset_id,serial_number,asset_type,brand,model,purchase_date,warranty_expiry\n',
+            'A1,S1,Laptop,HP,ProBook 440 G8,2025-10-01,2028-09-30\n',
+            'A2,S2,Laptop,,,,\n',
+        ])
+        self.assertEqual([(shape['brand'], shape['warranty_days']) for shape in shapes], [('HP', 1095)])
+
+        rng = random.Random(7)
+        synthetic.seed({'employees': 5, 'assets': 10, 'allocations': 25}, rng=rng, shapes=shapes)
+        # Seeding again continues the numbering instead of colliding, and new
+        # allocations only go to the assets without a history.
+        synthetic.seed({'assets': 2}, rng=rng, shapes=shapes)
+        histories = set(Allocation.objects.values_list('asset_id', flat=True))
+        synthetic.seed({'allocations': 4}, rng=rng, shapes=shapes)
+
+        self.assertEqual(Asset.objects.filter(brand='HP').count(), 12)
+        self.assertEqual(Allocation.objects.count(), 29)
+        self.assertEqual(Allocation.objects.filter(asset_id__in=histories).count(), 25)
+        self.assertFalse(Allocation.objects.exclude(employee__status='Active').exists())
+        for asset in Asset.objects.all():
+            open_count = Allocation.objects.filter(asset=asset, transaction_status='Allocated').count()
+            self.assertLessEqual(open_count, 1)
+            self.assertEqual(asset.status, 'Allocated' if open_count else 'Available')
+        self.assertEqual(rebuild_counters(), {})
+        with self.assertRaises(ValueError):
+            synthetic.seed_allocations(1, rng=rng)
+
+
+class BenchmarkHarnessTests(TestCase):
+
+    def test_run_measures_and_rolls_back(self):
+        synthetic.seed({'employees': 3, 'assets': 5, 'allocations': 5}, rng=random.Random(1))
+        before = benchmark.dataset_size()
+
+        report = benchmark.run(repeat=2, import_rows=3, import_repeat=1, only='asset')
+
+        self.assertEqual(report['results']['inventory:asset_list']['runs'], 2)
+        self.assertIn('import:assets-update', report['results'])
+        self.assertEqual(report['skipped']['inventory:delete_asset'], 'POST only')
+        self.assertEqual(benchmark.dataset_size(), before)
+        self.assertFalse(User.objects.exists())
+
+    def test_compare_flags_regressions_past_the_tolerance(self):
+        def report(p95_ms, queries):
+            return {'results': {'inventory:asset_list': {'p95_ms': p95_ms, 'queries': queries}}}
+
+        baseline = report(100.0, 6)
+        self.assertEqual(benchmark.compare(report(120.0, 6), baseline), [])
+        self.assertEqual(len(benchmark.compare(report(140.0, 7), baseline)), 2)
+        self.assertEqual(benchmark.compare(report(140.0, 7), baseline, latency_tolerance=0.5, query_tolerance=1), [])
+
+
+# ===================================================================
+# Audit Log Archive Tests
+# ===================================================================
+
+class AuditLogArchiveTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        archive_settings = override_settings(INVENTORY_AUDIT_ARCHIVE_DIR=directory.name)
+        archive_settings.enable()
+        self.addCleanup(archive_settings.disable)
+
+        self.admin = User.objects.create_superuser('root', password='pw')
+        now = timezone.now()
+        AuditLog.objects.bulk_create([
+            AuditLog(actor=self.admin, action_type='ASSET_CREATED', timestamp=now - datetime.timedelta(days=days),
+                     details={'asset_model': f'Model {days}'}, asset_id=f'A{days:03d}', asset_serial=f'S{days:03d}')
+            for days in (1, 2, 100, 101, 400)
+        ])
+        self.client.force_login(self.admin)
+
+    def _viewer(self, **params):
+        response = self.client.get(reverse('inventory:audit_log_viewer'), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_archive_moves_old_entries_and_viewer_merges_them(self):
+        segments = audit_archive.archive(timezone.now() - datetime.timedelta(days=30))
+
+        self.assertEqual(sum(segment.entry_count for segment in segments), 3)
+        self.assertEqual(AuditLog.objects.count(), 2)
+        self.assertEqual(AuditLogArchive.objects.count(), len(segments))
+        for segment in segments:
+            audit_archive.verify(segment)
+
+        # Without a start date the viewer stays on the table.
+        self.assertEqual([log.asset_id for log in self._viewer().context['page_obj']], ['A001', 'A002'])
+        start = (timezone.localdate() - datetime.timedelta(days=500)).isoformat()
+        page = list(self._viewer(start_date=start).context['page_obj'])
+        self.assertEqual([log.asset_id for log in page], ['A001', 'A002', 'A100', 'A101', 'A400'])
+        self.assertEqual([getattr(log, 'archived', False) for log in page], [False, False, True, True, True])
+        self.assertEqual(page[2].summary_asset_model, 'Model 100')
+        # Archived entries go through the same filters.
+        page = self._viewer(start_date=start, query='a10').context['page_obj']
+        self.assertEqual([log.asset_id for log in page], ['A100', 'A101'])
+        # Digits int() cannot parse are searched as text, in the table and in the archive.
+        self.assertFalse(list(self._viewer(start_date=start, query='²').context['page_obj']))
+
+    def test_paging_through_live_and_archived_entries(self):
+        audit_archive.archive(timezone.now() - datetime.timedelta(days=30))
+        segments = list(AuditLogArchive.objects.all())
+        paginator = audit_archive.ArchivedAuditLogPaginator(AuditLog.objects.all(), segments, lambda entry: True, 2)
+
+        pages, page = [], paginator.page(with_count=True)
+        self.assertEqual(page.total_count, 5)
+        while True:
+            pages.append([log.asset_id for log in page])
+            if not page.has_next:
+                break
+            page = paginator.page(page.next_cursor)
+        self.assertEqual(pages, [['A001', 'A002'], ['A100', 'A101'], ['A400']])
+        self.assertEqual([log.asset_id for log in paginator.page(page.previous_cursor)], ['A100', 'A101'])
+
+    def test_tampered_segment_is_not_shown(self):
+        segment = audit_archive.archive(timezone.now() - datetime.timedelta(days=300))[0]
+        path = audit_archive.segment_path(segment.file_name)
+        os.chmod(path, 0o644)
+        with open(path, 'ab') as f:
+            f.write(b'x')
+
+        with self.assertRaises(audit_archive.ArchiveIntegrityError):
+            audit_archive.verify(segment)
+        start = (timezone.localdate() - datetime.timedelta(days=500)).isoformat()
+        page = list(self._viewer(start_date=start).context['page_obj'])
+        self.assertEqual(len(page), 4)
+        self.assertFalse(any(getattr(log, 'archived', False) for log in page))
+
+        # An export cannot leave the entry out silently.
+        response = self.client.get(reverse('inventory:export_audit_logs'), {'start_date': start})
+        self.assertEqual(response.status_code, 500)
+        with self.assertRaises(CommandError):
+            call_command('export_inventory', 'audit-logs', '--start-date', start, stdout=io.StringIO())
+
+    def _exported_asset_ids(self, **params):
+        response = self.client.get(reverse('inventory:export_audit_logs'), {'format': 'jsonl', **params})
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        return [row['asset_id'] for row in rows]
+
+    def test_exports_merge_archived_entries(self):
+        audit_archive.archive(timezone.now() - datetime.timedelta(days=30))
+
+        self.assertEqual(self._exported_asset_ids(), ['A001', 'A002'])
+        start = (timezone.localdate() - datetime.timedelta(days=500)).isoformat()
+        self.assertEqual(self._exported_asset_ids(start_date=start), ['A001', 'A002', 'A100', 'A101', 'A400'])
+        self.assertEqual(self._exported_asset_ids(start_date=start, query='a10'), ['A100', 'A101'])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'audit.jsonl')
+            call_command('export_inventory', 'audit-logs', '--start-date', start, '--format', 'jsonl',
+                         '--batch-size', '2', '-o', path, stdout=io.StringIO())
+            with open(path, 'rb') as f:
+                rows = [json.loads(line) for line in f.read().splitlines()]
+        self.assertEqual([row['asset_id'] for row in rows], ['A001', 'A002', 'A100', 'A101', 'A400'])
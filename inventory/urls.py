@@ -8,7 +8,9 @@ from .views import (
     employee_views, 
     allocation_views, 
     log_views,
-    api_views
+    export_views,
+    api_views,
+    api_v1_views
 )
 
 app_name = 'inventory'
@@ -22,6 +24,7 @@ urlpatterns = [
 
     # --- Dashboard Views ---
     path('', dashboard_views.dashboard_redirect_view, name='dashboard'),
+    path('analytics/', dashboard_views.analytics_dashboard, name='analytics_dashboard'),
 
     # --- Asset Management Views ---
     path('assets/', asset_views.asset_list, name='asset_list'),
@@ -40,18 +43,40 @@ urlpatterns = [
     # --- Allocation & Transaction Views ---
     path('allocations/', allocation_views.allocation_list, name='allocation_list'),
     path('allocate/', allocation_views.allocation_form, name='allocation_form'),
+    path('allocations/bulk/', allocation_views.bulk_allocation, name='bulk_allocation'),
     path('transactions/search/', allocation_views.transaction_search, name='transaction_search'),
 
     # --- Audit Log Viewer ---
     path('logs/', log_views.audit_log_viewer, name='audit_log_viewer'),
 
+    # --- Streaming Exports (see views/export_views.py) ---
+    path('exports/assets/', export_views.export_data, {'kind': 'assets'}, name='export_assets'),
+    path('exports/employees/', export_views.export_data, {'kind': 'employees'}, name='export_employees'),
+    path('exports/allocations/', export_views.export_data, {'kind': 'allocations'}, name='export_allocations'),
+    path('exports/audit-logs/', export_views.export_data, {'kind': 'audit-logs'}, name='export_audit_logs'),
+
     # ===================================================================
     # API VIEWS
     # ===================================================================
     path('api/asset-details/<str:asset_id>/', api_views.get_asset_details, name='ajax_get_asset_details'),
+    path('api/available-assets/', api_views.search_available_assets, name='search_available_assets'),
     path('api/employee-assets/', api_views.get_employee_assets, name='ajax_get_employee_assets'),
     path('api/asset-history/<str:asset_id>/', api_views.get_asset_history, name='get_asset_history'),
     # NEW: API URLs for the confirmation modals
     path('api/detailed-asset/<str:asset_id>/', api_views.get_detailed_asset_info, name='get_detailed_asset_info'),
     path('api/detailed-employee/<int:employee_id>/', api_views.get_detailed_employee_info, name='get_detailed_employee_info'),
+    path('api/import-jobs/<int:job_id>/', api_views.get_import_job_status, name='get_import_job_status'),
+    path('api/search/', api_views.search_inventory, name='search_inventory'),
+    path('api/analytics/', api_views.get_analytics, name='get_analytics'),
+    path('api/asset-aging/', api_views.get_asset_aging_summary, name='get_asset_aging_summary'),
+    path('api/asset-aging/<str:kind>/<str:bucket>/', api_views.get_asset_aging_bucket, name='get_asset_aging_bucket'),
+    path('api/audit-logs/<int:log_id>/details/', api_views.get_audit_log_details, name='get_audit_log_details'),
+    path('api/cache-stats/', api_views.get_cache_stats, name='get_cache_stats'),
+    path('metrics', api_views.get_metrics, name='metrics'),
+
+    # --- Versioned JSON API (see views/api_v1_views.py) ---
+    path('api/v1/assets/', api_v1_views.resource_list, {'resource_name': 'assets'}, name='api_v1_assets'),
+    path('api/v1/employees/', api_v1_views.resource_list, {'resource_name': 'employees'}, name='api_v1_employees'),
+    path('api/v1/allocations/', api_v1_views.resource_list, {'resource_name': 'allocations'}, name='api_v1_allocations'),
+    path('api/v1/audit-logs/', api_v1_views.resource_list, {'resource_name': 'audit-logs'}, name='api_v1_audit_logs'),
 ]
\ No newline at end of file
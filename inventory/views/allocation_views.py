@@ -2,14 +2,18 @@
 
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.db.models import Q
-from django.utils import timezone
-from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
 
 from ..models import Employee, Asset, Allocation
-from ..forms import AllocationForm, ReturnForm
+from ..forms import AllocationForm, ReturnForm, BulkAllocationForm
 from ..decorators import role_required
+from ..http_cache import conditional_response, table_version
+from ..pagination import paginate_request
+from ..services import allocation as allocation_service
+from ..services.allocation import AllocationError
+from ..services import bulk_allocation as bulk_allocation_service
+from ..services.bulk_allocation import BulkAllocationError
+from ..services.queries import search_transactions
 
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
@@ -18,15 +22,17 @@ def allocation_list(request):
     Displays a paginated list of all historical and active allocations.
     """
     # Eager load related employee and asset objects to prevent N+1 queries.
-    allocations_queryset = Allocation.objects.select_related('employee', 'asset').order_by('-assigned_date')
+    allocations_queryset = Allocation.objects.select_related('employee', 'asset')
 
-    # Pagination
-    paginator = Paginator(allocations_queryset, 15) # Show 15 allocations per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
-    
-    context = {'page_obj': page_obj}
-    return render(request, 'inventory/allocations/allocation_list.html', context)
+    def build_response():
+        # Keyset pagination: newest first, with the primary key as a tie-breaker.
+        page_obj = paginate_request(request, allocations_queryset, ('-assigned_date', '-allocation_id'), 15)
+
+        context = {'page_obj': page_obj}
+        return render(request, 'inventory/allocations/allocation_list.html', context)
+
+    # 304 Not Modified while no allocation, employee or asset changed.
+    return conditional_response(request, table_version(Allocation, Employee, Asset), build_response)
 
 
 @login_required
@@ -50,18 +56,11 @@ def allocation_form(request):
                 try:
                     # Find the employee by the provided email
                     employee = Employee.objects.get(email=assign_form.cleaned_data['employee_email'])
-                    
-                    # Create the allocation record
-                    allocation = assign_form.save(commit=False)
-                    allocation.employee = employee
-                    allocation.transaction_status = 'Allocated'
-                    allocation.assigned_date = timezone.now() # Set assignment date automatically
-                    allocation.save()
-                    
-                    # Update the asset's status to 'Allocated'
                     asset = assign_form.cleaned_data['asset']
-                    asset.status = 'Allocated'
-                    asset.save()
+
+                    # Creates the allocation and flips the asset to 'Allocated' in one
+                    # transaction, with the asset row locked against concurrent assignment.
+                    allocation_service.assign(asset, employee, assign_form.cleaned_data)
                     
                     messages.success(request, f"Asset '{asset.serial_number}' successfully assigned to {employee.full_name}.")
                     return redirect('inventory:allocation_list')
@@ -69,6 +68,9 @@ def allocation_form(request):
                 # Validation: Handle case where employee does not exist
                 except Employee.DoesNotExist:
                     assign_form.add_error('employee_email', 'Employee with this email does not exist.')
+                # Validation: The asset was assigned by someone else in the meantime
+                except AllocationError as e:
+                    assign_form.add_error('asset', str(e))
 
         # --- Logic for Returning an Asset ---
         elif form_type == 'return':
@@ -76,6 +78,7 @@ def allocation_form(request):
             
             # Dynamically populate the asset dropdown based on the employee email.
             # This is a security measure to ensure you can only return assets the employee actually has.
+            employee = None
             if 'employee_email' in request.POST:
                 try:
                     employee = Employee.objects.get(email=request.POST['employee_email'])
@@ -86,40 +89,64 @@ def allocation_form(request):
             
             if return_form.is_valid():
                 asset = return_form.cleaned_data['asset']
-                employee = Employee.objects.get(email=return_form.cleaned_data['employee_email'])
+                # Reuse the employee loaded for the asset dropdown above.
+                if employee is None:
+                    employee = Employee.objects.get(email=return_form.cleaned_data['employee_email'])
                 
                 try:
-                    # Find the specific active allocation to update
-                    allocation_to_update = Allocation.objects.get(asset=asset, employee=employee, transaction_status='Allocated')
-                    
-                    # Update the found allocation record with data from the return form
-                    for field_name, value in return_form.cleaned_data.items():
-                        if hasattr(allocation_to_update, field_name):
-                            setattr(allocation_to_update, field_name, value)
-                    
-                    allocation_to_update.returned_date = timezone.now() # Set return date automatically
-                    allocation_to_update.transaction_status = 'Returned'
-                    allocation_to_update.save()
-                    
-                    # Update the asset's status back to 'Available'
-                    asset.status = 'Available'
-                    asset.save()
+                    # Closes the open allocation and makes the asset available again,
+                    # atomically and with the asset row locked.
+                    allocation_service.return_asset(asset, employee, return_form.cleaned_data, actor=request.user)
                     
                     messages.success(request, f"Asset '{asset.serial_number}' successfully returned from {employee.full_name}.")
                     return redirect('inventory:allocation_list')
 
                 # Validation: Handle case where the active allocation to return isn't found
-                except Allocation.DoesNotExist:
-                    return_form.add_error(None, "Could not find an active allocation for this asset and employee combination.")
+                except AllocationError as e:
+                    return_form.add_error(None, str(e))
 
     # Render the page with both forms
     context = {
-        'assign_form': assign_form,
+        'allocation_form': assign_form,
         'return_form': return_form
     }
     return render(request, 'inventory/allocations/allocation_form.html', context)
 
 
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def bulk_allocation(request):
+    """
+    Assigns or returns a whole onboarding/offboarding wave from one CSV or
+    JSON file. Valid rows are written in a single transaction; invalid rows
+    are listed and skipped.
+    """
+    result = None
+    form = BulkAllocationForm()
+
+    if request.method == 'POST':
+        form = BulkAllocationForm(request.POST, request.FILES)
+        if form.is_valid():
+            upload = form.cleaned_data['file']
+            try:
+                rows = bulk_allocation_service.read_rows(upload.read().decode('utf-8'), upload.name)
+                if form.cleaned_data['mode'] == bulk_allocation_service.MODE_ASSIGN:
+                    result = bulk_allocation_service.bulk_assign(rows, actor=request.user)
+                    messages.success(request, f"{result.created_count} assets assigned.")
+                else:
+                    result = bulk_allocation_service.bulk_return(rows, actor=request.user)
+                    messages.success(request, f"{result.updated_count} assets returned.")
+            # Validation: The file could not be decoded or parsed at all
+            except UnicodeDecodeError:
+                form.add_error('file', 'The file must be UTF-8 encoded.')
+            # Validation: Unreadable file, or assets changed by someone else mid-batch
+            except (BulkAllocationError, AllocationError) as e:
+                form.add_error('file', str(e))
+
+    context = {'form': form, 'result': result}
+    return render(request, 'inventory/allocations/bulk_allocation.html', context)
+
+
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
 def transaction_search(request):
@@ -132,19 +159,10 @@ def transaction_search(request):
     results = None
     
     if query:
-        if search_type == 'employee':
-            # Search by employee name or email
-            results = Allocation.objects.filter(
-                Q(employee__full_name__icontains=query) | 
-                Q(employee__email__icontains=query)
-            ).select_related('employee', 'asset').order_by('-assigned_date')
-        
-        elif search_type == 'asset':
-            # Search by asset serial number or ID
-            results = Allocation.objects.filter(
-                Q(asset__serial_number__icontains=query) | 
-                Q(asset__asset_id__icontains=query)
-            ).select_related('employee', 'asset').order_by('-assigned_date')
+        # Search by employee name/email or asset serial number/ID (via the search index)
+        results = search_transactions(search_type, query)
+        if results is not None:
+            results = results.select_related('employee', 'asset').order_by('-assigned_date')
     
     context = {
         'search_type': search_type,
@@ -0,0 +1,86 @@
+# inventory/views/api_v1_views.py
+
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
+from django.contrib.auth.decorators import login_required
+
+from ..decorators import role_required
+from ..http_cache import conditional_response, table_version
+from ..pagination import CursorPaginator, InvalidCursor
+from ..serializers import RESOURCES
+
+# ===================================================================
+# Versioned JSON API (/api/v1/<resource>/)
+# ===================================================================
+# One read-only endpoint per resource in serializers.RESOURCES, supporting:
+#   ?fields=a,b,c        only these fields (default: a compact set)
+#   ?ids=1,2,3           batch retrieval of up to MAX_BATCH_IDS objects, in the given order
+#   ?<filter>=value      resource-specific filters, plus ?q= full-text search for assets/employees
+#   ?limit=&cursor=      keyset pagination; follow `next_cursor` until it is null
+# Resources with version stamps answer 304 Not Modified to a matching If-None-Match.
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+MAX_BATCH_IDS = 100
+
+
+def _bad_request(message):
+    return JsonResponse({'error': message}, status=400)
+
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def resource_list(request, resource_name):
+    """Lists, filters or batch-fetches one API resource; see the module comment."""
+    resource = RESOURCES[resource_name]
+    if not resource.versioned_by:
+        return _resource_response(request, resource)
+
+    version = table_version(*resource.versioned_by)
+    return conditional_response(request, version, lambda: _resource_response(request, resource))
+
+
+def _resource_response(request, resource):
+    params = request.GET
+
+    try:
+        field_names = resource.parse_fields(params.get('fields'))
+        queryset = resource.filter(resource.base_queryset(request), params)
+    except (ValueError, ValidationError) as e:
+        return _bad_request(e.messages[0] if isinstance(e, ValidationError) else str(e))
+
+    # --- Batch retrieval by primary key ---
+    if 'ids' in params:
+        ids = list(dict.fromkeys(value.strip() for value in params['ids'].split(',') if value.strip()))
+        if len(ids) > MAX_BATCH_IDS:
+            return _bad_request(f"At most {MAX_BATCH_IDS} ids can be requested at once.")
+        pk_field = resource.model._meta.pk
+        try:
+            ids = [pk_field.to_python(value) for value in ids]
+        except ValidationError:
+            return _bad_request(f"ids must be valid {pk_field.name} values.")
+
+        rows = resource.project(queryset.filter(pk__in=ids).order_by(), field_names + [resource.pk_name])
+        found = {row[resource.pk_name]: row for row in rows}
+        return JsonResponse({
+            'results': resource.serialize((found[pk] for pk in ids if pk in found), field_names),
+            'missing': [pk for pk in ids if pk not in found],
+        })
+
+    # --- Paginated listing ---
+    try:
+        limit = min(max(int(params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        return _bad_request("limit must be a whole number.")
+
+    paginator = CursorPaginator(resource.project(queryset, field_names), resource.ordering, limit)
+    try:
+        page = paginator.page(params.get('cursor') or None)
+    except InvalidCursor as e:
+        return _bad_request(str(e))
+
+    return JsonResponse({
+        'results': resource.serialize(page, field_names),
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    })
@@ -1,12 +1,25 @@
 # inventory/views/api_views.py
 
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
 from django.contrib.auth.decorators import login_required
 from django.db.models import Q
 import datetime
+import os
 
-from ..models import Asset, Employee, Allocation
+from .. import caching, metrics
+from ..models import Asset, Employee, Allocation, AssetAgingSummary, ImportJob
 from ..decorators import role_required
+from ..http_cache import Version, combine, conditional_response, queryset_version
+from ..pagination import CursorPaginator, InvalidCursor
+from ..roles import has_role
+from ..services.import_jobs import job_progress
+from ..services import search
+from ..services.allocation import asset_history, held_assets
+from ..services.analytics import lifecycle_metrics
+from ..services.queries import visible_audit_logs
+from ..services import asset_aging
 
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
@@ -14,18 +27,60 @@ def get_asset_details(request, asset_id):
     """
     API endpoint to fetch basic details for a given asset_id.
     Called by JavaScript in the allocation form.
-    Returns a JSON response.
+    Returns a JSON response, or 304 when the asset has not changed.
     """
-    try:
-        asset = Asset.objects.get(asset_id=asset_id)
-        data = {
-            'brand': asset.brand,
-            'model': asset.model,
-            'processor': asset.processor,
-        }
+    def build_response():
+        data = caching.get_or_set(caching.ASSET_SUMMARY, asset_id, lambda: Asset.objects.filter(
+            asset_id=asset_id
+        ).values('brand', 'model', 'processor').first())
+        if data is None:
+            return JsonResponse({'error': 'Asset not found'}, status=404)
         return JsonResponse(data)
-    except Asset.DoesNotExist:
-        return JsonResponse({'error': 'Asset not found'}, status=404)
+
+    return conditional_response(request, queryset_version(Asset.objects.filter(asset_id=asset_id)), build_response)
+
+# Suggestions per request of the allocation form's asset picker.
+AVAILABLE_ASSETS_PAGE_SIZE = 20
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def search_available_assets(request):
+    """
+    API endpoint for the allocation form's asset picker: available assets
+    whose asset ID or serial number starts with `q`, ordered by asset ID and
+    paginated with `cursor`. Returns {'results': [...], 'next_cursor': ...}.
+    """
+    query = request.GET.get('q', '').strip()
+    cursor = request.GET.get('cursor') or None
+
+    def build_page():
+        # status = 'Available' (not iexact) so the (status, ...) indexes are used
+        # for both the prefix match and the ordering; MySQL's default collation
+        # compares case-insensitively anyway.
+        queryset = Asset.objects.filter(status='Available')
+        if query:
+            queryset = queryset.filter(Q(asset_id__istartswith=query) | Q(serial_number__istartswith=query))
+        paginator = CursorPaginator(
+            queryset.values('asset_id', 'brand', 'model', 'serial_number'), ('asset_id',), AVAILABLE_ASSETS_PAGE_SIZE
+        )
+        page = paginator.page(cursor)
+        return {
+            'results': [
+                {'id': row['asset_id'], 'text': f"{row['brand']} {row['model']} ({row['serial_number']})"}
+                for row in page
+            ],
+            'next_cursor': page.next_cursor,
+        }
+
+    try:
+        if query or cursor:
+            data = build_page()
+        else:
+            # The unfiltered first page is what every form shows on focus.
+            data = caching.get_or_set(caching.AVAILABLE_ASSETS, None, build_page)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse(data)
 
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
@@ -41,10 +96,7 @@ def get_employee_assets(request):
     
     try:
         employee = Employee.objects.get(email__iexact=email)
-        allocations = Allocation.objects.filter(
-            employee=employee, 
-            transaction_status='Allocated'
-        ).select_related('asset')
+        allocations = held_assets(employee.pk)
         
         assets = [{
             'id': alloc.asset.asset_id, 
@@ -56,18 +108,25 @@ def get_employee_assets(request):
     except Employee.DoesNotExist:
         return JsonResponse({'assets': []})
 
+# Asset history timeline pages (get_asset_history).
+HISTORY_PAGE_SIZE = 20
+MAX_HISTORY_PAGE_SIZE = 100
+HISTORY_COLUMNS = ('allocation_id', 'employee_name', 'assigned_date', 'returned_date', 'days_held')
+
 @login_required
 def get_asset_history(request, asset_id):
     """
-    API endpoint to fetch the full transaction history for a specific asset.
-    Called by the employee dashboard.
-    Returns a JSON list of allocation records.
+    API endpoint for an asset's allocation timeline, newest first, one page
+    at a time (?limit=, default 20, and ?cursor= from `next_cursor`).
+    Called by the employee dashboard and the asset delete modal.
+    Returns {'columns': [...], 'rows': [[...], ...], 'next_cursor': ...};
+    days_held counts up to today for the current holder.
     """
     try:
         asset = Asset.objects.get(asset_id=asset_id)
         user = request.user
 
-        is_admin = user.is_superuser or user.groups.filter(name__in=['IT_Admin', 'Super_Admin']).exists()
+        is_admin = user.is_superuser or has_role(user, 'IT_Admin', 'Super_Admin')
         is_current_owner = Allocation.objects.filter(
             asset=asset, 
             employee__user=user, 
@@ -77,17 +136,35 @@ def get_asset_history(request, asset_id):
         if not is_admin and not is_current_owner:
             return JsonResponse({'error': 'You do not have permission to view this asset\'s history.'}, status=403)
 
-        history = Allocation.objects.filter(
-            asset=asset
-        ).select_related('employee').order_by('-assigned_date')
-        
-        history_data = list(history.values(
-            'employee__full_name', 
-            'assigned_date', 
-            'returned_date'
-        ))
-        
-        return JsonResponse({'history': history_data})
+        try:
+            limit = min(max(int(request.GET.get('limit', HISTORY_PAGE_SIZE)), 1), MAX_HISTORY_PAGE_SIZE)
+        except ValueError:
+            return JsonResponse({'error': 'limit must be a whole number.'}, status=400)
+
+        def build_response():
+            paginator = CursorPaginator(asset_history(asset.asset_id), ('-assigned_date', '-allocation_id'), limit)
+            try:
+                page = paginator.page(request.GET.get('cursor') or None)
+            except InvalidCursor as e:
+                return JsonResponse({'error': str(e)}, status=400)
+            return JsonResponse({
+                'columns': HISTORY_COLUMNS,
+                'rows': [
+                    [row['allocation_id'], row['employee_name'], row['assigned_date'], row['returned_date'],
+                     row['held'].days if row['held'] is not None else None]
+                    for row in page
+                ],
+                'next_cursor': page.next_cursor,
+            })
+
+        # Checked after the permission test, so a 304 never leaks anything.
+        # The date is part of the version because the current holder's days_held grows daily.
+        version = combine(
+            queryset_version(Asset.objects.filter(asset_id=asset.asset_id)),
+            queryset_version(Allocation.objects.filter(asset=asset), 'updated_at', 'employee__updated_at'),
+            Version(None, datetime.date.today().isoformat()),
+        )
+        return conditional_response(request, version, build_response)
         
     except Asset.DoesNotExist:
         return JsonResponse({'error': 'Asset not found'}, status=404)
@@ -100,23 +177,30 @@ def get_asset_history(request, asset_id):
 def get_detailed_asset_info(request, asset_id):
     """
     Fetches comprehensive details about an asset for the delete confirmation modal.
+    Answers 304 while neither the asset, its allocations nor their employees changed.
     """
+    version = combine(
+        queryset_version(Asset.objects.filter(asset_id=asset_id)),
+        queryset_version(Allocation.objects.filter(asset_id=asset_id), 'updated_at', 'employee__updated_at'),
+    )
+    return conditional_response(request, version, lambda: _detailed_asset_info(asset_id))
+
+
+def _detailed_asset_info(asset_id):
+    data = caching.get_or_set(caching.ASSET_DETAIL, asset_id, lambda: _detailed_asset_payload(asset_id))
+    if data is None:
+        return JsonResponse({'error': 'Asset not found'}, status=404)
+    return JsonResponse(data)
+
+
+def _detailed_asset_payload(asset_id):
     try:
         asset = Asset.objects.select_related().get(asset_id=asset_id)
         
         # Get current allocation info
         current_allocation = Allocation.objects.filter(asset=asset, transaction_status='Allocated').select_related('employee').first()
         
-        # Get full transaction history
-        history = Allocation.objects.filter(asset=asset).select_related('employee').order_by('-assigned_date')
-        history_data = []
-        for alloc in history:
-            history_data.append({
-                'employee_name': alloc.employee.full_name,
-                'assigned_date': alloc.assigned_date.strftime('%b %d, %Y, %I:%M %p') if alloc.assigned_date else 'N/A',
-                'returned_date': alloc.returned_date.strftime('%b %d, %Y, %I:%M %p') if alloc.returned_date else 'Currently Assigned'
-            })
-
+        # The transaction history is loaded by the modal from get_asset_history, a page at a time.
         data = {
             'asset_id': asset.asset_id,
             'serial_number': asset.serial_number,
@@ -125,11 +209,10 @@ def get_detailed_asset_info(request, asset_id):
             'status': asset.status,
             'purchase_date': asset.purchase_date.strftime('%B %d, %Y') if asset.purchase_date else 'N/A',
             'current_owner': current_allocation.employee.full_name if current_allocation else 'None (Available)',
-            'history': history_data
         }
-        return JsonResponse(data)
+        return data
     except Asset.DoesNotExist:
-        return JsonResponse({'error': 'Asset not found'}, status=404)
+        return None
 
 # ===================================================================
 # NEW: API View for Employee Deletion Modal
@@ -139,7 +222,16 @@ def get_detailed_asset_info(request, asset_id):
 def get_detailed_employee_info(request, employee_id):
     """
     Fetches comprehensive details about an employee for the delete confirmation modal.
+    Answers 304 while neither the employee, their allocations nor those assets changed.
     """
+    version = combine(
+        queryset_version(Employee.objects.filter(pk=employee_id)),
+        queryset_version(Allocation.objects.filter(employee_id=employee_id), 'updated_at', 'asset__updated_at'),
+    )
+    return conditional_response(request, version, lambda: _detailed_employee_info(employee_id))
+
+
+def _detailed_employee_info(employee_id):
     try:
         employee = Employee.objects.get(pk=employee_id)
         
@@ -164,4 +256,157 @@ def get_detailed_employee_info(request, employee_id):
         }
         return JsonResponse(data)
     except Employee.DoesNotExist:
-        return JsonResponse({'error': 'Employee not found'}, status=404)
\ No newline at end of file
+        return JsonResponse({'error': 'Employee not found'}, status=404)
+
+# ===================================================================
+# NEW: API View for Background Import Progress
+# ===================================================================
+@login_required
+@role_required(allowed_roles=['Super_Admin'])
+def get_import_job_status(request, job_id):
+    """
+    Reports the progress of a queued CSV import (rows processed, errors, throughput).
+    Polled by the asset and employee form pages while the worker runs.
+    """
+    try:
+        job = ImportJob.objects.defer('payload').get(pk=job_id)
+        return JsonResponse(job_progress(job))
+    except ImportJob.DoesNotExist:
+        return JsonResponse({'error': 'Import job not found'}, status=404)
+
+# ===================================================================
+# NEW: API View for Type-Ahead Search
+# ===================================================================
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def search_inventory(request):
+    """
+    Ranked prefix search over assets (`?kind=asset`) or employees (`?kind=employee`),
+    served from the search index. Meant for type-ahead boxes, so at most 20 results.
+    """
+    kind = request.GET.get('kind', search.ASSET)
+    query = request.GET.get('q', '').strip()
+    if kind not in search.SEARCH_FIELDS:
+        return JsonResponse({'error': 'kind must be "asset" or "employee"'}, status=400)
+
+    ids = search.search(kind, query, limit=20)
+    if kind == search.ASSET:
+        found = Asset.objects.in_bulk(ids)
+        results = [{
+            'id': asset.asset_id,
+            'text': f"{asset.brand} {asset.model}",
+            'serial': asset.serial_number,
+            'status': asset.status,
+        } for asset in (found[pk] for pk in ids if pk in found)]
+    else:
+        found = Employee.objects.in_bulk(ids)
+        results = [{
+            'id': employee.employee_id,
+            'text': employee.full_name,
+            'email': employee.email,
+            'designation': employee.designation,
+        } for employee in (found[pk] for pk in ids if pk in found)]
+
+    return JsonResponse({'results': results})
+
+# ===================================================================
+# NEW: API Views for Asset Analytics and Aging
+# ===================================================================
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def get_analytics(request):
+    """
+    Asset lifecycle metrics (see services/analytics.py) as JSON: a `summary`
+    and per-model rows in `by_model`. Recomputed at most every
+    INVENTORY_ANALYTICS_TIMEOUT seconds.
+    """
+    return JsonResponse(lifecycle_metrics())
+
+# Asset aging due-list pages (get_asset_aging_bucket).
+AGING_PAGE_SIZE = 50
+MAX_AGING_PAGE_SIZE = 500
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def get_asset_aging_summary(request):
+    """
+    Sizes of the warranty-expiry and age buckets as of the last
+    `refresh_asset_aging` run (`computed_on` is null before the first run).
+    """
+    return JsonResponse(asset_aging.aging_summary())
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def get_asset_aging_bucket(request, kind, bucket):
+    """
+    The assets of one bucket, e.g. /api/asset-aging/warranty/0-30/: soonest
+    expiry (or oldest purchase) first, paginated with ?cursor= and ?limit=.
+    """
+    if kind not in asset_aging.LIST_ORDERING:
+        return JsonResponse({'error': f"Unknown kind. Available: {', '.join(asset_aging.LIST_ORDERING)}."}, status=404)
+    buckets = asset_aging.WARRANTY_BUCKETS if kind == AssetAgingSummary.KIND_WARRANTY else asset_aging.AGE_BUCKETS
+    if bucket not in buckets:
+        return JsonResponse({'error': f"Unknown bucket. Available: {', '.join(buckets)}."}, status=404)
+    try:
+        limit = min(max(int(request.GET.get('limit', AGING_PAGE_SIZE)), 1), MAX_AGING_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a whole number.'}, status=400)
+
+    paginator = CursorPaginator(asset_aging.bucket_assets(kind, bucket), asset_aging.LIST_ORDERING[kind], limit)
+    try:
+        page = paginator.page(request.GET.get('cursor') or None)
+    except InvalidCursor as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return JsonResponse({'results': list(page), 'next_cursor': page.next_cursor})
+
+# ===================================================================
+# NEW: API View for Audit Log Details
+# ===================================================================
+AUDIT_DETAILS_MAX_AGE = 3600
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def get_audit_log_details(request, log_id):
+    """
+    The `details` of one audit entry, for an expanded row of the log viewer
+    (the list itself is loaded without them). Entries the user may not see
+    in the viewer answer 404. Entries never change, so browsers may keep
+    the answer for a while.
+    """
+    details = visible_audit_logs(request.user).filter(pk=log_id).values_list('details', flat=True).first()
+    if details is None:
+        return JsonResponse({'error': 'Audit log entry not found'}, status=404)
+    response = JsonResponse({'id': log_id, 'details': details})
+    patch_cache_control(response, private=True, max_age=AUDIT_DETAILS_MAX_AGE)
+    return response
+
+# ===================================================================
+# NEW: API View for Cache Statistics
+# ===================================================================
+@login_required
+@role_required(allowed_roles=['Super_Admin'])
+def get_cache_stats(request):
+    """
+    Hit/miss counters of the read-through cache regions (see caching.py), for
+    tuning INVENTORY_CACHE_TIMEOUT. Counters are per worker process.
+    """
+    return JsonResponse({
+        'backend': settings.CACHES['default']['BACKEND'],
+        'timeout': getattr(settings, 'INVENTORY_CACHE_TIMEOUT', 300),
+        'pid': os.getpid(),
+        'regions': caching.stats(),
+    })
+
+# ===================================================================
+# NEW: Prometheus Endpoint for Request Metrics
+# ===================================================================
+@login_required
+@role_required(allowed_roles=['Super_Admin'])
+def get_metrics(request):
+    """
+    Per-view request counts, latency, SQL query counts, DB time and duplicate
+    queries recorded by QueryMetricsMiddleware (see metrics.py), in the
+    Prometheus text format. Like the cache statistics, they are per worker
+    process.
+    """
+    return HttpResponse(metrics.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
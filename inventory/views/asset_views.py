@@ -1,17 +1,19 @@
 # inventory/views/asset_views.py
 
-import csv
-from io import TextIOWrapper
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
-from django.db import IntegrityError
-from django.db.models import Count, Q
-from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
+from django.db import IntegrityError, transaction
 
-from ..models import Asset
+from ..models import Asset, ImportJob
 from ..forms import AssetForm, BulkAssetImportForm
 from ..decorators import role_required
+from ..http_cache import conditional_response, table_version
+from ..pagination import paginate_request
+from ..services.dashboard_stats import asset_status_counts, cached_counters
+from ..services.search import ASSET, matching_ids
+from ..services.import_jobs import ImportJobError, enqueue_import, find_import_job
 
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
@@ -19,29 +21,28 @@ def asset_list(request):
     """
     Displays a paginated and searchable list of all assets.
     """
-    asset_queryset = Asset.objects.all().order_by('asset_id')
+    asset_queryset = Asset.objects.all()
     
     query = request.GET.get('q')
     if query:
-        asset_queryset = asset_queryset.filter(
-            Q(asset_id__icontains=query) |
-            Q(serial_number__icontains=query) |
-            Q(model__icontains=query) |
-            Q(brand__icontains=query)
-        )
+        # Prefix search over asset ID, serial number, brand and model via the search index.
+        asset_queryset = asset_queryset.filter(asset_id__in=matching_ids(ASSET, query))
 
-    paginator = Paginator(asset_queryset, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    def build_response():
+        page_obj = paginate_request(request, asset_queryset, ('asset_id',), 10)
 
-    status_counts_json = list(Asset.objects.values('status').annotate(count=Count('status')))
+        status_counts_json = asset_status_counts(cached_counters())
 
-    context = {
-        'page_obj': page_obj,
-        'status_counts_json': status_counts_json,
-        'query': query,
-    }
-    return render(request, 'inventory/assets/asset_list.html', context)
+        context = {
+            'page_obj': page_obj,
+            'status_counts_json': status_counts_json,
+            'query': query,
+        }
+        return render(request, 'inventory/assets/asset_list.html', context)
+
+    # Everything on the page (including the status counters) derives from the
+    # asset table, so an unchanged table is answered with 304 Not Modified.
+    return conditional_response(request, table_version(Asset), build_response)
 
 
 @login_required
@@ -59,19 +60,36 @@ def add_asset(request, pk=None):
             # Pass the instance to the form if we are editing
             asset_form = AssetForm(request.POST, instance=instance)
             if asset_form.is_valid():
-                asset_form.save()
-                messages.success(request, f"Asset '{asset_form.cleaned_data['serial_number']}' has been successfully saved!")
-                return redirect('inventory:asset_list')
-            else:
-                bulk_form = BulkAssetImportForm()
+                asset = asset_form.save(commit=False)
+                try:
+                    if instance is None:
+                        # The form has already checked that the asset ID is unused, so
+                        # insert directly: no UPDATE attempt and no stored-status lookup.
+                        # A concurrent add of the same ID or serial number can still
+                        # win the race; the savepoint keeps the request usable then.
+                        with transaction.atomic():
+                            asset.save(force_insert=True)
+                    else:
+                        asset.save()
+                except IntegrityError:
+                    asset_form.add_error('asset_id', "An asset with this Asset ID or serial number was just added by someone else.")
+                else:
+                    messages.success(request, f"Asset '{asset_form.cleaned_data['serial_number']}' has been successfully saved!")
+                    return redirect('inventory:asset_list')
+            bulk_form = BulkAssetImportForm()
         
         elif 'import_bulk_asset' in request.POST:
             bulk_form = BulkAssetImportForm(request.POST, request.FILES)
             if bulk_form.is_valid():
-                handle_bulk_asset_import(request, bulk_form)
-                return redirect('inventory:asset_list')
-            else:
-                asset_form = AssetForm(instance=instance)
+                # The import itself runs in the background worker; the request returns at once.
+                try:
+                    job = enqueue_import(ImportJob.KIND_ASSETS, bulk_form.cleaned_data['file'], request.user)
+                except ImportJobError as e:
+                    bulk_form.add_error('file', str(e))
+                else:
+                    messages.success(request, f"Import #{job.pk} has been queued. Progress is shown below.")
+                    return redirect(f"{reverse('inventory:add_asset')}?job={job.pk}")
+            asset_form = AssetForm(instance=instance)
     
     else: # For a GET request
         asset_form = AssetForm(instance=instance)
@@ -81,6 +99,7 @@ def add_asset(request, pk=None):
         'asset_form': asset_form,
         'bulk_form': bulk_form,
         'asset': instance,  # Pass asset to template to change titles (Add/Edit)
+        'import_job': find_import_job(request.GET.get('job'), ImportJob.KIND_ASSETS),
     }
     return render(request, 'inventory/assets/asset_form.html', context)
 
@@ -111,55 +130,3 @@ def delete_asset(request, pk):
         messages.error(request, f"An error occurred while trying to delete the asset: {e}")
 
     return redirect('inventory:asset_list')
-
-
-def handle_bulk_asset_import(request, form):
-    """
-    Helper function to process the uploaded CSV file for bulk asset import.
-    """
-    # This function remains unchanged.
-    csv_file = form.cleaned_data['file']
-    file = TextIOWrapper(csv_file.file, encoding='utf-8')
-    reader = csv.DictReader(file)
-    
-    created_count = 0
-    errors = []
-    
-    for row_num, row in enumerate(reader, 2):
-        try:
-            asset_id = row.get('asset_id')
-            serial_number = row.get('serial_number')
-            if not asset_id or not serial_number:
-                errors.append(f"Row {row_num}: `asset_id` and `serial_number` are required fields.")
-                continue
-
-            asset, created = Asset.objects.update_or_create(
-                asset_id=asset_id,
-                defaults={
-                    'serial_number': serial_number,
-                    'asset_type': row.get('asset_type', 'Laptop'),
-                    'brand': row.get('brand'),
-                    'model': row.get('model'),
-                    'processor': row.get('processor'),
-                    'ram_gb': int(row.get('ram_gb')) if row.get('ram_gb') else None,
-                    'storage_size_gb': int(row.get('storage_size_gb')) if row.get('storage_size_gb') else None,
-                    'purchase_date': row.get('purchase_date') or None,
-                    'warranty_expiry': row.get('warranty_expiry') or None,
-                    'status': row.get('status', 'Available'),
-                    'remarks': row.get('remarks')
-                }
-            )
-            if created:
-                created_count += 1
-        except IntegrityError:
-            errors.append(f"Row {row_num}: A database error occurred. The serial number '{serial_number}' might already exist.")
-        except Exception as e:
-            errors.append(f"Row {row_num}: An unexpected error occurred - {e}")
-    
-    if created_count > 0:
-        messages.success(request, f'Successfully imported {created_count} new assets.')
-    if not errors and created_count == 0:
-        messages.info(request, 'No new assets were imported. The data may have matched existing records.')
-    if errors:
-        error_message = "Bulk import finished with some errors: " + " | ".join(errors)
-        messages.error(request, error_message)
\ No newline at end of file
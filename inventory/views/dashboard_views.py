@@ -1,12 +1,20 @@
 # inventory/views/dashboard_views.py
 
 from django.shortcuts import render
-from django.db.models import Count
 from django.contrib.auth.decorators import login_required
+from django.utils.dateparse import parse_datetime
 import json
 
-from ..models import Employee, Asset, Allocation, AuditLog
+from ..models import Employee, AuditLog
 from ..decorators import role_required
+from ..roles import has_role
+from ..services.allocation import held_assets
+from ..services.analytics import lifecycle_metrics
+from ..services.asset_aging import aging_summary
+from ..services.dashboard_stats import (
+    ACTIVE_EMPLOYEES, asset_status_counts, asset_status_key, cached_counters,
+)
+from ..services.queries import audit_log_summaries
 
 @login_required
 def dashboard_redirect_view(request):
@@ -16,9 +24,9 @@ def dashboard_redirect_view(request):
     """
     user = request.user
     
-    if user.is_superuser or user.groups.filter(name='IT_Admin').exists():
+    if user.is_superuser or has_role(user, 'IT_Admin'):
         return admin_dashboard(request)
-    elif user.groups.filter(name='Employee').exists():
+    elif has_role(user, 'Employee'):
         return employee_dashboard(request)
     else:
         # Fallback for users with no role - show a restricted page.
@@ -30,19 +38,25 @@ def dashboard_redirect_view(request):
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
 def admin_dashboard(request):
     """Displays the comprehensive dashboard for IT Admins and Super Admins."""
-    total_employees = Employee.objects.filter(status='Active').count()
-    total_assets = Asset.objects.count()
-    assigned_assets = Asset.objects.filter(status='Allocated').count()
-    available_assets = Asset.objects.filter(status='Available').count()
-    
-    status_counts = list(Asset.objects.values('status').annotate(count=Count('status')))
+    # All headline numbers come from the materialized counters in a single
+    # (usually cached) query, no matter how large the inventory grows.
+    counters = cached_counters()
+    status_counts = asset_status_counts(counters)
+
+    total_employees = counters.get(ACTIVE_EMPLOYEES, 0)
+    total_assets = sum(item['count'] for item in status_counts)
+    assigned_assets = counters.get(asset_status_key('Allocated'), 0)
+    available_assets = counters.get(asset_status_key('Available'), 0)
     
     bar_chart_data = {
         'labels': [item['status'] for item in status_counts],
         'data': [item['count'] for item in status_counts],
     }
 
-    recent_logs = AuditLog.objects.select_related('actor').order_by('-timestamp')[:10]
+    recent_logs = audit_log_summaries(AuditLog.objects.order_by('-timestamp'))[:10]
+
+    # Warranty/age bucket sizes, precomputed by `refresh_asset_aging` (one small query).
+    aging = aging_summary()
     
     context = {
         'total_employees': total_employees,
@@ -52,6 +66,7 @@ def admin_dashboard(request):
         'status_counts_json': json.dumps(status_counts),
         'bar_chart_data_json': json.dumps(bar_chart_data),
         'recent_logs': recent_logs,
+        'aging': aging,
     }
     return render(request, 'inventory/dashboards/admin_dashboard.html', context)
 
@@ -61,14 +76,29 @@ def employee_dashboard(request):
     """Displays the simplified dashboard for standard employees."""
     try:
         employee = request.user.employee_profile
-        assigned_allocations = Allocation.objects.filter(
-            employee=employee,
-            transaction_status='Allocated'
-        ).select_related('asset').order_by('-assigned_date')
+        # Open allocations with their assets, newest first (cached until they change).
+        assigned_allocations = held_assets(employee.pk)
     except Employee.DoesNotExist:
         assigned_allocations = []
 
     context = {
         'assigned_allocations': assigned_allocations,
     }
-    return render(request, 'inventory/dashboards/employee_dashboard.html', context)
\ No newline at end of file
+    return render(request, 'inventory/dashboards/employee_dashboard.html', context)
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def analytics_dashboard(request):
+    """Asset lifecycle metrics: utilization, idle time, churn and damage rates by model."""
+    metrics = lifecycle_metrics()
+    context = {
+        'metrics': metrics,
+        'generated_at': parse_datetime(metrics['generated_at']),
+        # The 15 busiest models, rendered with json_script (model names are free text).
+        'chart_data': {
+            'labels': [row['model'] for row in metrics['by_model'][:15]],
+            'churn': [row['churn'] for row in metrics['by_model'][:15]],
+            'avg_days': [row['avg_days_per_allocation'] for row in metrics['by_model'][:15]],
+        },
+    }
+    return render(request, 'inventory/dashboards/analytics_dashboard.html', context)
@@ -1,17 +1,18 @@
 # inventory/views/employee_views.py
 
-import csv
-from io import TextIOWrapper
 from django.shortcuts import render, redirect, get_object_or_404
+from django.urls import reverse
 from django.contrib import messages
-from django.db import IntegrityError
-from django.db.models import Prefetch, Q
-from django.core.paginator import Paginator
+from django.db.models import Prefetch
 from django.contrib.auth.decorators import login_required
 
-from ..models import Employee, Allocation
+from ..models import Employee, Allocation, Asset, ImportJob
 from ..forms import EmployeeForm, BulkEmployeeImportForm
 from ..decorators import role_required
+from ..http_cache import conditional_response, table_version
+from ..pagination import paginate_request
+from ..services.import_jobs import ImportJobError, enqueue_import, find_import_job
+from ..services.search import EMPLOYEE, matching_ids
 
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
@@ -25,25 +26,24 @@ def employee_list(request):
         to_attr='active_allocations'
     )
     
-    employee_queryset = Employee.objects.prefetch_related(active_allocations_prefetch).order_by('full_name')
+    employee_queryset = Employee.objects.prefetch_related(active_allocations_prefetch)
 
     query = request.GET.get('q')
     if query:
-        employee_queryset = employee_queryset.filter(
-            Q(full_name__icontains=query) |
-            Q(email__icontains=query) |
-            Q(designation__icontains=query)
-        )
+        # Prefix search over name, email and designation via the search index.
+        employee_queryset = employee_queryset.filter(employee_id__in=matching_ids(EMPLOYEE, query))
 
-    paginator = Paginator(employee_queryset, 10)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    def build_response():
+        page_obj = paginate_request(request, employee_queryset, ('full_name', 'employee_id'), 10)
 
-    context = {
-        'page_obj': page_obj,
-        'query': query,
-    }
-    return render(request, 'inventory/employees/employee_list.html', context)
+        context = {
+            'page_obj': page_obj,
+            'query': query,
+        }
+        return render(request, 'inventory/employees/employee_list.html', context)
+
+    # The page shows employees with their current assets: 304 while none of the three tables changed.
+    return conditional_response(request, table_version(Employee, Allocation, Asset), build_response)
 
 
 @login_required
@@ -67,10 +67,15 @@ def add_employee(request, pk=None):
         elif 'import_bulk_employee' in request.POST:
             bulk_form = BulkEmployeeImportForm(request.POST, request.FILES)
             if bulk_form.is_valid():
-                handle_bulk_employee_import(request, bulk_form)
-                return redirect('inventory:employee_list')
-            else:
-                employee_form = EmployeeForm(instance=instance)
+                # The import itself runs in the background worker; the request returns at once.
+                try:
+                    job = enqueue_import(ImportJob.KIND_EMPLOYEES, bulk_form.cleaned_data['file'], request.user)
+                except ImportJobError as e:
+                    bulk_form.add_error('file', str(e))
+                else:
+                    messages.success(request, f"Import #{job.pk} has been queued. Progress is shown below.")
+                    return redirect(f"{reverse('inventory:add_employee')}?job={job.pk}")
+            employee_form = EmployeeForm(instance=instance)
     
     else: # For a GET request
         employee_form = EmployeeForm(instance=instance)
@@ -80,6 +85,7 @@ def add_employee(request, pk=None):
         'employee_form': employee_form,
         'bulk_form': bulk_form,
         'employee': instance,
+        'import_job': find_import_job(request.GET.get('job'), ImportJob.KIND_EMPLOYEES),
     }
     return render(request, 'inventory/employees/employee_form.html', context)
 
@@ -109,48 +115,3 @@ def delete_employee(request, pk):
         messages.error(request, f"An error occurred while trying to delete the employee: {e}")
 
     return redirect('inventory:employee_list')
-
-
-def handle_bulk_employee_import(request, form):
-    """
-    Helper function to process the uploaded CSV for bulk employee import.
-    """
-    # This function remains unchanged.
-    csv_file = form.cleaned_data['file']
-    file = TextIOWrapper(csv_file.file, encoding='utf-8')
-    reader = csv.DictReader(file)
-
-    created_count = 0
-    errors = []
-    
-    for row_num, row in enumerate(reader, 2):
-        try:
-            full_name = row.get('full_name')
-            email = row.get('email')
-            if not full_name or not email:
-                errors.append(f"Row {row_num}: `full_name` and `email` are required.")
-                continue
-
-            employee, created = Employee.objects.update_or_create(
-                email=email,
-                defaults={
-                    'full_name': full_name,
-                    'designation': row.get('designation'),
-                    'status': row.get('status', 'Active'),
-                    'date_of_joining': row.get('date_of_joining') or None,
-                }
-            )
-            if created:
-                created_count += 1
-        except IntegrityError:
-            errors.append(f"Row {row_num}: Employee with email '{email}' might already exist.")
-        except Exception as e:
-            errors.append(f"Row {row_num}: An unexpected error occurred - {e}")
-
-    if created_count > 0:
-        messages.success(request, f'Successfully imported {created_count} new employees.')
-    if not errors and created_count == 0:
-        messages.info(request, 'No new employees were imported. The data may have matched existing records.')
-    if errors:
-        error_message = "Bulk import finished with some errors: " + " | ".join(errors)
-        messages.error(request, error_message)
\ No newline at end of file
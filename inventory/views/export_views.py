@@ -0,0 +1,41 @@
+# inventory/views/export_views.py
+
+from django.http import HttpResponseBadRequest, HttpResponseServerError, StreamingHttpResponse
+from django.contrib.auth.decorators import login_required
+
+from ..decorators import role_required
+from ..services import audit_archive, exports
+
+# ===================================================================
+# Streaming Exports (/exports/<kind>/)
+# ===================================================================
+# ?format=csv|jsonl (default csv), ?gzip=1 for a compressed download, plus
+# the filters of the page the data comes from (see exports.export_queryset).
+# The response is streamed batch by batch; see services/exports.py.
+
+@login_required
+@role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
+def export_data(request, kind):
+    """Streams assets, employees, allocations or audit logs as a file download."""
+    file_format = request.GET.get('format', exports.FORMAT_CSV)
+    if file_format not in exports.FORMATS:
+        return HttpResponseBadRequest(f"format must be one of: {', '.join(exports.FORMATS)}.")
+    compressed = request.GET.get('gzip') in ('1', 'true')
+
+    try:
+        # Audit logs are filtered by what the requesting user may see in the viewer.
+        queryset = exports.export_queryset(kind, request.GET, user=request.user)
+        archived = exports.archived_rows(kind, request.GET, user=request.user)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+    except audit_archive.ArchiveIntegrityError as e:
+        # Leaving the archived entries out would make the file silently incomplete.
+        return HttpResponseServerError(f"Archived audit log entries cannot be exported: {e}")
+
+    chunks = exports.encode(kind, exports.export_batches(kind, queryset, archived=archived), file_format)
+    if compressed:
+        response = StreamingHttpResponse(exports.gzip_chunks(chunks), content_type='application/gzip')
+    else:
+        response = StreamingHttpResponse(chunks, content_type=exports.CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{exports.file_name(kind, file_format, compressed)}"'
+    return response
@@ -1,13 +1,16 @@
 # inventory/views/log_views.py
 
 from django.shortcuts import render
+from django.contrib import messages
 from django.db.models import Q
-from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.models import User, Group
+from django.contrib.auth.models import User
 
-from ..models import AuditLog
+from ..models import AuditLog, AuditLogArchive
 from ..decorators import role_required
+from ..pagination import paginate_request, request_page
+from ..services import audit_archive
+from ..services.queries import audit_log_matcher, audit_log_summaries, filter_audit_logs, visible_audit_logs
 
 @login_required
 @role_required(allowed_roles=['IT_Admin', 'Super_Admin'])
@@ -17,66 +20,43 @@ def audit_log_viewer(request):
     Access is restricted to IT Admins and Super Admins, with different
     data visibility for each role.
     """
-    # Base queryset for logs
-    log_queryset = AuditLog.objects.select_related('actor').order_by('-timestamp')
-
-    # ===================================================================
-    # ROLE-BASED VISIBILITY VALIDATION
-    # ===================================================================
-    # If the user is an IT Admin but not a Super Admin, restrict their view.
-    if not request.user.is_superuser and request.user.groups.filter(name='IT_Admin').exists():
-        # IT Admins can only see logs from other IT Admins.
-        it_admin_group = Group.objects.get(name='IT_Admin')
-        log_queryset = log_queryset.filter(actor__groups=it_admin_group)
-        # They also cannot see sensitive deletion logs.
-        log_queryset = log_queryset.exclude(action_type__icontains='DELETED')
-
-    # Super Admins can see everything, so no additional filtering is needed for them.
-
-    # --- Filtering and Searching ---
-    query = request.GET.get('query', '').strip()
-    actor_id = request.GET.get('actor')
-    action_type = request.GET.get('action_type')
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-
-    if query:
-        # A flexible search across the JSON 'details' field
-        log_queryset = log_queryset.filter(
-            Q(details__icontains=query) |
-            Q(actor__username__icontains=query) |
-            Q(actor__first_name__icontains=query) |
-            Q(actor__last_name__icontains=query)
+    # Role-based visibility and the filters below are shared with the audit
+    # log export (see services/queries.py). Rows are loaded without their
+    # `details` blob; an expanded row fetches it from get_audit_log_details.
+    log_queryset = audit_log_summaries(filter_audit_logs(visible_audit_logs(request.user), request.GET))
+
+    # Keyset pagination: newest first, 20 logs per page. Old entries are moved
+    # to archive segments (see services/audit_archive.py); they are merged in
+    # only when the start date reaches back into them.
+    page_obj = None
+    segments = audit_archive.segments_for(request.GET)
+    if segments:
+        paginator = audit_archive.ArchivedAuditLogPaginator(
+            log_queryset, segments, audit_log_matcher(request.GET, request.user), 20
         )
-    
-    if actor_id:
-        log_queryset = log_queryset.filter(actor_id=actor_id)
-
-    if action_type:
-        log_queryset = log_queryset.filter(action_type=action_type)
-    
-    if start_date:
-        log_queryset = log_queryset.filter(timestamp__date__gte=start_date)
-
-    if end_date:
-        log_queryset = log_queryset.filter(timestamp__date__lte=end_date)
-        
-    # Pagination
-    paginator = Paginator(log_queryset, 20) # Show 20 logs per page
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+        try:
+            page_obj = request_page(request, paginator)
+        except audit_archive.ArchiveIntegrityError as e:
+            messages.error(request, f"Archived entries are not shown: {e}")
+    if page_obj is None:
+        page_obj = paginate_request(request, log_queryset, ('-timestamp', '-id'), 20)
     
     # Get a list of possible admins to populate the filter dropdown
     admin_users = User.objects.filter(
         Q(is_superuser=True) | Q(groups__name__in=['IT_Admin', 'Super_Admin'])
     ).distinct().order_by('username')
     
-    # Get a list of unique action types present in the log for the filter dropdown
-    action_types = AuditLog.objects.values_list('action_type', 'action_type').distinct()
+    # Get a list of unique action types present in the log and the archive for the filter dropdown
+    # (ordered by itself: the model's default '-timestamp' ordering would make DISTINCT return every row).
+    types = set(AuditLog.objects.values_list('action_type', flat=True).order_by('action_type').distinct())
+    for archived_types in AuditLogArchive.objects.values_list('action_types', flat=True):
+        types.update(archived_types)
+    action_types = [(action_type, action_type) for action_type in sorted(types)]
 
     context = {
         'page_obj': page_obj,
         'admin_users': admin_users,
         'action_types': action_types,
+        'archived_before': audit_archive.archived_before(),
     }
     return render(request, 'inventory/logs/audit_log_viewer.html', context)
\ No newline at end of file